@@ -0,0 +1,9 @@
+"""
+The sub-packages are imported lazily on first attribute access, e.g.
+`accelerometerfeatures.frequency`, so that importing the package does not
+load heavy dependencies like scipy or torch.
+"""
+from accelerometerfeatures._lazy import lazy_attributes
+
+__getattr__, __dir__ = \
+    lazy_attributes(__name__, ['frequency', 'time', 'utils'])
@@ -0,0 +1,5 @@
+import sys
+
+from accelerometerfeatures.cli import main
+
+sys.exit(main())
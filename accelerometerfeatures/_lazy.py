@@ -0,0 +1,37 @@
+import importlib
+
+
+def lazy_attributes(package_name, submodules, attributes=None):
+    """
+    Returns `__getattr__` and `__dir__` functions for a package (see PEP 562)
+    which import the given submodules only when they are accessed for the
+    first time. This keeps importing the package fast since heavy
+    dependencies like scipy or torch are only loaded when needed.
+
+    :param package_name: The `__name__` of the package
+    :param submodules: Names of submodules which should be accessible as
+        package attributes
+    :param attributes: Optional dict mapping attribute names to the name of
+        the submodule defining them
+    """
+    if attributes is None:
+        attributes = {}
+
+    def __getattr__(name):
+        if name in submodules:
+            return importlib.import_module('.' + name, package_name)
+
+        if name in attributes:
+            module = importlib.import_module(
+                '.' + attributes[name], package_name)
+            return getattr(module, name)
+
+        raise AttributeError(
+            'module %r has no attribute %r' % (package_name, name))
+
+    def __dir__():
+        package_attributes = vars(importlib.import_module(package_name))
+        return sorted(
+            set(package_attributes) | set(submodules) | set(attributes))
+
+    return __getattr__, __dir__
@@ -0,0 +1,311 @@
+"""
+Command line tool computing features for whole directories of accelerometer
+recordings, e.g.
+
+    python -m accelerometerfeatures recordings/ -o features/ \
+        -f magnitude,mean,stdev,fft --jobs 8
+
+Each input CSV file is expected to have the columns x, y, z and timestamp.
+For every input file and feature one output file is written to
+<output dir>/<feature>/<input file name>.<format>. The subdirectories of
+input directories are mirrored, i.e. recordings/a/rec.csv and
+recordings/b/rec.csv are written to <output dir>/<feature>/a/rec.<format> and
+<output dir>/<feature>/b/rec.<format>. Output files which already exist are
+skipped, so an interrupted run can simply be restarted.
+"""
+import glob
+import logging
+import os
+import sys
+from argparse import ArgumentParser
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import as_completed
+
+import numpy as np
+import pandas as pd
+
+FEATURES = ['magnitude', 'mean', 'stdev', 'fft', 'interpolation']
+FORMATS = ['csv', 'parquet']
+
+logger = logging.getLogger(__name__)
+
+
+def _compute_magnitude(accel_data, options):
+    from accelerometerfeatures.time import magnitude
+
+    return magnitude.from_df(accel_data)
+
+
+def _compute_mean(accel_data, options):
+    from accelerometerfeatures.time import mean
+
+    columns = [c for c in accel_data.columns if c != 'timestamp']
+    return pd.DataFrame([mean.from_df(accel_data)], columns=columns)
+
+
+def _compute_stdev(accel_data, options):
+    from accelerometerfeatures.time import stdev
+
+    columns = [c for c in accel_data.columns if c != 'timestamp']
+    return pd.DataFrame([stdev.from_df(accel_data)], columns=columns)
+
+
+def _compute_fft(accel_data, options):
+    """
+    Returns one row per window and column holding the window start and end
+    and the absolute values of the FFT coefficients
+    """
+    from accelerometerfeatures.frequency import fouriertransformation
+
+    window_size = options['window_size']
+    bin_columns = ['bin_%i' % i for i in range(window_size)]
+    result_data_frames = []
+
+    for column in [c for c in accel_data.columns if c != 'timestamp']:
+        windows = fouriertransformation.from_df(
+            accel_data[['timestamp', column]], window_size,
+            options['frequency'])
+
+        column_data = pd.DataFrame(
+            np.abs([w.data for w in windows]).reshape(-1, window_size),
+            columns=bin_columns)
+        column_data.insert(0, 'column', column)
+        column_data.insert(1, 'start', [w.start for w in windows])
+        column_data.insert(2, 'end', [w.end for w in windows])
+        result_data_frames.append(column_data)
+
+    return pd.concat(result_data_frames, ignore_index=True)
+
+
+def _compute_interpolation(accel_data, options):
+    from accelerometerfeatures.utils.interpolation import Interpolator
+
+    interpolator = Interpolator(accel_data, options['frequency'])
+    data_shreds = interpolator.get_interpolated_data()
+
+    if not data_shreds:
+        return pd.DataFrame(columns=['shred'] + list(accel_data.columns))
+
+    for shred_idx, data_shred in enumerate(data_shreds):
+        data_shred.insert(0, 'shred', shred_idx)
+
+    return pd.concat(data_shreds, ignore_index=True)
+
+
+_FEATURE_FUNCTIONS = {
+    'magnitude': _compute_magnitude,
+    'mean': _compute_mean,
+    'stdev': _compute_stdev,
+    'fft': _compute_fft,
+    'interpolation': _compute_interpolation,
+}
+
+
+def _write(data_frame, file_path, output_format):
+    """
+    Writes to a temporary file first which is renamed afterwards, so that an
+    interrupted run never leaves incomplete output files behind
+    """
+    tmp_file_path = file_path + '.tmp'
+
+    if output_format == 'csv':
+        data_frame.to_csv(tmp_file_path, index=False)
+    else:
+        data_frame.to_parquet(tmp_file_path, index=False)
+
+    os.replace(tmp_file_path, file_path)
+
+
+def process_file(input_file_path, output_file_paths, options):
+    """
+    Computes the given features for one input file.
+
+    :param input_file_path: Path to the input CSV file
+    :param output_file_paths: A dict mapping feature names to the path of the
+        file the feature output should be written to
+    :param options: A dict with the keys 'frequency', 'window_size' and
+        'format'
+    :return: The input file path
+    """
+    accel_data = pd.read_csv(input_file_path, parse_dates=['timestamp'])
+
+    for feature, output_file_path in output_file_paths.items():
+        os.makedirs(os.path.dirname(output_file_path), exist_ok=True)
+        result = _FEATURE_FUNCTIONS[feature](accel_data, options)
+        _write(result, output_file_path, options['format'])
+
+    return input_file_path
+
+
+def find_input_files(inputs):
+    """
+    Expands the given directories (all contained CSV files, recursively) and
+    glob patterns to a sorted list of (input file path, output name) tuples.
+    The output name is the path of the file relative to the input directory
+    (or just the file name for glob patterns) without extension.
+    """
+    output_names = {}
+
+    for input_path in inputs:
+        if os.path.isdir(input_path):
+            pattern = os.path.join(input_path, '**', '*.csv')
+            for input_file_path in glob.glob(pattern, recursive=True):
+                output_names.setdefault(
+                    input_file_path,
+                    os.path.relpath(input_file_path, input_path))
+        else:
+            for input_file_path in glob.glob(input_path, recursive=True):
+                output_names.setdefault(
+                    input_file_path, os.path.basename(input_file_path))
+
+    return sorted(
+        (input_file_path, os.path.splitext(output_name)[0])
+        for input_file_path, output_name in output_names.items())
+
+
+def get_pending_tasks(
+        input_files, features, output_dir, output_format, overwrite=False):
+    """
+    Returns a list of (input file path, {feature: output file path}) tuples.
+    Unless `overwrite` is set, only those features are contained whose output
+    file does not exist yet.
+
+    :param input_files: (input file path, output name) tuples as returned by
+        `find_input_files( )`
+    :raises ValueError: If several input files have the same output name
+    """
+    input_file_paths = {}
+    for input_file_path, output_name in input_files:
+        if output_name in input_file_paths:
+            raise ValueError(
+                '%s and %s would be written to the same output files' % (
+                    input_file_paths[output_name], input_file_path))
+        input_file_paths[output_name] = input_file_path
+
+    tasks = []
+
+    for input_file_path, output_name in input_files:
+        output_file_paths = {}
+
+        for feature in features:
+            output_file_path = os.path.join(
+                output_dir, feature, '%s.%s' % (output_name, output_format))
+
+            if overwrite or not os.path.exists(output_file_path):
+                output_file_paths[feature] = output_file_path
+
+        if output_file_paths:
+            tasks.append((input_file_path, output_file_paths))
+
+    return tasks
+
+
+def run(tasks, options, jobs):
+    """
+    Processes the given tasks using a pool of `jobs` processes (or in the
+    current process if `jobs` is 1) and returns the number of failed tasks
+    """
+    num_tasks = len(tasks)
+    num_failed = 0
+
+    def report_progress(num_done, input_file_path, error=None):
+        if error is None:
+            logger.info(
+                '[%i/%i] Processed %s', num_done, num_tasks, input_file_path)
+        else:
+            logger.error(
+                '[%i/%i] Failed to process %s: %s', num_done, num_tasks,
+                input_file_path, error)
+
+    if jobs == 1:
+        for num_done, (input_file_path, output_file_paths) in \
+                enumerate(tasks, 1):
+            try:
+                process_file(input_file_path, output_file_paths, options)
+                report_progress(num_done, input_file_path)
+            except Exception as e:
+                num_failed += 1
+                report_progress(num_done, input_file_path, e)
+
+        return num_failed
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = {
+            executor.submit(process_file, input_path, output_paths, options):
+                input_path
+            for input_path, output_paths in tasks}
+
+        for num_done, future in enumerate(as_completed(futures), 1):
+            input_file_path = futures[future]
+            error = future.exception()
+
+            if error is not None:
+                num_failed += 1
+
+            report_progress(num_done, input_file_path, error)
+
+    return num_failed
+
+
+def main(args=None):
+    arg_parser = ArgumentParser(
+        prog='python -m accelerometerfeatures',
+        description='Computes accelerometer features for CSV recordings')
+    arg_parser.add_argument(
+        'inputs', nargs='+', metavar='input',
+        help='Input CSV file, directory or glob pattern')
+    arg_parser.add_argument('-o', '--output-dir', required=True)
+    arg_parser.add_argument(
+        '-f', '--features', default='magnitude,mean,stdev',
+        help='Comma-separated list of features out of %s' % ', '.join(
+            FEATURES))
+    arg_parser.add_argument('--format', choices=FORMATS, default='csv')
+    arg_parser.add_argument(
+        '-j', '--jobs', type=int, default=os.cpu_count() or 1,
+        help='Number of worker processes')
+    arg_parser.add_argument(
+        '--frequency', type=int, default=16,
+        help='Target sample frequency (in Hz) for interpolation and FFT')
+    arg_parser.add_argument(
+        '--window-size', type=int, default=256,
+        help='FFT window size in number of samples')
+    arg_parser.add_argument(
+        '--overwrite', action='store_true', default=False,
+        help='Recompute outputs which already exist')
+    args = arg_parser.parse_args(args)
+
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+
+    features = [f.strip() for f in args.features.split(',') if f.strip()]
+    unknown_features = [f for f in features if f not in FEATURES]
+    if unknown_features:
+        arg_parser.error('Unknown features: %s' % ', '.join(unknown_features))
+
+    input_files = find_input_files(args.inputs)
+
+    try:
+        tasks = get_pending_tasks(
+            input_files, features, args.output_dir, args.format,
+            args.overwrite)
+    except ValueError as e:
+        arg_parser.error(str(e))
+
+    for feature in features:
+        os.makedirs(os.path.join(args.output_dir, feature), exist_ok=True)
+
+    logger.info(
+        '%i input files found, %i still to be processed',
+        len(input_files), len(tasks))
+
+    options = {
+        'frequency': args.frequency,
+        'window_size': args.window_size,
+        'format': args.format,
+    }
+    num_failed = run(tasks, options, max(args.jobs, 1))
+
+    return 1 if num_failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
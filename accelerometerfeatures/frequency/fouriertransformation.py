@@ -2,14 +2,18 @@
 See https://docs.scipy.org/doc/numpy/reference/routines.fft.html
 """
 import logging
-from datetime import datetime
 
 import numpy as np
 import pandas as pd
-from scipy.interpolate import interp1d
 
+from accelerometerfeatures.utils import profiling
+from accelerometerfeatures.utils import statistics as stats
+from accelerometerfeatures.utils.interpolation import Interpolator
+from accelerometerfeatures.utils.parallel import parallel_map
 from accelerometerfeatures.utils.window import Window
-from accelerometerfeatures.utils import pairwise_iterator
+from accelerometerfeatures.utils.window import get_num_invalid_samples
+from accelerometerfeatures.utils.window import iter_chunk_windows
+from accelerometerfeatures.utils.window import sliding_windows
 
 
 def from_file(file_path, window_size, frequency):
@@ -31,109 +35,237 @@ def from_file(file_path, window_size, frequency):
     :return: A tuple containing the means per accelerometer dimension
     """
 
-    accel_data = pd.read_csv(file_path, parse_dates=[1])
+    with profiling.stage('fouriertransformation.read_csv') as stage:
+        accel_data = pd.read_csv(file_path, parse_dates=[1])
+        stage.items = len(accel_data)
 
     return from_df(accel_data, window_size, frequency)
 
 
-def from_df(dataframe, window_size, frequency):
-    """Off-by-one hell"""
-
-    # convert datetime data into float timestamps, e.g. 1528266608.065
-    x = dataframe.timestamp.transform(datetime.timestamp)
-
-    step_in_secs = 1. / frequency
-
+def _get_data_shreds(
+        dataframe, frequency, statistics, gap_policy,
+        max_bridge_gap_size_in_no_samples, num_workers=1):
     # chosen arbitrarily
     biggest_acceptable_gap_size = 10  # consecutive data points
 
     # If there is a gap bigger than the stated biggest acceptable gap size,
     # interpolation doesn't make sense anymore. Thus, the overall dataset is
-    # cut on those gaps and each part will be treated separately for windowing.
-    # The cut indexes are at those points *after* the gap!
-    cut_indexes = \
-        list(x.index[x.diff() > (step_in_secs * biggest_acceptable_gap_size)])
-    cut_indexes = [0] + cut_indexes
-    cut_indexes.append(len(x))
-
-    # [0      1.528266608065000e+09
-    #  1      1.528266608133000e+09
-    #  ...
-    #  Name: timestamp, dtype: float64, 1117    1.52826671978e+09
-    #  1118    1.528266719782000e+09
-    #  1119    1.528266719831000e+09
-    #  ...
-    #  Name: timestamp, Length: 3304, dtype: float64, 4561     1.52826694310e+09
-    #  4562     1.528266943115000e+09
-    #  4563     1.528266943223000e+09
-    #  ...
-    #  Name: timestamp, Length: 14556, dtype: float64]
-    sub_dataset_timestamps_list = \
-        [x[start:end] for start, end in pairwise_iterator(cut_indexes)]
+    # cut on those gaps (unless a different gap policy is chosen) and each
+    # part will be treated separately for windowing.
+    interpolator = Interpolator(
+        dataframe,
+        frequency,
+        biggest_acceptable_gap_size,
+        statistics,
+        gap_policy=gap_policy,
+        max_bridge_gap_size_in_no_samples=max_bridge_gap_size_in_no_samples,
+        num_workers=num_workers)
 
-    frequency_windows = []
+    return interpolator.get_interpolated_data()
+
+
+def _warn_short_shred(sub_dataset_idx, data_shred, window_size):
+    if logging.getLogger().isEnabledFor(logging.WARNING):
+        logging.warning(
+            'Interpolation of sub dataset %i (from %s to %s with %i '
+            'entries) is too small for window size %i',
+            sub_dataset_idx,
+            data_shred.timestamp.iloc[0].isoformat(),
+            data_shred.timestamp.iloc[-1].isoformat(),
+            len(data_shred),
+            window_size)
+
+
+def from_df(
+        dataframe, window_size, frequency, statistics=None, gap_policy='cut',
+        max_bridge_gap_size_in_no_samples=None, num_workers=1):
+    """
+    The data is interpolated to the given frequency (see `Interpolator`) and
+    each column except the timestamp column is transformed window-wise.
+
+    :param statistics: An optional `ProcessingStatistics` object collecting
+        the number of found shreds, cut gaps, created windows and windows or
+        shreds dropped since they were too short for a window or contained a
+        gap
+    :param gap_policy: How to handle gaps bigger than 10 samples (see
+        `Interpolator`). With the policy 'nan' windows containing a gap are
+        skipped.
+    :param max_bridge_gap_size_in_no_samples: The biggest gap which is
+        linearly bridged in case of the gap policy 'bridge'
+    :param num_workers: The number of threads interpolating and
+        transforming the shreds and columns in parallel (see
+        `accelerometerfeatures.utils.parallel`). None means one per CPU.
+    """
+    if statistics is None:
+        statistics = stats.NO_STATISTICS
+
+    data_shreds = _get_data_shreds(
+        dataframe, frequency, statistics, gap_policy,
+        max_bridge_gap_size_in_no_samples, num_workers)
 
-    sub_dataset_idx = 0
-    for sub_dataset_timestamps in sub_dataset_timestamps_list:
-        if sub_dataset_timestamps.empty:
+    column_names = [c for c in dataframe.columns if c != 'timestamp']
+
+    # (column values, window positions, timestamps) of each transformation
+    tasks = []
+
+    for sub_dataset_idx, data_shred in enumerate(data_shreds, 1):
+        if len(data_shred) < window_size:
+            statistics.count_dropped(stats.SHORT_SHRED)
+            _warn_short_shred(sub_dataset_idx, data_shred, window_size)
             continue
 
-        sub_dataset_idx += 1
+        # The target grid of the interpolated data (integer nanoseconds, so
+        # its length is exact) does not include the end of the shred. Since a
+        # window's end is the timestamp of the sample following it, the last
+        # window starts at len(data_shred) - window_size - 1.
+        last_window_idx = len(data_shred) - window_size
+        window_positions = np.arange(last_window_idx)
+
+        if gap_policy == 'nan':
+            # skip windows containing (NaN) samples within a gap
+            num_invalid = get_num_invalid_samples(
+                data_shred.valid.values, window_positions, window_size)
+            window_positions = window_positions[num_invalid == 0]
+            statistics.count_dropped(
+                stats.GAP,
+                (last_window_idx - len(window_positions)) * len(column_names))
 
-        column_names = [c for c in dataframe.columns if c != 'timestamp']
-        start_idx = sub_dataset_timestamps.index[0]
-        end_idx = sub_dataset_timestamps.index[-1]
-        # np.arange( )  does not include the stop element! I.e.
-        # np.arange(1, 5, 1) --> array([1, 2, 3, 4]) , so without 5
-        x_by_freq = np.arange(
-            x[start_idx], x[end_idx], step_in_secs, np.float)
+        timestamps = list(data_shred.timestamp)
 
         for column_name in column_names:
-            col = dataframe[column_name]
-            series = \
-                col[np.logical_and(
-                    col.index >= start_idx, col.index <= end_idx)]
-
-            interpolation = interp1d(sub_dataset_timestamps, series)
-
-            # interpolated_series is a numpy array
-            interpolated_series = interpolation(x_by_freq)
-
-            if len(interpolated_series) < window_size:
-                first_idx = sub_dataset_timestamps.index[0]
-                last_idx = sub_dataset_timestamps.index[-1]
-                logging.warning(
-                    'Interpolation of sub dataset %i (from %s to %s with %i '
-                    'entries) is too small for window size %i' % (
-                        sub_dataset_idx,
-                        datetime.fromtimestamp(
-                            sub_dataset_timestamps[first_idx]).isoformat(),
-                        datetime.fromtimestamp(
-                            sub_dataset_timestamps[last_idx]).isoformat(),
-                        len(interpolated_series),
-                        window_size))
-                break
-
-            # plt.plot(sub_dataset_timestamps[:-1],
-            #          dataframe[column_name][start_idx: end_idx],
-            #          x_by_freq, interpolated_series, 'o')
-            # plt.title(
-            #     'Sub dataset %i, column %s' % (sub_dataset_idx, column_name))
-            # plt.show()
-
-            last_window_idx = len(interpolated_series) - window_size
-            for window_pos in range(last_window_idx):
-                series_window = \
-                    interpolated_series[window_pos: window_pos + window_size]
-
-                window_start = datetime.fromtimestamp(x_by_freq[window_pos])
-                window_end = \
-                    datetime.fromtimestamp(x_by_freq[window_pos+window_size])
-
-                # Documentation:
-                # https://docs.scipy.org/doc/numpy-1.13.0/reference/routines.fft.html
-                frequency_window = Window(
-                    window_start, window_end, np.fft.fft(series_window))
-                frequency_windows.append(frequency_window)
+            statistics.count(stats.WINDOWS_CREATED, len(window_positions))
+            tasks.append(
+                (data_shred[column_name].values, window_positions,
+                 timestamps))
+
+    def transform(task):
+        values, window_positions, _ = task
+        series_windows = sliding_windows(values, size=window_size)[0]
+
+        with statistics.timer('fft'), profiling.stage(
+                'fouriertransformation.fft', len(window_positions)):
+            # all windows of a column are transformed at once
+            # Documentation:
+            # https://docs.scipy.org/doc/numpy-1.13.0/reference/routines.fft.html
+            return np.fft.fft(series_windows[window_positions], axis=1)
+
+    frequency_windows = []
+
+    for (_, window_positions, timestamps), coefficients in zip(
+            tasks, parallel_map(transform, tasks, num_workers)):
+        start_idxs = window_positions
+        end_idxs = window_positions + window_size
+
+        frequency_windows.extend(
+            Window(timestamps[start_idx], timestamps[end_idx], data)
+            for start_idx, end_idx, data in zip(
+                start_idxs, end_idxs, coefficients))
 
     return frequency_windows
+
+
+def _get_window_positions(data_shred, window_size, hop_size, gap_policy):
+    """
+    Returns the start indexes of the windows of a data shred (see the
+    comment on the last window in `from_df( )`) and whether they are valid
+    """
+    window_positions = \
+        np.arange(0, max(len(data_shred) - window_size, 0), hop_size)
+
+    if gap_policy == 'nan':
+        is_valid = get_num_invalid_samples(
+            data_shred.valid.values, window_positions, window_size) == 0
+    else:
+        is_valid = np.ones(len(window_positions), dtype=bool)
+
+    return window_positions, is_valid
+
+
+def to_memmap(
+        dataframe, file_path, window_size, frequency, hop_size=1,
+        chunk_size=4096, dtype=np.complex128, statistics=None,
+        gap_policy='cut', max_bridge_gap_size_in_no_samples=None):
+    """
+    Like `from_df( )` but for long recordings: Instead of keeping a `Window`
+    per window and column in memory, the FFT coefficients are written to a
+    memory-mapped .npy file (see `np.lib.format.open_memmap`).
+
+    The interpolated data is windowed and transformed in chunks of
+    `chunk_size` samples (see `iter_chunk_windows( )`), so besides the
+    interpolated data only the coefficients of about
+    chunk_size / hop_size windows are held in memory at a time.
+
+    :param file_path: The path of the .npy file to create
+    :param hop_size: The number of samples between two window starts
+        (`from_df( )` uses 1)
+    :param chunk_size: The number of samples transformed at once
+    :param dtype: The complex dtype of the stored coefficients
+    :return: A tuple (coefficients, starts) with the memory-mapped
+        (no. windows, no. columns, window_size) coefficients and the
+        datetime64 start timestamps of the windows. A window ends
+        window_size / frequency seconds after its start.
+    """
+    if statistics is None:
+        statistics = stats.NO_STATISTICS
+
+    data_shreds = _get_data_shreds(
+        dataframe, frequency, statistics, gap_policy,
+        max_bridge_gap_size_in_no_samples)
+
+    column_names = [c for c in dataframe.columns if c != 'timestamp']
+
+    # the number of windows must be known to create the file
+    shred_windows = []
+    for sub_dataset_idx, data_shred in enumerate(data_shreds, 1):
+        if len(data_shred) < window_size:
+            statistics.count_dropped(stats.SHORT_SHRED)
+            _warn_short_shred(sub_dataset_idx, data_shred, window_size)
+            continue
+
+        window_positions, is_valid = _get_window_positions(
+            data_shred, window_size, hop_size, gap_policy)
+        statistics.count_dropped(
+            stats.GAP, int((~is_valid).sum()) * len(column_names))
+        shred_windows.append((data_shred, window_positions, is_valid))
+
+    num_windows = sum(int(v.sum()) for _, _, v in shred_windows)
+    coefficients = np.lib.format.open_memmap(
+        file_path, mode='w+', dtype=dtype,
+        shape=(num_windows, len(column_names), window_size))
+    starts = np.empty(num_windows, dtype='datetime64[ns]')
+
+    output_idx = 0
+
+    for data_shred, window_positions, is_valid in shred_windows:
+        # windows of the values without the last sample end before it (as
+        # in `from_df( )`)
+        values = data_shred[column_names].values[:-1]
+        chunks = (
+            values[chunk_start:chunk_start + chunk_size]
+            for chunk_start in range(0, len(values), chunk_size))
+
+        for windows, first_window_idx in iter_chunk_windows(
+                chunks, window_size, hop_size):
+            window_idxs = np.arange(
+                first_window_idx, first_window_idx + len(windows))
+            chunk_is_valid = is_valid[window_idxs]
+            num_valid = int(chunk_is_valid.sum())
+            statistics.count(
+                stats.WINDOWS_CREATED, num_valid * len(column_names))
+
+            with statistics.timer('fft'), profiling.stage(
+                    'fouriertransformation.fft', num_valid):
+                # (no. windows, window_size, no. columns)
+                chunk_coefficients = \
+                    np.fft.fft(windows[chunk_is_valid], axis=1)
+
+            coefficients[output_idx:output_idx + num_valid] = \
+                chunk_coefficients.transpose(0, 2, 1)
+            starts[output_idx:output_idx + num_valid] = \
+                data_shred.timestamp.values[
+                    window_positions[window_idxs[chunk_is_valid]]]
+            output_idx += num_valid
+
+    coefficients.flush()
+
+    return coefficients, starts
@@ -0,0 +1,228 @@
+"""
+Short-time Fourier transformation (STFT) producing spectrograms as compact
+(no. channels, no. frequency bins, no. frames) float32 arrays, e.g. as input
+for convolutional networks.
+
+To shrink the spectrograms the FFT bins can be combined into fewer log-spaced
+or mel-spaced frequency bins. The spectrogram of a window of the
+`AccelerometerDatasetLoader` can be used as window data of an
+`AccelerometerDataset`:
+
+    AccelerometerDataset([
+        (spectrogram.stft(window_data, 16, 64, 16, n_bins=16), label)
+        for window_data, label in windows])
+"""
+import logging
+
+import numpy as np
+import pandas as pd
+
+from accelerometerfeatures.utils import profiling
+from accelerometerfeatures.utils import statistics as stats
+from accelerometerfeatures.utils.interpolation import Interpolator
+from accelerometerfeatures.utils.window import Window
+from accelerometerfeatures.utils.window import sliding_windows
+
+SCALES = ('magnitude', 'power', 'log_power')
+BINNINGS = ('log', 'mel')
+
+# added to the power before taking the logarithm to avoid log(0)
+_LOG_POWER_EPSILON = 1e-10
+
+
+def _hz_to_mel(frequencies):
+    return 2595. * np.log10(1. + np.asarray(frequencies) / 700.)
+
+
+def _mel_to_hz(mels):
+    return 700. * (10. ** (np.asarray(mels) / 2595.) - 1.)
+
+
+def get_frequency_bins(frame_size, frequency, n_bins, binning='log'):
+    """
+    Returns a (n_bins, frame_size // 2 + 1) matrix which combines the FFT
+    bins of a frame into `n_bins` frequency bins by weighted averaging.
+
+    - 'log': Rectangular bins with logarithmically spaced edges between the
+      lowest non-zero FFT frequency and the Nyquist frequency. The DC
+      component is added to the lowest bin.
+    - 'mel': Triangular bins evenly spaced on the mel scale between 0 Hz and
+      the Nyquist frequency
+
+    Bins which are narrower than the FFT resolution get the FFT bin closest
+    to their center frequency.
+
+    :param frame_size: The number of samples per frame
+    :param frequency: The sample frequency in Hz
+    :param n_bins: The number of frequency bins
+    :param binning: 'log' or 'mel'
+    """
+    assert binning in BINNINGS
+
+    fft_frequencies = np.fft.rfftfreq(frame_size, 1. / frequency)
+    nyquist_frequency = frequency / 2.
+
+    if binning == 'log':
+        edges = np.geomspace(fft_frequencies[1], nyquist_frequency, n_bins + 1)
+        edges[0] = 0.
+        centers = np.sqrt(np.maximum(edges[:-1], fft_frequencies[1]) *
+                          edges[1:])
+
+        lower = edges[:-1, np.newaxis]
+        upper = edges[1:, np.newaxis]
+        is_last_bin = (np.arange(n_bins) == n_bins - 1)[:, np.newaxis]
+        weights = (
+            (fft_frequencies >= lower) &
+            ((fft_frequencies < upper) |
+             (is_last_bin & (fft_frequencies <= upper)))).astype(float)
+    else:
+        mel_edges = np.linspace(0., _hz_to_mel(nyquist_frequency), n_bins + 2)
+        edges = _mel_to_hz(mel_edges)
+        centers = edges[1:-1]
+
+        lower = edges[:-2, np.newaxis]
+        upper = edges[2:, np.newaxis]
+        rising = (fft_frequencies - lower) / (centers[:, np.newaxis] - lower)
+        falling = (upper - fft_frequencies) / (upper - centers[:, np.newaxis])
+        weights = np.maximum(0., np.minimum(rising, falling))
+
+    empty_bins = weights.sum(axis=1) == 0
+    closest_fft_bins = np.abs(
+        fft_frequencies[np.newaxis, :] -
+        centers[empty_bins, np.newaxis]).argmin(axis=1)
+    weights[np.flatnonzero(empty_bins), closest_fft_bins] = 1.
+
+    return weights / weights.sum(axis=1, keepdims=True)
+
+
+def stft(
+        data, frequency, frame_size, hop_size=None, scale='log_power',
+        n_bins=None, binning='log', taper=True):
+    """
+    Computes the spectrogram of uniformly sampled (e.g. interpolated) data.
+
+    :param data: A (no. channels, no. samples) array, e.g. the x, y and z
+        values of a window
+    :param frequency: The sample frequency in Hz
+    :param frame_size: The number of samples per STFT frame
+    :param hop_size: The number of samples between two frame starts.
+        Defaults to half the frame size.
+    :param scale: 'magnitude', 'power' or 'log_power' (in dB)
+    :param n_bins: The number of frequency bins. If None, all
+        frame_size // 2 + 1 FFT bins are kept, otherwise they are combined
+        using the given `binning` (see `get_frequency_bins( )`).
+    :param taper: Whether to apply a Hann window to each frame to reduce
+        spectral leakage
+    :return: A (no. channels, no. bins, no. frames) float32 array
+    """
+    assert scale in SCALES
+
+    if hop_size is None:
+        hop_size = max(frame_size // 2, 1)
+
+    data = np.asarray(data, dtype=float)
+
+    # (no. frames, frame_size, no. channels) view
+    frames = sliding_windows(data.T, size=frame_size, hop=hop_size)[0]
+
+    with profiling.stage('spectrogram.stft', len(frames)):
+        if taper:
+            frames = frames * np.hanning(frame_size)[:, np.newaxis]
+
+        # (no. frames, frame_size // 2 + 1, no. channels)
+        spectrum = np.abs(np.fft.rfft(frames, axis=1))
+
+        if scale != 'magnitude':
+            spectrum **= 2
+
+        if n_bins is not None:
+            bin_weights = get_frequency_bins(
+                frame_size, frequency, n_bins, binning)
+            spectrum = np.einsum('bk,fkc->fbc', bin_weights, spectrum)
+
+        if scale == 'log_power':
+            spectrum = 10. * np.log10(spectrum + _LOG_POWER_EPSILON)
+
+    return np.ascontiguousarray(
+        np.transpose(spectrum, (2, 1, 0)), dtype=np.float32)
+
+
+def from_file(file_path, frame_size, frequency, **kwargs):
+    """
+    :param file_path: String containing the file path to the input data file.
+        Expected structure: x,y,z,timestamp
+    :return: See `from_df( )`
+    """
+    with profiling.stage('spectrogram.read_csv') as stage:
+        accel_data = pd.read_csv(file_path, parse_dates=['timestamp'])
+        stage.items = len(accel_data)
+
+    return from_df(accel_data, frame_size, frequency, **kwargs)
+
+
+def from_df(
+        dataframe, frame_size, frequency, hop_size=None, scale='log_power',
+        n_bins=None, binning='log', statistics=None, gap_policy='cut',
+        max_bridge_gap_size_in_no_samples=None):
+    """
+    Interpolates the data to the given frequency (see `Interpolator`) and
+    computes the spectrogram of all columns except the timestamp column for
+    each data shred.
+
+    :param statistics: An optional `ProcessingStatistics` object collecting
+        the number of created frames and dropped (too short) shreds
+    :param gap_policy: How to handle gaps (see `Interpolator`); 'nan' is not
+        supported since a spectrogram has no notion of missing frames
+    :return: A list of `Window` objects, one per data shred, holding the
+        (no. columns, no. bins, no. frames) spectrogram (see `stft( )` for
+        the remaining parameters)
+    """
+    assert gap_policy != 'nan'
+
+    if statistics is None:
+        statistics = stats.NO_STATISTICS
+
+    if hop_size is None:
+        hop_size = max(frame_size // 2, 1)
+
+    interpolator = Interpolator(
+        dataframe,
+        frequency,
+        statistics=statistics,
+        gap_policy=gap_policy,
+        max_bridge_gap_size_in_no_samples=max_bridge_gap_size_in_no_samples)
+    data_shreds = interpolator.get_interpolated_data()
+
+    column_names = [c for c in dataframe.columns if c != 'timestamp']
+
+    spectrograms = []
+
+    for data_shred in data_shreds:
+        if len(data_shred) < frame_size:
+            statistics.count_dropped(stats.SHORT_SHRED)
+
+            if logging.getLogger().isEnabledFor(logging.WARNING):
+                logging.warning(
+                    'Interpolated data shred from %s to %s with %i entries '
+                    'is too small for frame size %i',
+                    data_shred.timestamp.iloc[0].isoformat(),
+                    data_shred.timestamp.iloc[-1].isoformat(),
+                    len(data_shred),
+                    frame_size)
+            continue
+
+        with statistics.timer('stft'):
+            spectrogram = stft(
+                data_shred[column_names].values.T, frequency, frame_size,
+                hop_size, scale, n_bins, binning)
+        statistics.count(stats.WINDOWS_CREATED, spectrogram.shape[-1])
+
+        # the end is the timestamp of the first sample after the last frame
+        num_samples = (spectrogram.shape[-1] - 1) * hop_size + frame_size
+        end = data_shred.timestamp.iloc[0] + pd.Timedelta(
+            seconds=num_samples / float(frequency))
+
+        spectrograms.append(
+            Window(data_shred.timestamp.iloc[0], end, spectrogram))
+
+    return spectrograms
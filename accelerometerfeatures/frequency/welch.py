@@ -0,0 +1,217 @@
+"""
+Power spectral density (PSD) estimation with Welch's method and band power
+features.
+
+Each window is split into overlapping segments whose periodograms are
+averaged, which gives a much less noisy spectrum than a single FFT of the
+whole window. The segments of all windows are strided views on the
+interpolated data and are transformed in one batched FFT call.
+
+Instead of full spectra `from_df( )` returns the power within a few
+frequency bands per window and column, e.g. the default bands 0 - 0.5 Hz
+(posture, gravity), 0.5 - 3 Hz (locomotion) and 3 - 8 Hz (tremor, vibration).
+"""
+import logging
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import as_strided
+
+from accelerometerfeatures.utils import profiling
+from accelerometerfeatures.utils import statistics as stats
+from accelerometerfeatures.utils.interpolation import Interpolator
+from accelerometerfeatures.utils.window import Window
+from accelerometerfeatures.utils.window import get_num_invalid_samples
+from accelerometerfeatures.utils.window import sliding_windows
+
+DEFAULT_BANDS = ((0., .5), (.5, 3.), (3., 8.))
+
+
+def _get_segment_hop_size(segment_size, overlap):
+    return max(segment_size - int(segment_size * overlap), 1)
+
+
+def welch_psd(windows, frequency, segment_size, overlap=0.5):
+    """
+    Estimates the one-sided power spectral density of each window using
+    Welch's method with a Hann taper and removal of the segment means (like
+    `scipy.signal.welch` with its default settings).
+
+    :param windows: A (no. windows, no. samples, no. channels) array, e.g. a
+        view returned by `sliding_windows( )`
+    :param frequency: The sample frequency in Hz
+    :param segment_size: The number of samples per segment
+    :param overlap: The fraction of samples two consecutive segments share
+    :return: A tuple (frequencies, PSD) with the frequencies of the
+        segment_size // 2 + 1 PSD bins and the
+        (no. windows, no. bins, no. channels) PSD in unit**2/Hz
+    """
+    windows = np.asarray(windows)
+    num_windows, window_size = windows.shape[:2]
+    assert segment_size <= window_size
+
+    segment_hop_size = _get_segment_hop_size(segment_size, overlap)
+    num_segments = (window_size - segment_size) // segment_hop_size + 1
+
+    # (no. windows, no. segments, segment_size, no. channels) view
+    segments = as_strided(
+        windows,
+        shape=(num_windows, num_segments, segment_size) + windows.shape[2:],
+        strides=(windows.strides[0], windows.strides[1] * segment_hop_size) +
+        windows.strides[1:],
+        writeable=False)
+
+    # periodic Hann window as used by scipy.signal.get_window('hann', ...)
+    taper = 0.5 - 0.5 * np.cos(
+        2 * np.pi * np.arange(segment_size) / segment_size)
+    taper = taper.reshape((segment_size,) + (1,) * (windows.ndim - 2))
+
+    detrended = segments - segments.mean(axis=2, keepdims=True)
+    spectrum = np.fft.rfft(detrended * taper, axis=2)
+
+    psd = (spectrum.real ** 2 + spectrum.imag ** 2).mean(axis=1)
+    psd /= frequency * (taper ** 2).sum()
+
+    # one-sided: double all bins but DC and (for even sizes) the Nyquist bin
+    last_doubled_bin = None if segment_size % 2 else -1
+    psd[:, 1:last_doubled_bin] *= 2
+
+    return np.fft.rfftfreq(segment_size, 1. / frequency), psd
+
+
+def band_powers(frequencies, psd, bands=DEFAULT_BANDS):
+    """
+    Integrates the PSD over the given frequency bands. A band (low, high)
+    covers the frequencies low <= f < high, the highest band also includes
+    the Nyquist frequency if high reaches it.
+
+    :param frequencies: The frequencies of the PSD bins
+    :param psd: A (no. windows, no. bins, ...) PSD as returned by
+        `welch_psd( )`
+    :return: A (no. windows, no. bands, ...) array of band powers
+    """
+    bin_width = frequencies[1] - frequencies[0]
+    max_frequency = frequencies[-1]
+
+    band_masks = np.array([
+        (frequencies >= low) &
+        ((frequencies < high) |
+         ((high >= max_frequency) & (frequencies == max_frequency)))
+        for low, high in bands], dtype=float)
+
+    return np.einsum('bk,wk...->wb...', band_masks, psd) * bin_width
+
+
+def get_feature_names(column_names, bands=DEFAULT_BANDS):
+    """
+    Returns the names of the entries of the feature vectors returned by
+    `from_df( )`, e.g. 'x_0.5-3Hz'
+    """
+    return [
+        '%s_%g-%gHz' % (column_name, low, high)
+        for column_name in column_names
+        for low, high in bands]
+
+
+def from_file(file_path, window_size, frequency, **kwargs):
+    """
+    :param file_path: String containing the file path to the input data file.
+        Expected structure: x,y,z,timestamp
+    :return: See `from_df( )`
+    """
+    with profiling.stage('welch.read_csv') as stage:
+        accel_data = pd.read_csv(file_path, parse_dates=['timestamp'])
+        stage.items = len(accel_data)
+
+    return from_df(accel_data, window_size, frequency, **kwargs)
+
+
+def from_df(
+        dataframe, window_size, frequency, hop_size=None, segment_size=None,
+        overlap=0.5, bands=DEFAULT_BANDS, statistics=None, gap_policy='cut',
+        max_bridge_gap_size_in_no_samples=None):
+    """
+    Interpolates the data to the given frequency (see `Interpolator`) and
+    computes the band powers of all columns except the timestamp column for
+    each window.
+
+    :param window_size: The number of samples per window
+    :param hop_size: The number of samples between two window starts.
+        Defaults to half the window size.
+    :param segment_size: The number of samples per Welch segment. Defaults
+        to a quarter of the window size.
+    :param overlap: The fraction of samples two consecutive segments share
+    :param bands: (low, high) tuples of the frequency bands in Hz
+    :param statistics: An optional `ProcessingStatistics` object collecting
+        the number of created windows and dropped windows/shreds
+    :param gap_policy: How to handle gaps (see `Interpolator`). With the
+        policy 'nan' windows containing a gap are skipped.
+    :return: A list of `Window` objects whose data is the float32 feature
+        vector of the band powers per column (see `get_feature_names( )`)
+    """
+    if statistics is None:
+        statistics = stats.NO_STATISTICS
+
+    if hop_size is None:
+        hop_size = max(window_size // 2, 1)
+    if segment_size is None:
+        segment_size = max(window_size // 4, 1)
+
+    interpolator = Interpolator(
+        dataframe,
+        frequency,
+        statistics=statistics,
+        gap_policy=gap_policy,
+        max_bridge_gap_size_in_no_samples=max_bridge_gap_size_in_no_samples)
+    data_shreds = interpolator.get_interpolated_data()
+
+    column_names = [c for c in dataframe.columns if c != 'timestamp']
+
+    feature_windows = []
+
+    for data_shred in data_shreds:
+        if len(data_shred) < window_size:
+            statistics.count_dropped(stats.SHORT_SHRED)
+
+            if logging.getLogger().isEnabledFor(logging.WARNING):
+                logging.warning(
+                    'Interpolated data shred from %s to %s with %i entries '
+                    'is too small for window size %i',
+                    data_shred.timestamp.iloc[0].isoformat(),
+                    data_shred.timestamp.iloc[-1].isoformat(),
+                    len(data_shred),
+                    window_size)
+            continue
+
+        windows, starts, ends = sliding_windows(
+            data_shred[column_names].values, data_shred.timestamp.values,
+            window_size, hop_size)
+
+        if gap_policy == 'nan':
+            # skip windows containing (NaN) samples within a gap
+            start_idxs = np.arange(len(windows)) * hop_size
+            is_valid = get_num_invalid_samples(
+                data_shred.valid.values, start_idxs, window_size) == 0
+            statistics.count_dropped(stats.GAP, int((~is_valid).sum()))
+            windows, starts, ends = \
+                windows[is_valid], starts[is_valid], ends[is_valid]
+
+        if len(windows) == 0:
+            continue
+
+        with statistics.timer('welch'), \
+                profiling.stage('welch.psd', len(windows)):
+            psd_frequencies, psd = welch_psd(
+                windows, frequency, segment_size, overlap)
+            # (no. windows, no. bands, no. columns) --> feature vectors
+            features = band_powers(psd_frequencies, psd, bands) \
+                .transpose(0, 2, 1).reshape(len(windows), -1) \
+                .astype(np.float32)
+
+        statistics.count(stats.WINDOWS_CREATED, len(windows))
+
+        feature_windows.extend(
+            Window(pd.Timestamp(start), pd.Timestamp(end), window_features)
+            for start, end, window_features in zip(starts, ends, features))
+
+    return feature_windows
@@ -0,0 +1,4 @@
+from accelerometerfeatures._lazy import lazy_attributes
+
+__getattr__, __dir__ = \
+    lazy_attributes(__name__, ['magnitude', 'mean', 'stdev'])
@@ -0,0 +1,110 @@
+"""
+Helpers for the batched variants of the time features which compute the
+features of many data frames or of the groups of one data frame at once.
+The rows of each frame/group are treated as a segment and all segments are
+reduced in one pass (see `accelerometerfeatures.utils.segments`).
+"""
+import numpy as np
+import pandas as pd
+
+from accelerometerfeatures.utils.segments import get_run_bounds
+from accelerometerfeatures.utils.segments import segment_reduce
+
+# group key derived from the timestamp column if the data frame has no
+# column of that name
+DATE = 'date'
+
+
+def get_group_key_columns(dataframe, by):
+    """
+    Returns a dict mapping the given group key names to the columns holding
+    the group keys. The key 'date' is derived from the timestamp column if
+    there is no 'date' column.
+    """
+    key_columns = {}
+
+    for key in by:
+        if key == DATE and DATE not in dataframe.columns:
+            key_columns[key] = dataframe.timestamp.dt.floor('D')
+        else:
+            key_columns[key] = dataframe[key]
+
+    return key_columns
+
+
+def get_value_columns(dataframe, by=()):
+    """
+    Returns the names of the numeric columns which are neither the timestamp
+    column nor group key columns
+    """
+    numeric_columns = dataframe.select_dtypes(include='number').columns
+
+    return [c for c in numeric_columns if c != 'timestamp' and c not in by]
+
+
+def get_frame_keys(dataframes, keys=None):
+    """
+    Returns the keys identifying the given data frames in the batched
+    results; defaults to their positions
+    """
+    if keys is None:
+        return pd.RangeIndex(len(dataframes), name='frame')
+
+    return pd.Index(keys, name='frame')
+
+
+def reduce_dfs(dataframes, keys, reduction, ddof=0):
+    """
+    Applies the segment reduction (e.g. 'mean' or 'var') to the value
+    columns of each of the given data frames
+
+    :return: A data frame with one row per input data frame indexed by the
+        frame keys (see `get_frame_keys( )`)
+    """
+    frame_keys = get_frame_keys(dataframes, keys)
+
+    if len(dataframes) == 0:
+        return pd.DataFrame(index=frame_keys)
+
+    columns = get_value_columns(dataframes[0])
+
+    values = np.concatenate([d[columns].values for d in dataframes])
+    ends = np.cumsum([len(d) for d in dataframes])
+    starts = ends - [len(d) for d in dataframes]
+
+    reduced = segment_reduce(values, starts, ends, (reduction,), ddof)
+
+    return pd.DataFrame(reduced[reduction], index=frame_keys, columns=columns)
+
+
+def reduce_grouped_df(dataframe, by, reduction, ddof=0):
+    """
+    Applies the segment reduction (e.g. 'mean' or 'var') to the value
+    columns of each group of the given data frame. Like with `groupby( )`,
+    rows with a missing group key are ignored.
+
+    :return: A tidy data frame with one row per group holding the group keys
+        and the reduced value columns
+    """
+    by = list(by)
+    columns = get_value_columns(dataframe, by)
+
+    keyed_data = dataframe[columns].assign(
+        **get_group_key_columns(dataframe, by))
+    groups = keyed_data.groupby(by, sort=True)
+    group_idxs = groups.ngroup().values
+
+    # rows with a missing group key have the group index -1
+    row_idxs = np.flatnonzero(group_idxs >= 0)
+
+    # sorting the rows by group makes each group a contiguous segment
+    order = row_idxs[np.argsort(group_idxs[row_idxs], kind='mergesort')]
+    starts, ends = get_run_bounds(group_idxs[order])
+    reduced = segment_reduce(
+        keyed_data[columns].values[order], starts, ends, (reduction,), ddof)
+
+    result = groups.size().reset_index()[by]
+    for column_idx, column in enumerate(columns):
+        result[column] = reduced[reduction][:, column_idx]
+
+    return result
@@ -1,6 +1,8 @@
 import numpy as np
 import pandas as pd
 
+from accelerometerfeatures.utils import profiling
+
 
 def from_file(file_path):
     """
@@ -15,13 +17,68 @@ def from_file(file_path):
     :return: A dataframe containing for each entry the magnitude value and a
     timestamp
     """
-    accel_data = pd.read_csv(file_path, parse_dates=[3])
+    with profiling.stage('magnitude.read_csv') as stage:
+        accel_data = pd.read_csv(file_path, parse_dates=[3])
+        stage.items = len(accel_data)
 
     return from_df(accel_data)
 
 
+def iter_file(file_path, chunk_size=100000, dtype=np.float32):
+    """
+    Reads the given file chunk by chunk and yields for each chunk a data
+    frame with the magnitude values and timestamps (see `from_file( )`).
+    Thus, the whole file never has to be held in memory.
+
+    :param chunk_size: The number of rows per chunk
+    :param dtype: The dtype the x, y and z values are read with
+    """
+    reader = pd.read_csv(
+        file_path, parse_dates=['timestamp'], chunksize=chunk_size,
+        dtype={'x': dtype, 'y': dtype, 'z': dtype})
+
+    for accel_data in reader:
+        yield from_df(accel_data)
+
+
+def from_arrays(x, y, z, out=None):
+    """
+    Calculates the magnitude values of the given x, y and z arrays without
+    allocating temporary arrays apart from one scratch array.
+
+    :param out: An optional preallocated output array, e.g. a row of a
+        window array the magnitude should be written to
+    :return: The magnitude array having the (common) dtype of the inputs
+    """
+    x = np.asarray(x)
+    y = np.asarray(y)
+    z = np.asarray(z)
+
+    if out is None:
+        # integer inputs result in floats
+        dtype = np.result_type(x.dtype, y.dtype, z.dtype, np.float32)
+        out = np.empty(x.shape, dtype=dtype)
+    scratch = np.empty(x.shape, dtype=out.dtype)
+
+    np.multiply(x, x, out=out)
+    np.multiply(y, y, out=scratch)
+    np.add(out, scratch, out=out)
+    np.multiply(z, z, out=scratch)
+    np.add(out, scratch, out=out)
+
+    return np.sqrt(out, out=out)
+
+
 def from_df(accel_dataframe):
-    magnitude = np.sqrt(
-        accel_dataframe.x**2 + accel_dataframe.y**2 + accel_dataframe.z**2)
+    with profiling.stage('magnitude.from_df', len(accel_dataframe)):
+        magnitude = from_arrays(
+            accel_dataframe.x.values,
+            accel_dataframe.y.values,
+            accel_dataframe.z.values)
 
-    return magnitude.to_frame('magnitude').join(accel_dataframe.timestamp)
+        # built directly instead of joining on the index
+        return pd.DataFrame(
+            {'magnitude': magnitude,
+             'timestamp': accel_dataframe.timestamp.values},
+            index=accel_dataframe.index,
+            columns=['magnitude', 'timestamp'])
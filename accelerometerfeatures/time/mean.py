@@ -1,6 +1,9 @@
 import numpy as np
 import pandas as pd
 
+from accelerometerfeatures.time import grouping
+from accelerometerfeatures.utils import profiling
+
 
 def from_file(file_path):
     """
@@ -21,7 +24,9 @@ def from_file(file_path):
     :return: A tuple containing the means per accelerometer dimension
     """
 
-    accel_data = pd.read_csv(file_path, parse_dates=[3])
+    with profiling.stage('mean.read_csv') as stage:
+        accel_data = pd.read_csv(file_path, parse_dates=[3])
+        stage.items = len(accel_data)
 
     return from_df(accel_data)
 
@@ -35,6 +40,53 @@ def from_df(dataframe):
     :return: A tuple containing the means of each column except the
         timestamp column
     """
-    return tuple(
-        [np.mean(dataframe[c])
-         for c in dataframe.columns if not c == 'timestamp'])
+    with profiling.stage('mean.from_df', len(dataframe)):
+        return tuple(
+            [np.mean(dataframe[c])
+             for c in dataframe.columns if not c == 'timestamp'])
+
+
+def from_files(file_paths):
+    """
+    Batched variant of `from_file( )`
+
+    :return: A data frame with the means of each file (see `from_dfs( )`)
+        indexed by the file paths
+    """
+    with profiling.stage('mean.read_csv') as stage:
+        dataframes = [
+            pd.read_csv(file_path, parse_dates=['timestamp'])
+            for file_path in file_paths]
+        stage.items = sum(len(d) for d in dataframes)
+
+    return from_dfs(dataframes, file_paths)
+
+
+def from_dfs(dataframes, keys=None):
+    """
+    Batched variant of `from_df( )` computing the means of many data
+    frames with the same columns in one pass
+
+    :param keys: Optional keys identifying the data frames, e.g. file paths
+    :return: A data frame with one row per input data frame (indexed by the
+        keys) holding the means of each numeric column except the
+        timestamp column
+    """
+    with profiling.stage(
+            'mean.from_dfs', sum(len(d) for d in dataframes)):
+        return grouping.reduce_dfs(dataframes, keys, 'mean')
+
+
+def from_grouped_df(dataframe, by=('user', grouping.DATE)):
+    """
+    Computes the means of each group of the given data frame in one pass,
+    e.g. per user and day
+
+    :param by: The names of the group key columns. The key 'date' is derived
+        from the timestamp column if there is no 'date' column.
+    :return: A tidy data frame with one row per group holding the group keys
+        and the means of each numeric, non-key column except the timestamp
+        column
+    """
+    with profiling.stage('mean.from_grouped_df', len(dataframe)):
+        return grouping.reduce_grouped_df(dataframe, by, 'mean')
@@ -0,0 +1,218 @@
+"""
+Alignment of several sensor streams (e.g. accelerometer, gyroscope and
+magnetometer data recorded with separate, unsynchronized clocks) onto one
+shared target grid.
+
+Each stream is segmented at gaps bigger than the biggest acceptable gap size
+like it is done by the `Interpolator` with the gap policy 'cut'. The shared
+grid only covers the time intervals in which all streams have data without
+such gaps. For each stream the interpolation weights of all target samples
+are computed in a single merge-like pass over its timestamps (see
+`accelerometerfeatures.utils.resampling`) and applied to all of its columns.
+"""
+import numpy as np
+import pandas as pd
+
+from accelerometerfeatures.utils import profiling
+from accelerometerfeatures.utils import resampling
+from accelerometerfeatures.utils import statistics as stats
+
+
+def _get_segments(timestamps, biggest_acceptable_gap):
+    """
+    Returns the start and end timestamps of the parts of the given stream
+    between gaps bigger than `biggest_acceptable_gap`
+    """
+    is_cut = np.diff(timestamps) > biggest_acceptable_gap
+    cut_idxs = np.flatnonzero(is_cut) + 1
+
+    starts = timestamps[np.concatenate([[0], cut_idxs])]
+    ends = timestamps[np.concatenate([cut_idxs - 1, [len(timestamps) - 1]])]
+
+    return starts, ends
+
+
+def _intersect_segments(starts_a, ends_a, starts_b, ends_b):
+    """
+    Intersects two sorted lists of non-overlapping [start, end] segments
+    """
+    starts = []
+    ends = []
+    idx_a = idx_b = 0
+
+    while idx_a < len(starts_a) and idx_b < len(starts_b):
+        start = max(starts_a[idx_a], starts_b[idx_b])
+        end = min(ends_a[idx_a], ends_b[idx_b])
+
+        if start < end:
+            starts.append(start)
+            ends.append(end)
+
+        # continue with the successor of the segment ending first
+        if ends_a[idx_a] < ends_b[idx_b]:
+            idx_a += 1
+        else:
+            idx_b += 1
+
+    return np.array(starts, dtype=float), np.array(ends, dtype=float)
+
+
+class StreamAligner(object):
+    """
+    Resamples several data frames holding time-stamped data points (i.e.
+    having a `timestamp` column) onto one shared equidistant target grid.
+
+    The streams are passed as a dict mapping stream names to data frames.
+    The columns of the aligned data frames are named
+    <stream name>_<column name>, e.g. 'gyro_x'. For a stream with an empty
+    name (e.g. '') the column names are kept as they are, so the
+    accelerometer columns can still be called x, y and z.
+
+    If a `ProcessingStatistics` object is passed, the number of found shreds,
+    cut gaps and dropped (too short) shreds as well as the time spent for
+    the alignment are recorded there.
+    """
+    def __init__(
+            self,
+            streams: dict,
+            target_sample_frequency_in_hz: int = 16,
+            biggest_acceptable_gap_size_in_no_samples: int = 10,
+            statistics: stats.ProcessingStatistics = None,
+            max_jitter: float = 0.1):
+
+        assert len(streams) > 0
+        for data_frame in streams.values():
+            assert 'timestamp' in data_frame.columns
+
+        self.streams: dict = streams
+        self.target_sample_frequency_in_hz: int = target_sample_frequency_in_hz
+        self.biggest_acceptable_gap_size_in_no_samples: int = \
+            biggest_acceptable_gap_size_in_no_samples
+
+        self.sample_time_delta_in_secs = \
+            1.0 / self.target_sample_frequency_in_hz
+        self.sample_time_delta_in_ns = resampling.get_sample_period_in_ns(
+            self.target_sample_frequency_in_hz)
+
+        if statistics is None:
+            statistics = stats.NO_STATISTICS
+        self.statistics: stats.ProcessingStatistics = statistics
+
+        self.max_jitter: float = max_jitter
+
+        # All timestamps are handled as seconds relative to the earliest
+        # timestamp of all streams to keep the full float precision
+        with profiling.stage('alignment.timestamps'):
+            stream_datetimes = {
+                name: data_frame.timestamp.values.astype('datetime64[ns]')
+                for name, data_frame in streams.items()}
+            self.origin = min(
+                datetimes[0] for datetimes in stream_datetimes.values())
+            self.timestamps = {
+                name: (datetimes - self.origin) / np.timedelta64(1, 's')
+                for name, datetimes in stream_datetimes.items()}
+
+    def _get_column_name(self, stream_name, column_name):
+        if not stream_name:
+            return column_name
+
+        return '%s_%s' % (stream_name, column_name)
+
+    def get_shared_segments(self):
+        """
+        Returns the start and end times (in seconds since the earliest
+        timestamp of all streams) of the time intervals in which all streams
+        have data without gaps bigger than the biggest acceptable gap size
+        """
+        biggest_acceptable_gap_in_secs = \
+            self.sample_time_delta_in_secs * \
+            self.biggest_acceptable_gap_size_in_no_samples
+
+        starts = ends = None
+        num_gaps = 0
+
+        for timestamps in self.timestamps.values():
+            stream_starts, stream_ends = \
+                _get_segments(timestamps, biggest_acceptable_gap_in_secs)
+            num_gaps += len(stream_starts) - 1
+
+            if starts is None:
+                starts, ends = stream_starts, stream_ends
+            else:
+                starts, ends = _intersect_segments(
+                    starts, ends, stream_starts, stream_ends)
+
+        self.statistics.count(stats.GAPS_CUT, num_gaps)
+
+        return starts, ends
+
+    def get_aligned_data(self):
+        with self.statistics.timer('align'):
+            return self._get_aligned_data()
+
+    def _get_aligned_data(self):
+        segment_starts, segment_ends = self.get_shared_segments()
+
+        # The target grids are computed in integer nanoseconds (relative to
+        # the origin) and do not include the segment end, just as with the
+        # `Interpolator`
+        to_ns = float(resampling.NANOSECONDS_PER_SECOND)
+        segment_target_timestamps = [
+            resampling.get_target_grid(
+                round(start * to_ns), round(end * to_ns),
+                self.sample_time_delta_in_ns)
+            for start, end in zip(segment_starts, segment_ends)]
+
+        num_short_segments = sum(
+            1 for t in segment_target_timestamps if len(t) == 0)
+        self.statistics.count_dropped(stats.SHORT_SHRED, num_short_segments)
+
+        segment_target_timestamps = \
+            [t for t in segment_target_timestamps if len(t) > 0]
+        if not segment_target_timestamps:
+            return []
+        self.statistics.count(
+            stats.SHREDS_FOUND, len(segment_target_timestamps))
+
+        # the target samples of all segments are resampled at once and split
+        # into the segments afterwards
+        target_timestamps_in_ns = np.concatenate(segment_target_timestamps)
+        target_timestamps = target_timestamps_in_ns / to_ns
+        segment_offsets = np.cumsum(
+            [len(t) for t in segment_target_timestamps])[:-1]
+
+        aligned_data = {
+            'timestamp':
+                self.origin + target_timestamps_in_ns.astype('timedelta64[ns]')
+        }
+
+        for stream_name, data_frame in self.streams.items():
+            timestamps = self.timestamps[stream_name]
+
+            with profiling.stage(
+                    'alignment.weights', len(target_timestamps)):
+                near_uniform = resampling.is_near_uniform(
+                    timestamps, self.max_jitter)
+                preceding_idxs, weights = \
+                    resampling.get_linear_interpolation_weights(
+                        timestamps, target_timestamps, near_uniform)
+
+            for column_name in data_frame.columns:
+                if column_name == 'timestamp':
+                    continue
+
+                with profiling.stage(
+                        'alignment.interpolate', len(target_timestamps)):
+                    aligned_data[
+                        self._get_column_name(stream_name, column_name)] = \
+                        resampling.linear_interpolate(
+                            data_frame[column_name].values,
+                            preceding_idxs,
+                            weights)
+
+        return [
+            pd.DataFrame.from_dict(dict(zip(
+                aligned_data.keys(), segment_data)))
+            for segment_data in zip(*(
+                np.split(column_data, segment_offsets)
+                for column_data in aligned_data.values()))]
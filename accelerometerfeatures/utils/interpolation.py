@@ -1,24 +1,78 @@
-from datetime import datetime
-
 import numpy as np
 import pandas as pd
-from scipy.interpolate import interp1d
 
+from accelerometerfeatures.utils import kernels
 from accelerometerfeatures.utils import pairwise_iterator
+from accelerometerfeatures.utils import profiling
+from accelerometerfeatures.utils import resampling
+from accelerometerfeatures.utils import statistics as stats
+from accelerometerfeatures.utils.parallel import parallel_map
+
+
+GAP_POLICIES = ('cut', 'nan', 'hold', 'bridge')
 
 
 class Interpolator(object):
     """
     Performs interpolation on data frames which hold time-stamped data points.
     Hence, it is assumed that a column called `timestamp` exists.
+
+    If a `ProcessingStatistics` object is passed, the number of found shreds,
+    cut gaps and dropped (too short) shreds as well as the time spent for
+    interpolation are recorded there.
+
+    Two resampling methods are supported:
+    - 'linear': Linear interpolation at each target sample timestamp. For
+      nearly uniformly sampled shreds (see below) the source samples
+      surrounding the target timestamps are found in a single linear pass
+      instead of a binary search per target timestamp.
+    - 'polyphase': Segments of a shred with nearly uniformly spaced samples
+      (i.e. no sample distance deviates from the median distance by more
+      than `max_jitter` times the median distance) are resampled using
+      polyphase filtering with an anti-aliasing filter (see
+      `accelerometerfeatures.utils.resampling`). The target samples between
+      these segments, e.g. around a dropped sample, are still linearly
+      interpolated. Use this when down-sampling to avoid aliasing.
+
+    Gaps bigger than `biggest_acceptable_gap_size_in_no_samples` target
+    samples are handled according to the `gap_policy`:
+    - 'cut': The data is cut at the gap and each part (shred) is
+      interpolated separately
+    - 'nan': The data is not cut and target samples within the gap are NaN
+    - 'hold': The data is not cut and target samples within the gap get the
+      value of the last sample before the gap
+    - 'bridge': Gaps of up to `max_bridge_gap_size_in_no_samples` target
+      samples are linearly interpolated, bigger gaps are cut
+    For all policies but 'cut' the resulting data frames have an additional
+    boolean column 'valid' which is False for all target samples within a
+    gap.
+
+    The gap detection and linear interpolation of all columns of a shred is
+    done in a single pass by `accelerometerfeatures.utils.kernels`, which is
+    compiled with numba if it is installed.
+
+    With `num_workers` > 1 (None means one per CPU) the shreds and the
+    polyphase filtered columns are processed in a thread pool (see
+    `accelerometerfeatures.utils.parallel`). The results are the same as
+    with a single worker.
     """
     def __init__(
             self,
             data_frame: pd.DataFrame,
             target_sample_frequency_in_hz: int = 16,
-            biggest_acceptable_gap_size_in_no_samples: int = 10):
+            biggest_acceptable_gap_size_in_no_samples: int = 10,
+            statistics: stats.ProcessingStatistics = None,
+            resampling_method: str = 'linear',
+            max_jitter: float = 0.1,
+            gap_policy: str = 'cut',
+            max_bridge_gap_size_in_no_samples: int = None,
+            num_workers: int = 1):
 
         assert 'timestamp' in data_frame.columns
+        assert resampling_method in ('linear', 'polyphase')
+        assert gap_policy in GAP_POLICIES
+        assert gap_policy != 'bridge' or \
+            max_bridge_gap_size_in_no_samples is not None
         self.data_frame: pd.DataFrame = data_frame
         self.target_sample_frequency_in_hz: int = target_sample_frequency_in_hz
 
@@ -27,12 +81,48 @@ class Interpolator(object):
 
         self.sample_time_delta_in_secs = \
             1.0 / self.target_sample_frequency_in_hz
-
-        # convert datetime data into float timestamps, e.g. 1528266608.065
-        self.timestamps = \
-            self.data_frame.timestamp.transform(datetime.timestamp)
+        self.sample_time_delta_in_ns = resampling.get_sample_period_in_ns(
+            self.target_sample_frequency_in_hz)
+
+        # convert datetime data into int64 nanoseconds since the epoch, e.g.
+        # 1528266608065000000
+        with profiling.stage('interpolation.timestamps', len(data_frame)):
+            self.timestamps = pd.Series(
+                resampling.to_nanoseconds(self.data_frame.timestamp.values),
+                index=self.data_frame.index, name='timestamp')
         self.ignored_data_columns = []
 
+        if statistics is None:
+            statistics = stats.NO_STATISTICS
+        self.statistics: stats.ProcessingStatistics = statistics
+
+        self.resampling_method: str = resampling_method
+        self.max_jitter: float = max_jitter
+
+        self.gap_policy: str = gap_policy
+        self.max_bridge_gap_size_in_no_samples: int = \
+            max_bridge_gap_size_in_no_samples
+
+        self.num_workers: int = num_workers
+
+    def _get_biggest_acceptable_gap_in_secs(self):
+        return self.sample_time_delta_in_secs * \
+            self.biggest_acceptable_gap_size_in_no_samples
+
+    def _get_biggest_uncut_gap_in_secs(self):
+        """
+        Returns the size of the biggest gap (in seconds) at which the data is
+        not cut. Depends on the gap policy.
+        """
+        if self.gap_policy == 'cut':
+            return self._get_biggest_acceptable_gap_in_secs()
+        elif self.gap_policy == 'bridge':
+            return self.sample_time_delta_in_secs * max(
+                self.max_bridge_gap_size_in_no_samples,
+                self.biggest_acceptable_gap_size_in_no_samples)
+        else:
+            return np.inf
+
     def get_acceptable_data_shreds_timestamps(self):
         """
         For the data frame `self.data_frame` this methods looks for value gaps
@@ -40,35 +130,41 @@ class Interpolator(object):
         frame shall be cut right there and should later be handled as if there
         were two data sets. To do so this method calculates the lists of
         timestamps that belong to each such data set shred.
+
+        With the gap policies 'nan' and 'hold' the data is never cut, with
+        'bridge' only at gaps which are too big to be bridged.
         """
-        biggest_acceptable_gap_in_secs = \
-            self.sample_time_delta_in_secs * \
-            self.biggest_acceptable_gap_size_in_no_samples
+        biggest_uncut_gap_in_ns = \
+            self._get_biggest_uncut_gap_in_secs() * \
+            resampling.NANOSECONDS_PER_SECOND
 
         # If there is a gap bigger than the stated biggest acceptable gap size,
         # interpolation doesn't make sense anymore. Thus, the overall data set
         # is cut on those gaps and each part will be treated separately for
         # windowing.
         # The cut indexes are at those points *after* the gap!
-        cut_indexes = list(
-            self.timestamps.index[
-                self.timestamps.diff() > biggest_acceptable_gap_in_secs])
+        # (relative to the first timestamp to keep the nanosecond precision
+        # in the kernel's float computations)
+        timestamps = self.timestamps.values
+        gap_starts = kernels.find_gap_starts(
+            timestamps - timestamps[:1], biggest_uncut_gap_in_ns)
+        cut_indexes = list(self.timestamps.index[gap_starts + 1])
 
         cut_indexes = [0] + cut_indexes
         cut_indexes.append(len(self.timestamps))
 
-        # [0      1.528266608065000e+09
-        #  1      1.528266608133000e+09
+        # [0      1528266608065000000
+        #  1      1528266608133000000
         #  ...
-        #  Name: timestamp, dtype: float64, 1117    1.52826671978e+09
-        #  1118    1.528266719782000e+09
-        #  1119    1.528266719831000e+09
+        #  Name: timestamp, dtype: int64, 1117    1528266719780000000
+        #  1118    1528266719782000000
+        #  1119    1528266719831000000
         #  ...
-        #  Name: timestamp, Length: 3304, dtype: float64, 4561 1.52826694310e+09
-        #  4562     1.528266943115000e+09
-        #  4563     1.528266943223000e+09
+        #  Name: timestamp, Length: 3304, dtype: int64, 4561 1528266943100000000
+        #  4562     1528266943115000000
+        #  4563     1528266943223000000
         #  ...
-        #  Name: timestamp, Length: 14556, dtype: float64]
+        #  Name: timestamp, Length: 14556, dtype: int64]
         sub_dataset_timestamps_list = \
             [self.timestamps[start:end]
                 for start, end in pairwise_iterator(cut_indexes)]
@@ -76,82 +172,235 @@ class Interpolator(object):
         return sub_dataset_timestamps_list
 
     def _dbg_get_shred_data(self, data_shred_timestamps):
-        start_idx = data_shred_timestamps.first_valid_index()
-
-        start_timestamp = \
-            datetime.fromtimestamp(data_shred_timestamps[start_idx])
-
-        end_timestamp = datetime.fromtimestamp(
-            data_shred_timestamps[start_idx + len(data_shred_timestamps) - 1])
+        start_timestamp = pd.Timestamp(data_shred_timestamps.iloc[0])
+        end_timestamp = pd.Timestamp(data_shred_timestamps.iloc[-1])
 
         return self.data_frame[np.logical_and(
             self.data_frame.timestamp >= start_timestamp,
             self.data_frame.timestamp <= end_timestamp)]
 
     def get_interpolated_data(self):
-        # convert datetime data into float timestamps, e.g. 1528266608.065
-        timestamps = self.data_frame.timestamp.transform(datetime.timestamp)
+        with self.statistics.timer('interpolate'):
+            return self._get_interpolated_data()
 
+    def _get_interpolated_data(self):
         data_shreds_timestamps = self.get_acceptable_data_shreds_timestamps()
-
-        result_data_frames = []
-        column_names = \
-            [c for c in self.data_frame.columns
-             if c != 'timestamp' and c not in self.ignored_data_columns]
-
-        data_shred_idx = 0
+        self.statistics.count(stats.GAPS_CUT, len(data_shreds_timestamps) - 1)
+
+        column_names = self._get_column_names()
+
+        # Example value for an entry of data_shreds_timestamps:
+        #
+        # 0     1523357000000000000
+        # 1     1523357000062000000
+        # 2     1523357000131000000
+        # 3     1523357000187000000
+        #           ...
+        # 71    1523357004437000000
+        # 72    1523357004501000000
+        # 73    1523357004562000000
+        # 74    1523357004625000000
+        # Name: timestamp, Length: 75, dtype: int64
+        usable_data_shreds_timestamps = []
 
         for data_shred_timestamps in data_shreds_timestamps:
-            # Example value for data_shreds_timestamps:
-            #
-            # 0     1.523357e+09
-            # 1     1.523357e+09
-            # 2     1.523357e+09
-            # 3     1.523357e+09
-            #           ...
-            # 71    1.523357e+09
-            # 72    1.523357e+09
-            # 73    1.523357e+09
-            # 74    1.523357e+09
-            # Name: timestamp, Length: 75, dtype: float64
-
             if data_shred_timestamps.empty or len(data_shred_timestamps) < 2:
                 # Ignored since not meaningful for later processing
+                if not data_shred_timestamps.empty:
+                    self.statistics.count_dropped(stats.SHORT_SHRED)
                 continue
 
-            data_shred_idx += 1
+            self.statistics.count(stats.SHREDS_FOUND)
+            usable_data_shreds_timestamps.append(data_shred_timestamps)
 
-            start_idx = data_shred_timestamps.index[0]
-            end_idx = data_shred_timestamps.index[-1]
+        # The shreds are interpolated and then their columns polyphase
+        # filtered in parallel (if there are multiple workers)
+        shred_plans = parallel_map(
+            self._get_shred_plan, usable_data_shreds_timestamps,
+            self.num_workers)
 
-            # np.arange( )  does not include the stop element! I.e.
-            # np.arange(1, 5, 1) --> array([1, 2, 3, 4]) , so without 5
-            target_sample_timestamps = np.arange(
-                timestamps[start_idx],
-                timestamps[end_idx],
-                self.sample_time_delta_in_secs,
-                np.float)
+        tasks = [
+            (shred_plan, column_idx)
+            for shred_plan in shred_plans
+            for column_idx in range(len(column_names))]
+        interpolated_columns = iter(parallel_map(
+            lambda task: self._interpolate_column(*task), tasks,
+            self.num_workers))
 
-            target_sample_datetime_timestamps = \
-                [dt for dt in
-                 map(datetime.fromtimestamp, target_sample_timestamps)]
+        result_data_frames = []
 
+        for shred_plan in shred_plans:
             data_frame_data = {
-                'timestamp': target_sample_datetime_timestamps
+                'timestamp': shred_plan.target_sample_datetime_timestamps
             }
 
             for column_name in column_names:
-                whole_column_data = self.data_frame[column_name]
-                series = whole_column_data[np.logical_and(
-                    whole_column_data.index >= start_idx,
-                    whole_column_data.index <= end_idx)]
-
-                interpolate = interp1d(data_shred_timestamps, series)
+                data_frame_data[column_name] = next(interpolated_columns)
 
-                # interpolated_series is a numpy array
-                interpolated_series = interpolate(target_sample_timestamps)
-                data_frame_data[column_name] = interpolated_series
+            if self.gap_policy != 'cut':
+                in_gap = shred_plan.in_gap
+                if in_gap is None:
+                    in_gap = np.zeros(
+                        len(shred_plan.target_sample_timestamps), bool)
+                data_frame_data['valid'] = ~in_gap
 
             result_data_frames.append(pd.DataFrame.from_dict(data_frame_data))
 
         return result_data_frames
+
+    def _get_column_names(self):
+        return [
+            c for c in self.data_frame.columns
+            if c != 'timestamp' and c not in self.ignored_data_columns]
+
+    def _get_shred_plan(self, data_shred_timestamps):
+        """
+        Computes the target timestamps of a data shred and linearly
+        interpolates all its columns (unless all target samples are
+        resampled with polyphase filtering)
+        """
+        shred_plan = _ShredPlan()
+
+        start_idx = data_shred_timestamps.index[0]
+        end_idx = data_shred_timestamps.index[-1]
+        shred_plan.values = self.data_frame.loc[
+            np.logical_and(
+                self.data_frame.index >= start_idx,
+                self.data_frame.index <= end_idx),
+            self._get_column_names()].values
+
+        # The target grid is computed in integer nanoseconds, so it is exact
+        # and its length only depends on the start and end. Like
+        # np.arange( ) it does not include the end, i.e. the target samples
+        # end before the last source sample.
+        start_in_ns = data_shred_timestamps.values[0]
+        target_sample_timestamps_in_ns = resampling.get_target_grid(
+            start_in_ns, data_shred_timestamps.values[-1],
+            self.sample_time_delta_in_ns)
+
+        # Interpolation is done on float seconds relative to the start of
+        # the shred which keeps the nanosecond precision
+        shred_plan.source_timestamps = \
+            (data_shred_timestamps.values - start_in_ns) / \
+            float(resampling.NANOSECONDS_PER_SECOND)
+        target_sample_timestamps = \
+            (target_sample_timestamps_in_ns - start_in_ns) / \
+            float(resampling.NANOSECONDS_PER_SECOND)
+        shred_plan.target_sample_timestamps = target_sample_timestamps
+
+        with profiling.stage(
+                'interpolation.target_timestamps',
+                len(target_sample_timestamps)):
+            shred_plan.target_sample_datetime_timestamps = \
+                target_sample_timestamps_in_ns.astype('datetime64[ns]')
+
+        if self.resampling_method == 'polyphase':
+            shred_plan.polyphase_segments = self._get_polyphase_segments(
+                shred_plan.source_timestamps, target_sample_timestamps)
+
+        covered_by_polyphase = \
+            sum(segment[3] - segment[2]
+                for segment in shred_plan.polyphase_segments) == \
+            len(target_sample_timestamps)
+
+        if not covered_by_polyphase:
+            near_uniform = resampling.is_near_uniform(
+                shred_plan.source_timestamps, self.max_jitter)
+
+            if self.gap_policy == 'cut':
+                max_gap, gap_fill = np.inf, 'linear'
+            else:
+                # A target sample lies within a gap if the source sample
+                # preceding it is the last one before a gap
+                max_gap = self._get_biggest_acceptable_gap_in_secs()
+                gap_fill = self.gap_policy \
+                    if self.gap_policy in ('nan', 'hold') else 'linear'
+
+            with profiling.stage(
+                    'interpolation.interpolate',
+                    len(target_sample_timestamps)):
+                interpolated, in_gap, num_gaps = kernels.interpolate_shred(
+                    shred_plan.source_timestamps, shred_plan.values,
+                    target_sample_timestamps, max_gap, gap_fill,
+                    near_uniform)
+
+            if self.gap_policy != 'cut':
+                shred_plan.in_gap = in_gap
+                self.statistics.count(stats.GAPS_FILLED, num_gaps)
+
+            shred_plan.interpolated = interpolated
+
+        return shred_plan
+
+    def _get_polyphase_segments(self, source_timestamps, target_timestamps):
+        """
+        Returns the nearly uniformly sampled segments of a shred as tuples
+        (source start index, source end index, target start index, target
+        end index) with excluding end indexes. Only segments holding target
+        samples are returned.
+        """
+        polyphase_segments = []
+
+        for start, end in resampling.get_near_uniform_segments(
+                source_timestamps, self.max_jitter):
+            target_start = np.searchsorted(
+                target_timestamps, source_timestamps[start], side='left')
+            target_end = np.searchsorted(
+                target_timestamps, source_timestamps[end - 1], side='right')
+
+            if target_end > target_start:
+                polyphase_segments.append(
+                    (start, end, int(target_start), int(target_end)))
+
+        return polyphase_segments
+
+    def _interpolate_column(self, shred_plan, column_idx):
+        """
+        Returns the interpolated values of a column of a data shred, i.e.
+        applies the polyphase filtering to the linearly interpolated values
+        """
+        num_target_samples = len(shred_plan.target_sample_timestamps)
+
+        if shred_plan.interpolated is None:
+            # all target samples are resampled with polyphase filtering
+            interpolated_series = np.empty(num_target_samples)
+        else:
+            interpolated_series = shred_plan.interpolated[:, column_idx]
+
+        if shred_plan.polyphase_segments:
+            interpolated_series = interpolated_series.copy()
+
+        for start, end, target_start, target_end in \
+                shred_plan.polyphase_segments:
+            with profiling.stage(
+                    'interpolation.polyphase', target_end - target_start):
+                interpolated_series[target_start:target_end] = \
+                    resampling.polyphase_resample(
+                        shred_plan.source_timestamps[start:end],
+                        shred_plan.values[start:end, column_idx],
+                        shred_plan.target_sample_timestamps[
+                            target_start:target_end])
+
+        return interpolated_series
+
+
+class _ShredPlan(object):
+    """
+    The data needed to interpolate the columns of a data shred (see
+    `Interpolator._get_shred_plan( )`)
+    """
+    def __init__(self):
+        # (no. source samples, no. columns) values of the shred
+        self.values = None
+        self.source_timestamps = None
+        self.target_sample_timestamps = None
+        self.target_sample_datetime_timestamps = None
+        # (source start, source end, target start, target end) index tuples
+        # of the segments resampled with polyphase filtering
+        self.polyphase_segments = []
+        # the (no. target samples, no. columns) linearly interpolated values,
+        # None if all target samples are resampled with polyphase filtering
+        self.interpolated = None
+        # None if the gap policy is 'cut' or polyphase filtering is used for
+        # all target samples
+        self.in_gap = None
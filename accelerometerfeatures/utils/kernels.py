@@ -0,0 +1,236 @@
+"""
+Optional JIT-compiled kernels for hot loops.
+
+Each kernel is written as a plain loop which computes its result in a single
+pass without the temporaries of the equivalent chain of numpy operations.
+If numba is installed the loops are compiled (releasing the GIL, so they
+also work with `accelerometerfeatures.utils.parallel`), otherwise the numpy
+implementations are used. Both give the same results:
+
+    interpolated, in_gap, num_gaps = kernels.interpolate_shred(
+        timestamps, values, target_timestamps, max_gap, 'nan')
+
+The `Interpolator` cuts the data into shreds at gaps found by
+`find_gap_starts( )` and interpolates each shred with `interpolate_shred( )`,
+which fuses the gap detection within the shred, the search for the
+interpolation weights and the interpolation of all columns.
+`window_mean_std( )` computes the mean and standard deviation of sliding
+windows, e.g. of interpolated data shreds.
+
+numba is only imported (and a loop compiled) when a kernel is used for the
+first time, so importing this module stays cheap. Setting `USE_NUMBA` to
+False forces the numpy implementations, e.g. to compare both (see
+benchmarks/kernels.py).
+"""
+import importlib.util
+
+import numpy as np
+
+from accelerometerfeatures.utils import resampling
+from accelerometerfeatures.utils.window import sliding_windows
+
+HAVE_NUMBA = importlib.util.find_spec('numba') is not None
+USE_NUMBA = HAVE_NUMBA
+
+# compiled loops by loop function
+_compiled_kernels = {}
+
+
+def _get_kernel(loop):
+    """
+    Returns the given loop compiled with numba or None if the numpy
+    implementation should be used
+    """
+    if not (USE_NUMBA and HAVE_NUMBA):
+        return None
+
+    if loop not in _compiled_kernels:
+        import numba
+
+        _compiled_kernels[loop] = numba.njit(nogil=True, cache=True)(loop)
+
+    return _compiled_kernels[loop]
+
+
+def _gap_starts_loop(timestamps, max_gap):
+    num_samples = len(timestamps)
+    gap_starts = np.empty(max(num_samples - 1, 0), np.int64)
+    num_gaps = 0
+
+    for idx in range(num_samples - 1):
+        if timestamps[idx + 1] - timestamps[idx] > max_gap:
+            gap_starts[num_gaps] = idx
+            num_gaps += 1
+
+    return gap_starts[:num_gaps]
+
+
+# how target samples within a gap are filled by `_interpolate_shred_loop( )`
+_GAP_FILLS = {'linear': 0, 'nan': 1, 'hold': 2}
+
+
+def _interpolate_shred_loop(
+        timestamps, values, target_timestamps, max_gap, gap_fill):
+    num_samples, num_columns = values.shape
+    num_targets = len(target_timestamps)
+    interpolated = np.empty((num_targets, num_columns), np.float64)
+    in_gap = np.zeros(num_targets, np.bool_)
+    num_gaps = 0
+
+    idx = 0
+    for target_idx in range(num_targets):
+        target = target_timestamps[target_idx]
+
+        # the target timestamps are sorted, so the preceding sample is found
+        # by advancing from the preceding sample of the previous target. The
+        # gaps are counted on the way.
+        while idx < num_samples - 2 and timestamps[idx + 1] <= target:
+            if timestamps[idx + 1] - timestamps[idx] > max_gap:
+                num_gaps += 1
+            idx += 1
+
+        delta = timestamps[idx + 1] - timestamps[idx]
+        weight = (target - timestamps[idx]) / delta if delta > 0 else 0.
+        is_in_gap = delta > max_gap and weight > 0
+        in_gap[target_idx] = is_in_gap
+
+        if is_in_gap and gap_fill == 2:
+            weight = 0.
+
+        for column_idx in range(num_columns):
+            if is_in_gap and gap_fill == 1:
+                interpolated[target_idx, column_idx] = np.nan
+            else:
+                preceding = values[idx, column_idx]
+                interpolated[target_idx, column_idx] = preceding + weight * (
+                    values[idx + 1, column_idx] - preceding)
+
+    # the gaps after the preceding sample of the last target
+    for idx in range(idx, num_samples - 1):
+        if timestamps[idx + 1] - timestamps[idx] > max_gap:
+            num_gaps += 1
+
+    return interpolated, in_gap, num_gaps
+
+
+def _window_mean_std_loop(values, size, hop, ddof):
+    num_samples, num_columns = values.shape
+    num_windows = max((num_samples - size) // hop + 1, 0)
+    means = np.empty((num_windows, num_columns), np.float64)
+    stds = np.empty((num_windows, num_columns), np.float64)
+
+    for window_idx in range(num_windows):
+        start = window_idx * hop
+
+        for column_idx in range(num_columns):
+            # sums of the values shifted by the first value of the window to
+            # avoid cancellation for values with a big offset (e.g. gravity)
+            shift = values[start, column_idx]
+            shifted_sum = 0.
+            squared_sum = 0.
+
+            for idx in range(start, start + size):
+                shifted = values[idx, column_idx] - shift
+                shifted_sum += shifted
+                squared_sum += shifted * shifted
+
+            shifted_mean = shifted_sum / size
+            means[window_idx, column_idx] = shift + shifted_mean
+
+            if size - ddof > 0:
+                variance = (squared_sum - shifted_sum * shifted_mean) / \
+                    (size - ddof)
+                stds[window_idx, column_idx] = np.sqrt(max(variance, 0.))
+            else:
+                stds[window_idx, column_idx] = np.nan
+
+    return means, stds
+
+
+def find_gap_starts(timestamps, max_gap):
+    """
+    Returns the indexes of the samples which are followed by a gap, i.e.
+    whose distance to the next sample is bigger than `max_gap`
+    """
+    timestamps = np.ascontiguousarray(timestamps, dtype=np.float64)
+    kernel = _get_kernel(_gap_starts_loop)
+
+    if kernel is not None:
+        return kernel(timestamps, float(max_gap))
+
+    return np.flatnonzero(np.diff(timestamps) > max_gap)
+
+
+def interpolate_shred(
+        timestamps, values, target_timestamps, max_gap=np.inf,
+        gap_fill='linear', near_uniform=False):
+    """
+    Linearly interpolates all columns of a data shred at the given target
+    timestamps. The kernel finds the gaps, computes the interpolation
+    weights and interpolates the columns in a single pass over the target
+    timestamps.
+
+    :param timestamps: The sorted source timestamps (at least two)
+    :param values: A (no. samples, no. columns) array
+    :param target_timestamps: Sorted target timestamps
+    :param max_gap: Source samples further apart than this enclose a gap
+    :param gap_fill: How target samples within a gap are filled: 'linear'
+        (interpolated like all others), 'nan' or 'hold' (the value of the
+        last sample before the gap)
+    :param near_uniform: Whether the source samples are nearly uniformly
+        spaced (see `resampling.get_linear_interpolation_weights( )`), only
+        used by the numpy implementation
+    :return: A tuple of the (no. target timestamps, no. columns)
+        interpolated values, a boolean array which is True for the target
+        samples within a gap and the number of gaps
+    """
+    assert gap_fill in _GAP_FILLS
+    timestamps = np.ascontiguousarray(timestamps, dtype=np.float64)
+    target_timestamps = np.ascontiguousarray(
+        target_timestamps, dtype=np.float64)
+    values = np.ascontiguousarray(values, dtype=np.float64)
+    kernel = _get_kernel(_interpolate_shred_loop)
+
+    if kernel is not None:
+        return kernel(
+            timestamps, values, target_timestamps, float(max_gap),
+            _GAP_FILLS[gap_fill])
+
+    idxs, weights = resampling.get_linear_interpolation_weights(
+        timestamps, target_timestamps, near_uniform)
+
+    is_gap_start = np.diff(timestamps) > max_gap
+    in_gap = is_gap_start[idxs] & (weights > 0)
+
+    if gap_fill == 'hold':
+        weights = np.where(in_gap, 0., weights)
+
+    preceding = values[idxs]
+    interpolated = preceding + weights[:, np.newaxis] * (
+        values[idxs + 1] - preceding)
+
+    if gap_fill == 'nan':
+        interpolated[in_gap] = np.nan
+
+    return interpolated, in_gap, int(is_gap_start.sum())
+
+
+def window_mean_std(values, size, hop=1, ddof=0):
+    """
+    Computes the mean and standard deviation of the windows of `size`
+    samples starting every `hop` samples (see `sliding_windows( )`)
+
+    :param values: A (no. samples, no. columns) array
+    :return: A tuple of (no. windows, no. columns) arrays (means, standard
+        deviations)
+    """
+    values = np.asarray(values, dtype=np.float64)
+    kernel = _get_kernel(_window_mean_std_loop)
+
+    if kernel is not None:
+        return kernel(
+            np.ascontiguousarray(values), size, hop, ddof)
+
+    windows = sliding_windows(values, size=size, hop=hop)[0]
+
+    return windows.mean(axis=1), windows.std(axis=1, ddof=ddof)
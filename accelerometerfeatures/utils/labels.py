@@ -0,0 +1,142 @@
+"""
+Run-length encoded label index for labeling many windows at once.
+
+The labels of a (time sorted) series of samples usually change rarely, so
+they are stored as runs of equal labels. The samples of a window are found
+with a binary search on the sample timestamps and the label counts of a
+window are derived from cumulative per-run label counts, so all windows are
+labeled in one vectorized pass without scanning the samples.
+
+Supported labeling policies:
+- 'strict': A window gets a label only if all its samples have that label
+- 'majority': A window gets the most frequent label of its samples if its
+  fraction is at least `min_fraction`
+- 'soft': A window gets the distribution of the labels of its samples
+"""
+import numpy as np
+
+from accelerometerfeatures.utils.segments import get_run_bounds
+
+LABEL_POLICIES = ('strict', 'majority', 'soft')
+
+
+class LabelIndex(object):
+    """
+    :param timestamps: The sorted timestamps of the samples, e.g. float
+        seconds or datetime64 values
+    :param labels: The label of each sample
+    """
+    def __init__(self, timestamps, labels):
+        self.timestamps = np.asarray(timestamps)
+        labels = np.asarray(labels)
+        assert len(self.timestamps) == len(labels)
+
+        self.classes, codes = np.unique(labels, return_inverse=True)
+
+        self.run_starts, run_ends = get_run_bounds(codes)
+        self.run_codes = codes[self.run_starts]
+
+        # label counts of all samples before each run
+        run_counts = np.zeros((len(self.run_starts), len(self.classes)))
+        run_counts[np.arange(len(self.run_starts)), self.run_codes] = \
+            run_ends - self.run_starts
+        self.counts_before_run = np.cumsum(run_counts, axis=0) - run_counts
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    def get_num_runs(self):
+        return len(self.run_starts)
+
+    def get_sample_bounds(self, starts, ends):
+        """
+        Returns the index of the first sample and the index after the last
+        sample of the time intervals [start, end)
+        """
+        return (
+            np.searchsorted(self.timestamps, starts),
+            np.searchsorted(self.timestamps, ends))
+
+    def _get_counts_before(self, sample_idxs):
+        """
+        Returns the (no. indexes, no. classes) label counts of all samples
+        before the given sample indexes
+        """
+        run_idxs = np.searchsorted(self.run_starts, sample_idxs, 'right') - 1
+        np.clip(run_idxs, 0, None, out=run_idxs)
+
+        counts = self.counts_before_run[run_idxs]
+        counts[np.arange(len(sample_idxs)), self.run_codes[run_idxs]] += \
+            sample_idxs - self.run_starts[run_idxs]
+
+        return counts
+
+    def get_label_counts(self, starts, ends):
+        """
+        Returns the (no. windows, no. classes) label counts of the samples
+        within the time intervals [start, end). The columns correspond to
+        `self.classes`.
+        """
+        start_idxs, end_idxs = self.get_sample_bounds(starts, ends)
+
+        if self.get_num_runs() == 0:
+            return np.zeros((len(start_idxs), 0))
+
+        return self._get_counts_before(end_idxs) - \
+            self._get_counts_before(start_idxs)
+
+    def get_window_labels(
+            self, starts, ends, policy='strict', min_fraction=0.5):
+        """
+        Labels the windows covering the time intervals [start, end)
+
+        :param policy: 'strict', 'majority' or 'soft' (see module docs)
+        :param min_fraction: The fraction of samples the majority label must
+            at least have with the policy 'majority'
+        :return: A tuple (labels, is_labeled). For the policies 'strict' and
+            'majority' labels is an array with one label per window, for
+            'soft' a (no. windows, no. classes) array of label fractions.
+            is_labeled is False for windows without samples and windows not
+            fulfilling the policy; their labels are meaningless.
+        """
+        assert policy in LABEL_POLICIES
+
+        start_idxs, end_idxs = self.get_sample_bounds(starts, ends)
+        num_samples = end_idxs - start_idxs
+        has_samples = num_samples > 0
+
+        if self.get_num_runs() == 0:
+            if policy == 'soft':
+                return np.zeros((len(start_idxs), 0)), has_samples
+            return np.zeros(len(start_idxs), self.classes.dtype), has_samples
+
+        if policy == 'strict':
+            # since consecutive runs have different labels a window is pure
+            # if its first and last sample belong to the same run
+            last_idxs = np.maximum(end_idxs - 1, start_idxs)
+            first_runs = np.searchsorted(
+                self.run_starts, start_idxs, 'right') - 1
+            last_runs = np.searchsorted(
+                self.run_starts, last_idxs, 'right') - 1
+            first_runs = np.clip(first_runs, 0, None)
+
+            labels = self.classes[self.run_codes[first_runs]]
+            return labels, has_samples & (first_runs == last_runs)
+
+        counts = self._get_counts_before(end_idxs) - \
+            self._get_counts_before(start_idxs)
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            fractions = counts / num_samples[:, np.newaxis]
+
+        if policy == 'soft':
+            return np.nan_to_num(fractions), has_samples
+
+        majority_codes = counts.argmax(axis=1)
+        majority_fractions = \
+            fractions[np.arange(len(fractions)), majority_codes]
+
+        with np.errstate(invalid='ignore'):
+            is_labeled = has_samples & (majority_fractions >= min_fraction)
+
+        return self.classes[majority_codes], is_labeled
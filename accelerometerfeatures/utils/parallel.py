@@ -0,0 +1,47 @@
+"""
+Opt-in thread parallelism for independent tasks like the columns or data
+shreds of a recording.
+
+numpy releases the GIL within FFTs, interpolation and most other operations
+on big arrays, so threads give multi-core speedups without the costs of
+pickling data to worker processes:
+
+    results = parallel_map(transform, columns, num_workers=4)
+
+The results are returned in the order of the tasks regardless of the order
+in which the workers finish them.
+"""
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+
+def get_num_workers(num_workers):
+    """
+    Resolves a worker count: None means one worker per CPU
+    """
+    if num_workers is None:
+        return os.cpu_count() or 1
+
+    assert num_workers > 0
+
+    return num_workers
+
+
+def parallel_map(function, items, num_workers=1):
+    """
+    Applies `function` to all items using a pool of `num_workers` threads.
+    With a single worker (or at most one item) the items are processed in
+    the calling thread.
+
+    :param num_workers: The number of threads. None means one per CPU.
+    :return: A list of the results in the order of the items. An exception
+        raised by `function` is re-raised.
+    """
+    items = list(items)
+    num_workers = min(get_num_workers(num_workers), len(items))
+
+    if num_workers <= 1:
+        return [function(item) for item in items]
+
+    with ThreadPoolExecutor(num_workers) as executor:
+        return list(executor.map(function, items))
@@ -0,0 +1,232 @@
+"""
+Opt-in stage-level profiling of the feature extraction.
+
+The processing code is instrumented with `stage( )` calls which do nothing
+unless a `Profiler` is active:
+
+    with Profiler(trace_allocations=True) as profiler:
+        windows = fouriertransformation.from_file(file_path, 256, 16)
+
+    profiler.to_json('profile.json')
+    profiler.to_chrome_trace('trace.json')  # open in chrome://tracing
+
+For each executed stage the wall time, CPU time, the number of bytes
+allocated (and not freed) during the stage and an item count (e.g. the
+number of rows or windows processed) are recorded.
+"""
+import json
+import os
+import threading
+import time
+import tracemalloc
+from collections import OrderedDict
+
+_active_profiler = None
+
+# CPU time of the current thread if available (Python >= 3.7)
+_cpu_time = getattr(time, 'thread_time', time.process_time)
+
+
+class _NullStage(object):
+    items = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+class StageRecord(object):
+    def __init__(
+            self, name, start, wall_time, cpu_time, allocated_bytes, items,
+            thread_id):
+        self.name = name
+        # wall clock start time in seconds since the profiler was started
+        self.start = start
+        self.wall_time = wall_time
+        self.cpu_time = cpu_time
+        self.allocated_bytes = allocated_bytes
+        self.items = items
+        self.thread_id = thread_id
+
+    def to_dict(self):
+        return {
+            'name': self.name,
+            'start': self.start,
+            'wall_time': self.wall_time,
+            'cpu_time': self.cpu_time,
+            'allocated_bytes': self.allocated_bytes,
+            'items': self.items,
+            'thread_id': self.thread_id,
+        }
+
+
+class _Stage(object):
+    def __init__(self, profiler, name, items):
+        self.profiler = profiler
+        self.name = name
+        # may be updated within the `with` block once the number of processed
+        # items is known
+        self.items = items
+        self._start_wall = None
+        self._start_cpu = None
+        self._start_bytes = None
+
+    def __enter__(self):
+        if self.profiler.trace_allocations:
+            self._start_bytes = tracemalloc.get_traced_memory()[0]
+        self._start_cpu = _cpu_time()
+        self._start_wall = time.perf_counter()
+
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        wall_time = time.perf_counter() - self._start_wall
+        cpu_time = _cpu_time() - self._start_cpu
+
+        allocated_bytes = None
+        if self.profiler.trace_allocations:
+            allocated_bytes = \
+                tracemalloc.get_traced_memory()[0] - self._start_bytes
+
+        self.profiler.records.append(StageRecord(
+            self.name,
+            self._start_wall - self.profiler.start_time,
+            wall_time,
+            cpu_time,
+            allocated_bytes,
+            self.items,
+            threading.get_ident()))
+
+        return False
+
+
+class Profiler(object):
+    """
+    Records the stages executed while the profiler is active. Profilers can
+    be activated with a `with` block or via `start( )`/`stop( )`.
+
+    :param trace_allocations: Whether to measure allocated bytes per stage
+        using `tracemalloc`. This slows down the processing considerably.
+    """
+    def __init__(self, trace_allocations=False):
+        self.trace_allocations = trace_allocations
+        self.records = []
+        self.start_time = None
+        self._previous_profiler = None
+        self._started_tracemalloc = False
+
+    def start(self):
+        global _active_profiler
+
+        self.start_time = time.perf_counter()
+
+        if self.trace_allocations and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+
+        self._previous_profiler = _active_profiler
+        _active_profiler = self
+
+        return self
+
+    def stop(self):
+        global _active_profiler
+
+        _active_profiler = self._previous_profiler
+        self._previous_profiler = None
+
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+        return False
+
+    def stage(self, name, items=0):
+        return _Stage(self, name, items)
+
+    def summary(self):
+        """
+        Returns an ordered dict mapping stage names to the accumulated
+        number of calls, wall time, CPU time, allocated bytes and items
+        """
+        summary = OrderedDict()
+
+        for record in self.records:
+            totals = summary.setdefault(record.name, OrderedDict([
+                ('calls', 0),
+                ('wall_time', 0.),
+                ('cpu_time', 0.),
+                ('allocated_bytes', None),
+                ('items', 0)]))
+
+            totals['calls'] += 1
+            totals['wall_time'] += record.wall_time
+            totals['cpu_time'] += record.cpu_time
+            totals['items'] += record.items
+
+            if record.allocated_bytes is not None:
+                totals['allocated_bytes'] = \
+                    (totals['allocated_bytes'] or 0) + record.allocated_bytes
+
+        return summary
+
+    def to_json(self, file_path):
+        with open(file_path, 'w') as json_file:
+            json.dump({
+                'summary': self.summary(),
+                'stages': [r.to_dict() for r in self.records],
+            }, json_file, indent=2)
+
+    def to_chrome_trace(self, file_path):
+        """
+        Writes the recorded stages in the Chrome trace event format which can
+        be viewed with chrome://tracing or https://ui.perfetto.dev
+        """
+        pid = os.getpid()
+        events = []
+
+        for record in self.records:
+            events.append({
+                'name': record.name,
+                'ph': 'X',  # complete event
+                'ts': record.start * 1e6,  # microseconds
+                'dur': record.wall_time * 1e6,
+                'pid': pid,
+                'tid': record.thread_id,
+                'args': {
+                    'cpu_time': record.cpu_time,
+                    'allocated_bytes': record.allocated_bytes,
+                    'items': record.items,
+                },
+            })
+
+        with open(file_path, 'w') as json_file:
+            json.dump({'traceEvents': events}, json_file)
+
+
+def get_active_profiler():
+    return _active_profiler
+
+
+def stage(name, items=0):
+    """
+    Returns a context manager recording the enclosed code as stage `name` in
+    the active profiler. If no profiler is active a shared no-op context
+    manager is returned.
+    """
+    profiler = _active_profiler
+
+    if profiler is None:
+        return _NULL_STAGE
+
+    return profiler.stage(name, items)
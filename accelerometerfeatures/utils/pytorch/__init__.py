@@ -0,0 +1,17 @@
+"""
+The data set classes are imported lazily on first access so that importing
+this package does not load torch.
+"""
+from accelerometerfeatures._lazy import lazy_attributes
+
+__getattr__, __dir__ = lazy_attributes(
+    __name__,
+    ['augmentation', 'dataset', 'shared', 'splits'],
+    {
+        'AccelerometerDataset': 'dataset',
+        'AccelerometerDatasetLoader': 'dataset',
+        'AccelerometerTensorDataset': 'dataset',
+        'BatchAugmentation': 'augmentation',
+        'BatchSliceSampler': 'dataset',
+        'SharedArray': 'shared',
+    })
@@ -0,0 +1,116 @@
+"""
+Data augmentation of whole batches of windows, e.g. as yielded by
+`AccelerometerTensorDataset.batch_loader( )`:
+
+    augmentation = BatchAugmentation(seed=42)
+
+    for epoch in range(num_epochs):
+        for data, labels in augmentation.iter_epoch(
+                dataset.batch_loader(64, shuffle=True), epoch):
+            ...
+
+All windows of a batch are transformed with a few tensor operations instead
+of augmenting every window separately in `__getitem__`. The random numbers
+of an epoch are drawn from a generator seeded with the augmentation seed and
+the epoch number, so the augmented batches of a run can be reproduced (given
+the batches arrive in the same order).
+"""
+import numpy as np
+import torch
+
+
+def random_rotations(num_rotations, max_angle=np.pi, generator=None):
+    """
+    Returns a (num_rotations, 3, 3) tensor of rotation matrices around
+    uniformly distributed random axes by angles drawn uniformly from
+    [-max_angle, max_angle]
+    """
+    axes = torch.randn(num_rotations, 3, generator=generator)
+    axes /= axes.norm(dim=1, keepdim=True).clamp(min=1e-12)
+    angles = (torch.rand(num_rotations, generator=generator) * 2 - 1) * \
+        max_angle
+
+    # Rodrigues' rotation formula: R = I + sin(a) K + (1 - cos(a)) K^2
+    x, y, z = axes.unbind(dim=1)
+    zeros = torch.zeros_like(x)
+    cross_products = torch.stack([
+        torch.stack([zeros, -z, y], dim=1),
+        torch.stack([z, zeros, -x], dim=1),
+        torch.stack([-y, x, zeros], dim=1)], dim=1)
+
+    return torch.eye(3).expand(num_rotations, 3, 3) + \
+        torch.sin(angles)[:, None, None] * cross_products + \
+        (1 - torch.cos(angles))[:, None, None] * \
+        torch.bmm(cross_products, cross_products)
+
+
+class BatchAugmentation(object):
+    """
+    Randomly rotates, scales and adds noise to batches of windows. Each of
+    the transformations is skipped if its parameter is None.
+
+    :param max_rotation_angle: The maximum angle in radians by which the x,
+        y and z channels (the first three channels) of a window are rotated
+        around a random axis
+    :param scale_range: (low, high) range of the factor all channels of a
+        window are multiplied with
+    :param noise_std: The standard deviation of the Gaussian noise added to
+        each sample
+    :param seed: The seed the per-epoch random number generators are
+        derived from
+    """
+    def __init__(
+            self, max_rotation_angle=np.pi, scale_range=(0.9, 1.1),
+            noise_std=0.01, seed=0):
+        self.max_rotation_angle = max_rotation_angle
+        self.scale_range = scale_range
+        self.noise_std = noise_std
+        self.seed = seed
+
+    def get_generator(self, epoch):
+        """
+        Returns a random number generator for the given epoch which is
+        independent of the generators of other epochs
+        """
+        epoch_seed = np.random.RandomState([self.seed, epoch]) \
+            .randint(2 ** 31 - 1)
+
+        return torch.Generator().manual_seed(int(epoch_seed))
+
+    def __call__(self, data, generator=None):
+        """
+        Returns an augmented copy of the given batch
+
+        :param data: A (no. windows, no. channels, no. samples per window)
+            tensor
+        """
+        num_windows = data.shape[0]
+        augmented = data.clone()
+
+        if self.max_rotation_angle is not None:
+            rotations = random_rotations(
+                num_windows, self.max_rotation_angle, generator) \
+                .to(data.dtype)
+            augmented[:, :3] = torch.bmm(rotations, data[:, :3])
+
+        if self.scale_range is not None:
+            low, high = self.scale_range
+            scales = torch.rand(num_windows, 1, 1, generator=generator) * \
+                (high - low) + low
+            augmented *= scales.to(data.dtype)
+
+        if self.noise_std is not None:
+            noise = torch.randn(augmented.shape, generator=generator)
+            augmented += (noise * self.noise_std).to(data.dtype)
+
+        return augmented
+
+    def iter_epoch(self, batches, epoch):
+        """
+        Augments the data of the given (data, labels, ...) batches using the
+        random number generator of the given epoch
+        """
+        generator = self.get_generator(epoch)
+
+        for batch in batches:
+            yield (self(batch[0], generator),) + tuple(batch[1:])
@@ -1,17 +1,34 @@
+import copy
 import datetime
+import logging
 from argparse import ArgumentParser
 
-import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
+import torch
+from torch.utils.data import DataLoader
 from torch.utils.data import Dataset
+from torch.utils.data import Sampler
 
+from accelerometerfeatures.time import magnitude
+from accelerometerfeatures.utils import profiling
+from accelerometerfeatures.utils import statistics as stats
 from accelerometerfeatures.utils.interpolation import Interpolator
+from accelerometerfeatures.utils.labels import LabelIndex
+from accelerometerfeatures.utils.window import pad_windows
+from accelerometerfeatures.utils.window import resample_windows
+from accelerometerfeatures.utils.window import window_bounds
 
 
 class AccelerometerDataset(Dataset):
-    def __init__(self, windows):
+    """
+    Holds a list of (window data, label) tuples. If `classes` is given, the
+    labels are int codes and `classes` is the list of class names the codes
+    refer to.
+    """
+    def __init__(self, windows, classes=None):
         self.windows = windows
+        self.classes = None if classes is None else list(classes)
 
     def __getitem__(self, index):
         return self.windows[index]
@@ -19,6 +36,319 @@ class AccelerometerDataset(Dataset):
     def __len__(self):
         return len(self.windows)
 
+    def to_tensor_dataset(self, pin_memory=False, shared_memory=False):
+        """
+        Copies all windows into one contiguous tensor. This requires all
+        windows to have the same number of samples, e.g. because interpolation
+        was performed.
+        """
+        return AccelerometerTensorDataset.from_windows(
+            self.windows, pin_memory, classes=self.classes,
+            shared_memory=shared_memory)
+
+
+def _as_slice(indexes):
+    """
+    Returns a slice object if the given indexes are ascending and
+    consecutive, e.g. [4, 5, 6, 7] --> slice(4, 8), and None otherwise.
+    """
+    indexes = np.asarray(indexes)
+
+    if indexes.ndim != 1 or len(indexes) == 0:
+        return None
+
+    first = int(indexes[0])
+    last = int(indexes[-1])
+
+    if last - first != len(indexes) - 1 or np.any(np.diff(indexes) != 1):
+        return None
+
+    return slice(first, last + 1)
+
+
+class AccelerometerTensorDataset(Dataset):
+    """
+    Holds the data of all windows in one contiguous float32 tensor of shape
+    (no. windows, no. channels, no. samples per window) and the window labels
+    as int64 class indexes. The mapping from class names to class indexes is
+    built once when the data set is created and kept in `self.classes`.
+
+    Besides single indexes `__getitem__` also accepts slices and sequences of
+    indexes and then returns the whole batch, i.e. a tuple of a data tensor
+    and a label tensor. Used together with a `BatchSliceSampler` (see
+    `batch_loader( )`) a batch is thus fetched with a single slicing operation
+    instead of collating every window separately.
+
+    Optional per-window metadata (e.g. the user and date of each window) can
+    be passed as a dict of equally long arrays. Subsets created with
+    `subset( )` are index views sharing the data, label and metadata storage
+    with the data set they were created from.
+
+    If the windows were padded to a fixed length, a boolean (no. windows,
+    no. samples per window) mask marking the actual samples can be passed.
+    `__getitem__` then returns (data, labels, mask) tuples.
+
+    With `shared_memory` the data, labels and mask are stored in
+    `multiprocessing.shared_memory` blocks (see
+    `accelerometerfeatures.utils.pytorch.shared`). Pickling the data set,
+    e.g. when it is sent to the workers of a data loader, then only
+    transfers the names of the blocks and the workers attach to them instead
+    of holding their own copies of the windows. This requires Python 3.8 or
+    newer.
+    """
+    def __init__(
+            self, data, labels, classes, pin_memory=False, metadata=None,
+            mask=None, shared_memory=False):
+        # pinning copies the tensors into page-locked memory of the process
+        assert not (pin_memory and shared_memory)
+
+        arrays = {
+            'data': np.ascontiguousarray(data, dtype=np.float32),
+            'labels': np.ascontiguousarray(labels, dtype=np.int64),
+        }
+        if mask is not None:
+            arrays['mask'] = np.ascontiguousarray(mask, dtype=bool)
+
+        # None if the arrays are held in process memory
+        self.shared_arrays = None
+
+        if shared_memory:
+            # multiprocessing.shared_memory is only available in Python 3.8+
+            from accelerometerfeatures.utils.pytorch.shared import \
+                SharedArray
+
+            self.shared_arrays = {
+                key: SharedArray.from_array(array)
+                for key, array in arrays.items()}
+            arrays = {
+                key: shared_array.array
+                for key, shared_array in self.shared_arrays.items()}
+
+        data, labels, mask = self._get_tensors(arrays)
+
+        if pin_memory:
+            if torch.cuda.is_available():
+                data = data.pin_memory()
+                labels = labels.pin_memory()
+                if mask is not None:
+                    mask = mask.pin_memory()
+            else:
+                logging.warning(
+                    'Memory pinning was requested but no CUDA device is '
+                    'available. Proceeding with unpinned memory.')
+
+        self.data: torch.Tensor = data
+        self.labels: torch.Tensor = labels
+        self.mask: torch.Tensor = mask
+        self.classes: list = list(classes)
+        self.class_to_idx: dict = \
+            {cls: idx for idx, cls in enumerate(self.classes)}
+
+        if metadata is None:
+            metadata = {}
+        self.metadata: dict = \
+            {key: np.asarray(values) for key, values in metadata.items()}
+
+        # None means that all windows of the underlying storage are part of
+        # the data set; otherwise an int64 array with the storage positions
+        # of the windows this (sub) data set consists of
+        self.indices = None
+
+    @staticmethod
+    def _get_tensors(arrays):
+        """
+        Returns (data, labels, mask) tensors sharing the memory of the given
+        arrays
+        """
+        mask = arrays.get('mask')
+
+        return (
+            torch.from_numpy(arrays['data']),
+            torch.from_numpy(arrays['labels']),
+            None if mask is None else torch.from_numpy(mask))
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+
+        if self.shared_arrays is not None:
+            # the tensors are restored from the shared arrays which are
+            # pickled by name only
+            del state['data'], state['labels'], state['mask']
+
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+
+        if self.shared_arrays is not None:
+            self.data, self.labels, self.mask = self._get_tensors({
+                key: shared_array.array
+                for key, shared_array in self.shared_arrays.items()})
+
+    @classmethod
+    def from_windows(
+            cls, windows, pin_memory=False, metadata=None, classes=None,
+            shared_memory=False):
+        """
+        :param windows: A list of (window data, label) tuples as held by an
+            `AccelerometerDataset`. All window data arrays must have the same
+            shape.
+        :param metadata: Optional dict mapping metadata keys, e.g. 'user' or
+            'date', to arrays holding one value per window
+        :param classes: See `from_array( )`
+        """
+        if windows:
+            data = np.empty(
+                (len(windows),) + np.shape(windows[0][0]), dtype=np.float32)
+        else:
+            data = np.empty((0, 0, 0), dtype=np.float32)
+
+        for idx, (window_data, _) in enumerate(windows):
+            data[idx] = window_data
+
+        return cls.from_array(
+            data, [label for _, label in windows], pin_memory, metadata,
+            classes=classes, shared_memory=shared_memory)
+
+    @classmethod
+    def from_array(
+            cls, data, labels, pin_memory=False, metadata=None, mask=None,
+            classes=None, shared_memory=False):
+        """
+        :param data: A (no. windows, no. channels, no. samples per window)
+            array
+        :param labels: A sequence containing the label of each window
+        :param classes: If given, the labels are int codes referring to these
+            class names and are used as they are. Otherwise the classes are
+            the sorted distinct labels.
+        """
+        if classes is not None:
+            label_idxs = np.asarray(labels, dtype=np.int64)
+            return cls(
+                data, label_idxs, classes, pin_memory, metadata, mask,
+                shared_memory)
+
+        classes = sorted(set(labels))
+        class_to_idx = {c: i for i, c in enumerate(classes)}
+        label_idxs = np.fromiter(
+            (class_to_idx[label] for label in labels), np.int64, len(labels))
+
+        return cls(
+            data, label_idxs, classes, pin_memory, metadata, mask,
+            shared_memory)
+
+    def subset(self, indices):
+        """
+        Returns a view on the windows at the given positions (relative to this
+        data set). No window data is copied.
+        """
+        indices = np.asarray(indices, dtype=np.int64)
+
+        if self.indices is not None:
+            indices = self.indices[indices]
+
+        view = copy.copy(self)
+        view.indices = indices
+
+        return view
+
+    def get_metadata(self, key):
+        """
+        Returns the metadata values stored under `key` for all windows of this
+        data set
+        """
+        values = self.metadata[key]
+
+        if self.indices is not None:
+            values = values[self.indices]
+
+        return values
+
+    def get_labels(self):
+        if self.indices is None:
+            return self.labels
+
+        return self.labels[torch.from_numpy(self.indices)]
+
+    def __getitem__(self, index):
+        if self.indices is not None:
+            if isinstance(index, torch.Tensor):
+                index = index.numpy()
+            elif isinstance(index, (list, tuple)):
+                index = np.asarray(index, dtype=np.int64)
+
+            index = self.indices[index]
+
+        if isinstance(index, (list, tuple, np.ndarray, torch.Tensor)):
+            batch_slice = _as_slice(index)
+
+            if batch_slice is not None:
+                index = batch_slice
+            else:
+                index = torch.as_tensor(index, dtype=torch.int64)
+
+        if self.mask is not None:
+            return self.data[index], self.labels[index], self.mask[index]
+
+        return self.data[index], self.labels[index]
+
+    def __len__(self):
+        if self.indices is not None:
+            return len(self.indices)
+
+        return len(self.labels)
+
+    def batch_loader(
+            self, batch_size, shuffle=False, drop_last=False, num_workers=0,
+            generator=None):
+        """
+        Returns a data loader yielding (data, labels) batch tensors. Automatic
+        batching of the data loader is turned off since batches are already
+        fetched as a whole by `__getitem__`.
+        """
+        sampler = BatchSliceSampler(
+            len(self), batch_size, shuffle, drop_last, generator)
+
+        return DataLoader(
+            self, batch_size=None, sampler=sampler, num_workers=num_workers)
+
+
+class BatchSliceSampler(Sampler):
+    """
+    Yields whole batches of indexes instead of single indexes. Without
+    shuffling each batch is a slice of consecutive windows, otherwise a
+    tensor of randomly permuted indexes.
+    """
+    def __init__(
+            self, num_samples, batch_size, shuffle=False, drop_last=False,
+            generator=None):
+
+        assert batch_size > 0
+        self.num_samples = num_samples
+        self.batch_size = batch_size
+        self.shuffle = shuffle
+        self.drop_last = drop_last
+        self.generator = generator
+
+    def __iter__(self):
+        if self.shuffle:
+            permutation = \
+                torch.randperm(self.num_samples, generator=self.generator)
+
+        for start in range(0, len(self) * self.batch_size, self.batch_size):
+            end = min(start + self.batch_size, self.num_samples)
+
+            if self.shuffle:
+                yield permutation[start:end]
+            else:
+                yield slice(start, end)
+
+    def __len__(self):
+        if self.drop_last:
+            return self.num_samples // self.batch_size
+        else:
+            return (self.num_samples + self.batch_size - 1) // self.batch_size
+
 
 class AccelerometerDatasetLoader(object):
     """
@@ -29,7 +359,35 @@ class AccelerometerDatasetLoader(object):
       - Apply windowing
       - Optionally apply interpolation to get a stable sample rate
 
-    TODO: Collect statistics (discarded windows/sensor samples)
+    In non-interpolating mode windows contain varying numbers of samples. To
+    still get windows of a fixed length (`window_size_in_seconds` *
+    `interpolation_frequency` samples) from `get_tensor_dataset_for_users( )`
+    a `fixed_length_mode` can be set:
+    - 'pad': Windows are padded (or truncated) and a mask marks the actual
+      samples
+    - 'resample': Windows are linearly resampled on a regular grid
+
+    If a `ProcessingStatistics` object is passed, the number of read rows,
+    found shreds, cut gaps, created windows and dropped windows (by reason)
+    as well as the time spent for reading, interpolation and windowing are
+    collected there.
+
+    If `include_magnitude` is set, the window arrays returned by
+    `get_dataset_for_users( )` and `get_tensor_dataset_for_users( )` get the
+    magnitude of the x, y and z values as fourth channel.
+
+    Windows are labeled according to the `label_policy` (see
+    `accelerometerfeatures.utils.labels`): With 'strict' windows with mixed
+    labels are dropped, with 'majority' windows get their most frequent
+    label if at least `min_label_fraction` of their samples have it.
+
+    The user and class columns are read as categoricals. The data sets
+    returned by `get_dataset_for_users( )` and
+    `get_tensor_dataset_for_users( )` hold the labels as int codes into
+    `self.classes` (the sorted class names), which they keep as `classes`.
+    Windows whose label is an empty class (i.e. unlabeled samples) are
+    dropped.
+
     TODO: Cut out gaps in non-interpolating mode
     """
     def __init__(
@@ -38,11 +396,41 @@ class AccelerometerDatasetLoader(object):
             window_size_in_seconds=30,
             window_step_size_in_seconds=15,
             perform_interpolation=False,
-            interpolation_frequency=16):
+            interpolation_frequency=16,
+            fixed_length_mode=None,
+            statistics=None,
+            include_magnitude=False,
+            label_policy='strict',
+            min_label_fraction=0.5):
+
+        assert fixed_length_mode in (None, 'pad', 'resample')
+        assert label_policy in ('strict', 'majority')
+
+        if statistics is None:
+            statistics = stats.NO_STATISTICS
+        self.statistics = statistics
 
         self.csv_file_path = csv_file_path
-        self.acc_data = pd.read_csv(self.csv_file_path, parse_dates=[1])
-        self.users = list(self.acc_data.user.unique())
+        with self.statistics.timer('read'), \
+                profiling.stage('loader.read_csv') as stage:
+            self.acc_data = pd.read_csv(
+                self.csv_file_path, parse_dates=[1],
+                dtype={'user': 'category', 'class': 'category'})
+            stage.items = len(self.acc_data)
+        self.statistics.count(stats.ROWS_READ, len(self.acc_data))
+
+        # Users and classes are held as categorical codes, so selecting a
+        # user's rows and labeling windows only needs integer comparisons
+        self.user_codes = self.acc_data.user.cat.codes.values
+        self.user_to_code = {
+            user: code for code, user in
+            enumerate(self.acc_data.user.cat.categories)}
+        self.classes = list(self.acc_data['class'].cat.categories)
+        # in the order of appearance; rows with an empty user have the code
+        # -1 and belong to no user
+        user_codes = pd.unique(self.user_codes)
+        self.users = list(
+            self.acc_data.user.cat.categories[user_codes[user_codes >= 0]])
         self.dates = list(
             self.acc_data.timestamp.transform(lambda e: e.date()).unique())
         self.perform_interpolation = perform_interpolation
@@ -50,108 +438,242 @@ class AccelerometerDatasetLoader(object):
         self.window_step_size_in_seconds = window_step_size_in_seconds
         self.interpolation_frequency = interpolation_frequency
         self.min_no_samples_per_window = 10
+        self.fixed_length_mode = fixed_length_mode
+        self.include_magnitude = include_magnitude
+        self.label_policy = label_policy
+        self.min_label_fraction = min_label_fraction
 
-    def get_user_data(self, user, date=None):
+    def _select_user_data(self, user, date=None):
         assert isinstance(user, str)
 
         if date is not None:
             assert isinstance(date, datetime.date)
 
-        user_data = self.acc_data[self.acc_data.user == user]
+        with profiling.stage('loader.select_user') as stage:
+            user_data = self.acc_data[
+                self.user_codes == self.user_to_code.get(user, -2)]
 
-        if date is not None:
-            date_idxs = \
-                user_data.timestamp.transform(lambda t: t.date()) == date
-            user_data = user_data[date_idxs]
+            if date is not None:
+                date_idxs = \
+                    user_data.timestamp.transform(lambda t: t.date()) == date
+                user_data = user_data[date_idxs]
+
+            user_data.reset_index(drop=True, inplace=True)
+            stage.items = len(user_data)
+
+        return user_data
 
-        user_data.reset_index(drop=True, inplace=True)
+    def _get_data_shreds(self, user_data):
+        if len(user_data) == 0:
+            # e.g. an unknown user
+            return []
 
         if self.perform_interpolation:
-            interpolator = \
-                Interpolator(user_data, self.interpolation_frequency, 10)
+            interpolator = Interpolator(
+                user_data, self.interpolation_frequency, 10, self.statistics)
             interpolator.ignored_data_columns.append('user')
             interpolator.ignored_data_columns.append('class')
-            user_data = interpolator.get_interpolated_data()
+            return interpolator.get_interpolated_data()
         else:
             # Just to return data in the same schema the Interpolator object
             # returns.
             # FIXME: This is not generic and requires insight into the data. Should be replaced with something more generic
-            user_data = [user_data[['timestamp', 'x', 'y', 'z']]]
+            return [user_data[['timestamp', 'x', 'y', 'z']]]
 
-        return user_data
+    def get_user_data(self, user, date=None):
+        return self._get_data_shreds(self._select_user_data(user, date))
+
+    def get_label_index(self, user, date=None):
+        """
+        Returns a `LabelIndex` of the class labels of the given user's data
+        """
+        return self._get_label_index(self._select_user_data(user, date))
+
+    @staticmethod
+    def _get_label_index(user_data):
+        # Rows with an empty class get the code -1, which becomes a label of
+        # its own
+        return LabelIndex(
+            user_data.timestamp.values, user_data['class'].cat.codes.values)
 
     def get_user_data_windows(self, user, date=None):
+        """
+        Generates (window data, label) tuples of the given user's windows
+        """
+        for window_data, class_code in \
+                self._get_user_data_windows(user, date):
+            yield window_data, self.classes[class_code]
+
+    def _get_user_data_windows(self, user, date=None):
+        """
+        Like `get_user_data_windows( )` but the labels are class codes, i.e.
+        indexes of `self.classes`
+        """
         win_size = datetime.timedelta(seconds=self.window_size_in_seconds)
         step_size = datetime.timedelta(seconds=self.window_step_size_in_seconds)
         expected_no_samples_per_window = \
             self.window_size_in_seconds * self.interpolation_frequency
 
-        user_data = self.get_user_data(user, date)
-        for data_shred in user_data:
+        user_data = self._select_user_data(user, date)
+        # window labels are derived from the user's raw data
+        label_index = self._get_label_index(user_data)
+
+        for data_shred in self._get_data_shreds(user_data):
             if data_shred.empty:
                 continue
 
-            first_idx = data_shred.first_valid_index()
-            last_idx = data_shred.last_valid_index()
-            last_datetime = data_shred.timestamp[last_idx]
-
-            start_datetime = data_shred.timestamp[first_idx]
-            end_datetime = start_datetime + win_size
-
-            while end_datetime <= last_datetime:
-                win_idxs = np.logical_and(
-                    data_shred.timestamp >= start_datetime,
-                    data_shred.timestamp < end_datetime)
+            start_idxs, end_idxs, start_datetimes, end_datetimes = \
+                window_bounds(data_shred.timestamp.values, win_size, step_size)
 
-                window_data = data_shred[win_idxs]
-                window_data.reset_index(drop=True, inplace=True)
-
-                # get window label
-                df_idxs = np.logical_and(
-                    self.acc_data.timestamp >= start_datetime,
-                    self.acc_data.timestamp < end_datetime)
-                labels = self.acc_data[df_idxs]['class'].unique()
+            if len(start_idxs) == 0:
+                # shred too short to hold a single window
+                self.statistics.count_dropped(stats.SHORT_SHRED)
+                continue
 
-                # for the next round
-                start_datetime = start_datetime + step_size
-                end_datetime = start_datetime + win_size
+            with self.statistics.timer('window'), profiling.stage(
+                    'loader.window_labels', len(start_idxs)):
+                labels, is_labeled = label_index.get_window_labels(
+                    start_datetimes, end_datetimes, self.label_policy,
+                    self.min_label_fraction)
 
-                if not len(labels) == 1:
+            for start_idx, end_idx, label, has_label in zip(
+                    start_idxs, end_idxs, labels, is_labeled):
+                if not has_label:
                     # window contains data with mixed labels --> ignore
+                    self.statistics.count_dropped(stats.MIXED_LABEL)
                     continue
 
-                label = labels[0]
+                if label < 0:
+                    # the samples of the window have no class
+                    self.statistics.count_dropped(stats.UNLABELED)
+                    continue
+
+                with self.statistics.timer('window'), \
+                        profiling.stage('loader.window', 1):
+                    window_data = data_shred.iloc[start_idx:end_idx]
+                    window_data = window_data.reset_index(drop=True)
 
                 if self.perform_interpolation:
                     if len(window_data) < expected_no_samples_per_window:
+                        self.statistics.count_dropped(stats.TOO_FEW_SAMPLES)
                         continue
                     else:
                         assert len(window_data) == \
                                expected_no_samples_per_window
                 else:
                     if len(window_data) < self.min_no_samples_per_window:
+                        self.statistics.count_dropped(stats.TOO_FEW_SAMPLES)
                         continue
 
-                yield window_data, label
+                self.statistics.count(stats.WINDOWS_CREATED)
+                yield window_data, int(label)
+
+    def _get_num_channels(self):
+        return 4 if self.include_magnitude else 3
+
+    def _get_window_array(self, window_data):
+        """
+        Returns the (no. channels, no. samples) array of the given window
+        """
+        window_array = np.empty((self._get_num_channels(), len(window_data)))
+        window_array[:3] = window_data[['x', 'y', 'z']].values.T
+
+        if self.include_magnitude:
+            magnitude.from_arrays(
+                window_array[0], window_array[1], window_array[2],
+                out=window_array[3])
+
+        return window_array
 
     def get_dataset_for_users(self, users: list, date=None):
         all_windows = []
 
         for user in users:
-            for window in self.get_user_data_windows(user, date):
-                window_data = np.array([
-                    window[0]['x'].as_matrix(),
-                    window[0]['y'].as_matrix(),
-                    window[0]['z'].as_matrix(),
-                ])
+            for window in self._get_user_data_windows(user, date):
+                window_data = self._get_window_array(window[0])
                 window_label = window[1]
 
                 all_windows.append((window_data, window_label))
 
-        return AccelerometerDataset(all_windows)
+        return AccelerometerDataset(all_windows, self.classes)
+
+    def get_tensor_dataset_for_users(
+            self, users: list = None, date=None, pin_memory=False,
+            shared_memory=False):
+        """
+        Like `get_dataset_for_users( )` but returns an
+        `AccelerometerTensorDataset` holding all windows in one contiguous
+        tensor. Requires interpolation to be performed or a
+        `fixed_length_mode` to be set since otherwise the windows may differ
+        in their number of samples.
+
+        The user and the date of each window are stored as the metadata
+        entries 'user' and 'date'. Thus, the windows can be computed once for
+        all users (`users=None`) and then be split into training, validation
+        and test sets or cross validation folds without re-computation (see
+        `accelerometerfeatures.utils.pytorch.splits`).
+
+        With `shared_memory` the windows are stored in shared memory blocks
+        (see `AccelerometerTensorDataset`), e.g. for data loaders with many
+        workers.
+        """
+        assert self.perform_interpolation or \
+            self.fixed_length_mode is not None
+
+        if users is None:
+            users = self.users
+
+        window_arrays = []
+        window_sample_times = []
+        window_labels = []
+        window_users = []
+        window_dates = []
+
+        for user in users:
+            for window_data, window_label in \
+                    self._get_user_data_windows(user, date):
+
+                window_arrays.append(self._get_window_array(window_data))
+                window_labels.append(window_label)
+                window_users.append(user)
+                window_dates.append(window_data.timestamp.iloc[0].date())
+
+                if self.fixed_length_mode == 'resample':
+                    window_sample_times.append(
+                        (window_data.timestamp -
+                         window_data.timestamp.iloc[0]).dt.total_seconds()
+                        .values)
+
+        metadata = {
+            'user': np.array(window_users, dtype=object),
+            'date': np.array(window_dates, dtype='datetime64[D]'),
+        }
+
+        no_samples_per_window = \
+            self.window_size_in_seconds * self.interpolation_frequency
+        mask = None
+
+        if not window_arrays:
+            data = np.empty(
+                (0, self._get_num_channels(), no_samples_per_window),
+                dtype=np.float32)
+        elif self.perform_interpolation:
+            data = np.stack(window_arrays)
+        elif self.fixed_length_mode == 'pad':
+            data, mask = pad_windows(window_arrays, no_samples_per_window)
+        else:
+            data = resample_windows(
+                window_arrays, no_samples_per_window, window_sample_times,
+                self.window_size_in_seconds)
+
+        return AccelerometerTensorDataset.from_array(
+            data, window_labels, pin_memory, metadata, mask, self.classes,
+            shared_memory)
 
 
 if __name__ == '__main__':
+    import matplotlib.pyplot as plt
+
     arg_parser = ArgumentParser()
     arg_parser.add_argument('input_file')
     arg_parser.add_argument('user')
@@ -0,0 +1,82 @@
+"""
+Numpy arrays backed by `multiprocessing.shared_memory` blocks (Python 3.8
+or newer).
+
+A `SharedArray` is pickled as the name, shape and dtype of its block only.
+Unpickling it (e.g. in a data loader worker) attaches to the existing block
+instead of copying the data, so the memory used for the window data stays
+the same no matter how many workers access it.
+
+The process which created a block owns it: The block is unlinked once the
+owner's array is garbage collected or the owner exits. Attached processes
+only unmap the block.
+"""
+import weakref
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+
+def _release(shared_memory, is_owner):
+    try:
+        shared_memory.close()
+    except BufferError:
+        # at interpreter exit the array may still be referenced
+        pass
+
+    if is_owner:
+        try:
+            shared_memory.unlink()
+        except FileNotFoundError:
+            pass
+
+
+class SharedArray(object):
+    """
+    :param shape: The shape of the array
+    :param dtype: The dtype of the array
+    :param name: The name of an existing shared memory block to attach to.
+        If None, a new block is created.
+    """
+    def __init__(self, shape, dtype, name=None):
+        self.shape = tuple(int(s) for s in shape)
+        self.dtype = np.dtype(dtype)
+
+        if name is None:
+            num_bytes = int(np.prod(self.shape)) * self.dtype.itemsize
+            # blocks of size 0 can not be created
+            self.shared_memory = SharedMemory(
+                create=True, size=max(num_bytes, 1))
+            self.is_owner = True
+        else:
+            self.shared_memory = SharedMemory(name=name)
+            self.is_owner = False
+
+        self.array = np.ndarray(
+            self.shape, self.dtype, buffer=self.shared_memory.buf)
+
+        # the block must stay mapped as long as the array (or e.g. a tensor
+        # created from it) is alive
+        weakref.finalize(
+            self.array, _release, self.shared_memory, self.is_owner)
+
+    @property
+    def name(self):
+        return self.shared_memory.name
+
+    @classmethod
+    def from_array(cls, array):
+        """
+        Returns a `SharedArray` holding a copy of the given array
+        """
+        array = np.asarray(array)
+        shared_array = cls(array.shape, array.dtype)
+        shared_array.array[...] = array
+
+        return shared_array
+
+    def __getstate__(self):
+        return {'name': self.name, 'shape': self.shape, 'dtype': self.dtype}
+
+    def __setstate__(self, state):
+        self.__init__(state['shape'], state['dtype'], state['name'])
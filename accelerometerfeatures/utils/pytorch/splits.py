@@ -0,0 +1,106 @@
+"""
+Splitting of `AccelerometerTensorDataset` objects into training, validation
+and test sets or cross validation folds. All splits are grouped by a metadata
+key (e.g. 'user' or 'date') such that the windows of one group never end up
+in different parts of a split. The returned data sets are index views on the
+original data set, so no windows are re-computed or copied.
+"""
+import numpy as np
+
+
+def _get_groups(dataset, by):
+    """
+    Returns the distinct groups and for each window of the data set the
+    index of the group it belongs to
+    """
+    if by is None:
+        # every window is a group on its own
+        num_windows = len(dataset)
+        return np.arange(num_windows), np.arange(num_windows)
+
+    return np.unique(dataset.get_metadata(by), return_inverse=True)
+
+
+def train_val_test_split(
+        dataset, val_fraction=0.15, test_fraction=0.15, by='user',
+        seed=None):
+    """
+    Randomly assigns the groups of the given data set to a training, a
+    validation and a test set.
+
+    :param dataset: An `AccelerometerTensorDataset` (or a subset of it)
+    :param val_fraction: The fraction of groups which should be used for
+        validation
+    :param test_fraction: The fraction of groups which should be used for
+        testing
+    :param by: The metadata key to group the windows by, e.g. 'user' or
+        'date'. If None, windows are assigned individually.
+    :param seed: Seed for the random assignment of groups
+    :return: A tuple (training set, validation set, test set)
+    """
+    assert 0 <= val_fraction and 0 <= test_fraction
+    assert val_fraction + test_fraction <= 1
+
+    groups, window_groups = _get_groups(dataset, by)
+    num_groups = len(groups)
+
+    num_val_groups = int(round(num_groups * val_fraction))
+    num_test_groups = int(round(num_groups * test_fraction))
+
+    shuffled_groups = np.random.RandomState(seed).permutation(num_groups)
+    group_part = np.zeros(num_groups, dtype=np.int8)  # 0 --> training
+    group_part[shuffled_groups[:num_val_groups]] = 1
+    group_part[shuffled_groups[
+        num_val_groups:num_val_groups + num_test_groups]] = 2
+
+    window_part = group_part[window_groups]
+
+    return tuple(
+        dataset.subset(np.flatnonzero(window_part == part))
+        for part in range(3))
+
+
+def group_k_fold(dataset, k, by='user', seed=None):
+    """
+    Generates k (training set, test set) tuples where the groups of the data
+    set are distributed over the k test sets.
+
+    :param dataset: An `AccelerometerTensorDataset` (or a subset of it)
+    :param k: The number of folds
+    :param by: The metadata key to group the windows by, e.g. 'user' or
+        'date'. If None, windows are assigned individually.
+    :param seed: Seed for the random assignment of groups to folds. If None,
+        groups are assigned in their sorted order.
+    """
+    groups, window_groups = _get_groups(dataset, by)
+    num_groups = len(groups)
+    assert 1 < k <= num_groups
+
+    group_order = np.arange(num_groups)
+    if seed is not None:
+        group_order = np.random.RandomState(seed).permutation(num_groups)
+
+    group_fold = np.empty(num_groups, dtype=np.int64)
+    group_fold[group_order] = np.arange(num_groups) % k
+
+    window_fold = group_fold[window_groups]
+
+    for fold in range(k):
+        yield (
+            dataset.subset(np.flatnonzero(window_fold != fold)),
+            dataset.subset(np.flatnonzero(window_fold == fold)))
+
+
+def leave_one_group_out(dataset, by='user'):
+    """
+    Generates (group, training set, test set) tuples where each test set
+    contains all windows of one group, e.g. one user, and the training set
+    contains all the others.
+    """
+    groups, window_groups = _get_groups(dataset, by)
+
+    for group_idx, group in enumerate(groups):
+        yield (
+            group,
+            dataset.subset(np.flatnonzero(window_groups != group_idx)),
+            dataset.subset(np.flatnonzero(window_groups == group_idx)))
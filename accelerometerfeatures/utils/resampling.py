@@ -0,0 +1,252 @@
+"""
+Resampling routines used by the `Interpolator`.
+
+Linear interpolation is split into computing, for each target timestamp, the
+index of the preceding source sample together with an interpolation weight
+(`get_linear_interpolation_weights( )`) and applying those to the values
+(`linear_interpolate( )`). Thus, the search is done once per data shred and
+not once per column. For nearly uniformly sampled data the preceding source
+samples are found by a merge-like linear pass instead of a binary search.
+
+Data shreds, or segments of them (see `get_near_uniform_segments( )`), whose
+samples are (nearly) uniformly spaced in time can be resampled with a
+polyphase filter (see `scipy.signal.resample_poly`) which applies an
+anti-aliasing low-pass filter. This avoids aliasing when e.g.
+100 Hz data is downsampled to 16 Hz, which plain linear interpolation does
+not.
+
+Target sample grids are generated in integer nanoseconds (see
+`get_target_grid( )`), so the grid timestamps are exact and their number does
+not depend on accumulated floating point errors.
+"""
+from fractions import Fraction
+
+import numpy as np
+
+NANOSECONDS_PER_SECOND = 10 ** 9
+
+
+def to_nanoseconds(datetimes):
+    """
+    Returns the given datetimes (e.g. a datetime64 column) as int64
+    nanoseconds since the epoch
+    """
+    return np.asarray(datetimes).astype('datetime64[ns]').view(np.int64)
+
+
+def get_sample_period_in_ns(frequency):
+    """
+    Returns the sample period of the given frequency in whole nanoseconds.
+    The period is rounded up, so a time interval of n / frequency seconds
+    never holds more than n samples.
+    """
+    return int(np.ceil(NANOSECONDS_PER_SECOND / float(frequency)))
+
+
+def get_target_grid(start, end, period):
+    """
+    Returns the int64 timestamps start, start + period, ... before (i.e.
+    excluding, like `np.arange( )`) end. All values are integers, e.g.
+    nanoseconds.
+    """
+    start, end, period = int(start), int(end), int(period)
+    assert period > 0
+
+    num_samples = max((end - start - 1) // period + 1, 0)
+
+    return start + np.arange(num_samples, dtype=np.int64) * period
+
+
+def is_near_uniform(timestamps, max_jitter=0.1):
+    """
+    Checks whether the given (sorted) timestamps are nearly uniformly spaced,
+    i.e. whether no time difference between two consecutive timestamps
+    deviates from the median time difference by more than `max_jitter` times
+    the median time difference.
+    """
+    if len(timestamps) < 3:
+        return False
+
+    diffs = np.diff(timestamps)
+    period = np.median(diffs)
+
+    if period <= 0:
+        return False
+
+    return np.max(np.abs(diffs - period)) <= max_jitter * period
+
+
+def get_near_uniform_segments(timestamps, max_jitter=0.1, min_num_samples=3):
+    """
+    Splits the given (sorted) timestamps at all time differences which
+    deviate from the median time difference by more than `max_jitter` times
+    the median time difference (e.g. dropped samples or gaps), i.e. the
+    samples of each segment are nearly uniformly spaced.
+
+    :param min_num_samples: Segments with fewer samples are omitted
+    :return: A list of (start index, end index) tuples where the end index is
+        excluding
+    """
+    if len(timestamps) < max(min_num_samples, 2):
+        return []
+
+    diffs = np.diff(timestamps)
+    period = np.median(diffs)
+
+    if period <= 0:
+        return []
+
+    breaks = np.flatnonzero(np.abs(diffs - period) > max_jitter * period) + 1
+    starts = np.concatenate([[0], breaks])
+    ends = np.concatenate([breaks, [len(timestamps)]])
+    long_enough = ends - starts >= min_num_samples
+
+    return [
+        (int(start), int(end))
+        for start, end in zip(starts[long_enough], ends[long_enough])]
+
+
+def get_resampling_factors(
+        source_frequency, target_frequency, max_denominator=100):
+    """
+    Approximates the ratio of the target and the source frequency by a
+    fraction up/down and returns (up, down)
+    """
+    ratio = Fraction(target_frequency / source_frequency).limit_denominator(
+        max_denominator)
+
+    # ratio might be 0 for extreme down-sampling
+    return max(ratio.numerator, 1), ratio.denominator
+
+
+def polyphase_resample(
+        timestamps, values, target_timestamps, max_denominator=100):
+    """
+    Resamples the values of a nearly uniformly sampled shred onto the given
+    target timestamps using polyphase filtering.
+
+    The values are first resampled by the rational factor up/down which
+    approximates the ratio of the target and the source sample rate.
+    The source sample rate is derived from the mean sample period, not the
+    median one, since e.g. 60 Hz timestamps rounded to whole milliseconds
+    have a median period of 17 ms instead of 16.67 ms. The filtered samples
+    are placed at their positions between the actual source timestamps and
+    then linearly interpolated onto the exact target timestamps, so they
+    don't drift from the source samples.
+
+    :param timestamps: The (nearly uniformly spaced) source timestamps in
+        seconds
+    :param values: The source values
+    :param target_timestamps: Equidistant target timestamps in seconds
+    """
+    from scipy.signal import resample_poly
+
+    timestamps = np.asarray(timestamps, dtype=float)
+    num_samples = len(timestamps)
+    source_period = (timestamps[-1] - timestamps[0]) / (num_samples - 1)
+    target_period = target_timestamps[1] - target_timestamps[0] \
+        if len(target_timestamps) > 1 else source_period
+
+    up, down = get_resampling_factors(
+        1. / source_period, 1. / target_period, max_denominator)
+
+    values = np.asarray(values, dtype=float)
+
+    # The filter assumes zeros beyond the data boundaries. Removing the mean
+    # (which is considerable due to gravity) reduces the resulting artifacts
+    # at the shred boundaries.
+    mean = values.mean()
+    filtered = resample_poly(values - mean, up, down) + mean
+
+    # Filtered sample k lies at the (fractional) source sample position
+    # k * down / up. The last filtered samples may lie after the last source
+    # sample and are placed by extrapolating with the mean period.
+    positions = np.arange(len(filtered)) * (down / float(up))
+    filtered_timestamps = np.interp(
+        positions, np.arange(num_samples), timestamps)
+    beyond_last = positions > num_samples - 1
+    filtered_timestamps[beyond_last] = timestamps[-1] + \
+        (positions[beyond_last] - (num_samples - 1)) * source_period
+
+    return np.interp(target_timestamps, filtered_timestamps, filtered)
+
+
+def _get_uniform_preceding_idxs(
+        timestamps, target_timestamps, max_iterations):
+    """
+    Finds the index of the source sample preceding each target timestamp for
+    nearly uniformly sampled source timestamps without a binary search. The
+    index is estimated from the average sample period and then corrected
+    step-wise for the jitter. Since the jitter is small, only few correction
+    steps are needed, so this is O(N).
+
+    Returns None if the estimate could not be corrected within
+    `max_iterations` steps.
+    """
+    num_samples = len(timestamps)
+    period = (timestamps[-1] - timestamps[0]) / (num_samples - 1)
+
+    idxs = ((target_timestamps - timestamps[0]) / period).astype(np.int64)
+    np.clip(idxs, 0, num_samples - 2, out=idxs)
+
+    for _ in range(max_iterations):
+        too_low = timestamps[idxs + 1] <= target_timestamps
+        too_low &= idxs < num_samples - 2
+        too_high = timestamps[idxs] > target_timestamps
+        too_high &= idxs > 0
+
+        if not (too_low.any() or too_high.any()):
+            return idxs
+
+        idxs += too_low
+        idxs -= too_high
+
+    return None
+
+
+def get_linear_interpolation_weights(
+        timestamps, target_timestamps, near_uniform=False,
+        max_iterations=8):
+    """
+    Computes for each target timestamp the index of the preceding source
+    sample and the weight of the succeeding source sample for linear
+    interpolation. Target timestamps are expected to lie within the range of
+    the source timestamps.
+
+    :param timestamps: Sorted source timestamps
+    :param target_timestamps: Sorted target timestamps
+    :param near_uniform: Whether the source timestamps are known to be nearly
+        uniformly spaced (see `is_near_uniform( )`). If so, the preceding
+        samples are looked up by a linear pass instead of a binary search.
+    :return: A tuple (preceding sample indexes, weights)
+    """
+    timestamps = np.asarray(timestamps, dtype=float)
+    target_timestamps = np.asarray(target_timestamps, dtype=float)
+
+    idxs = None
+    if near_uniform:
+        idxs = _get_uniform_preceding_idxs(
+            timestamps, target_timestamps, max_iterations)
+
+    if idxs is None:
+        idxs = np.searchsorted(timestamps, target_timestamps, side='right')
+        idxs -= 1
+        np.clip(idxs, 0, len(timestamps) - 2, out=idxs)
+
+    deltas = timestamps[idxs + 1] - timestamps[idxs]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        weights = np.where(
+            deltas > 0, (target_timestamps - timestamps[idxs]) / deltas, 0.)
+
+    return idxs, weights
+
+
+def linear_interpolate(values, idxs, weights):
+    """
+    Linearly interpolates the given values using the preceding sample indexes
+    and weights computed by `get_linear_interpolation_weights( )`
+    """
+    values = np.asarray(values, dtype=float)
+    preceding = values[idxs]
+
+    return preceding + weights * (values[idxs + 1] - preceding)
@@ -0,0 +1,138 @@
+"""
+Aggregation of values over contiguous row ranges (segments), e.g. over data
+shreds, windows or the rows of one user and day, in one vectorized pass using
+`np.ufunc.reduceat` instead of a Python loop with boolean masks:
+
+    result = segment_reduce(values, starts, ends, ('mean', 'max'))
+    result['mean']  # (no. segments, no. columns) array
+"""
+import numpy as np
+
+REDUCTIONS = ('sum', 'mean', 'var', 'min', 'max', 'count')
+
+
+def _reduceat(ufunc, values, idxs, num_segments):
+    """
+    Applies `ufunc.reduceat( )` on the interleaved start/end indexes and
+    returns the reductions of the segments (i.e. every second result)
+    """
+    return ufunc.reduceat(values, idxs, axis=0)[:2 * num_segments:2]
+
+
+def get_run_bounds(keys):
+    """
+    Returns the start and end indexes of the runs of equal consecutive keys,
+    e.g. [a, a, b, b, b, a] --> ([0, 2, 5], [2, 5, 6]). For sorted keys
+    these are the bounds of the groups.
+    """
+    keys = np.asarray(keys)
+
+    if len(keys) == 0:
+        no_runs = np.zeros(0, dtype=np.int64)
+        return no_runs, no_runs
+
+    run_starts = np.concatenate(
+        [[0], np.flatnonzero(keys[1:] != keys[:-1]) + 1])
+    run_ends = np.append(run_starts[1:], len(keys))
+
+    return run_starts, run_ends
+
+
+def segment_reduce(values, starts, ends, reductions=REDUCTIONS, ddof=0):
+    """
+    Computes the given reductions of the rows start[i] until (excluding)
+    end[i] of `values` for all segments i at once. Segments may be empty or
+    overlap.
+
+    The variance is computed from sums of values shifted by the overall mean
+    of each column which avoids most of the cancellation of the naive
+    sum of squares formula for values with a big offset (e.g. gravity).
+
+    :param values: A (no. rows, ...) array
+    :param starts: The index of the first row of each segment
+    :param ends: The index after the last row of each segment
+    :param reductions: The names of the reductions to compute out of 'sum',
+        'mean', 'var', 'min', 'max' and 'count'
+    :param ddof: Delta degrees of freedom for the variance (use 1 for the
+        sample variance)
+    :return: A dict mapping the reduction names to (no. segments, ...)
+        arrays ('count' is a 1D int64 array). The mean, variance, minimum
+        and maximum of segments without (enough) rows are NaN.
+    """
+    assert all(r in REDUCTIONS for r in reductions)
+
+    values = np.asarray(values)
+    starts = np.asarray(starts, dtype=np.int64)
+    ends = np.asarray(ends, dtype=np.int64)
+    num_segments = len(starts)
+    num_rows = len(values)
+
+    counts = ends - starts
+    assert (counts >= 0).all()
+    is_empty = counts == 0
+
+    idxs = np.empty(2 * num_segments, dtype=np.int64)
+    idxs[0::2] = starts
+    idxs[1::2] = ends
+
+    if (idxs[:-1] >= num_rows).any():
+        # e.g. empty segments at the end; the padding row is never part of
+        # a segment
+        values = np.concatenate(
+            [values, np.zeros((1,) + values.shape[1:], dtype=values.dtype)])
+    elif num_segments > 0 and idxs[-1] == num_rows:
+        # reduceat( ) reduces up to the end of the array for the last index,
+        # so a last segment end equal to the number of rows is left out
+        idxs = idxs[:-1]
+
+    # the value of an empty segment's start row is returned for it
+    empty_mask = is_empty.reshape((-1,) + (1,) * (values.ndim - 1))
+
+    result = {}
+
+    if 'count' in reductions:
+        result['count'] = counts
+
+    if num_segments == 0:
+        for reduction in reductions:
+            if reduction != 'count':
+                result[reduction] = np.zeros((0,) + values.shape[1:])
+        return result
+
+    float_counts = counts.astype(float).reshape(empty_mask.shape)
+
+    if 'sum' in reductions or 'mean' in reductions:
+        sums = np.where(
+            empty_mask, 0, _reduceat(np.add, values, idxs, num_segments))
+
+        if 'sum' in reductions:
+            result['sum'] = sums
+
+        if 'mean' in reductions:
+            with np.errstate(invalid='ignore', divide='ignore'):
+                result['mean'] = np.where(
+                    empty_mask, np.nan, sums / float_counts)
+
+    if 'var' in reductions:
+        shifted = values - values[:num_rows].mean(axis=0) \
+            if num_rows > 0 else values.astype(float)
+        shifted_sums = np.where(
+            empty_mask, 0, _reduceat(np.add, shifted, idxs, num_segments))
+        squared_sums = np.where(
+            empty_mask, 0,
+            _reduceat(np.add, shifted * shifted, idxs, num_segments))
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            variances = \
+                (squared_sums - shifted_sums * shifted_sums / float_counts) / \
+                (float_counts - ddof)
+        result['var'] = np.where(
+            float_counts - ddof > 0, np.maximum(variances, 0), np.nan)
+
+    for reduction, ufunc in (('min', np.minimum), ('max', np.maximum)):
+        if reduction in reductions:
+            result[reduction] = np.where(
+                empty_mask, np.nan,
+                _reduceat(ufunc, values, idxs, num_segments))
+
+    return result
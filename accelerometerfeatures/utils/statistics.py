@@ -0,0 +1,156 @@
+"""
+Counters and timers collecting statistics about the data processing, e.g.
+how many rows were read, how many gaps were cut and how many windows were
+dropped for which reason.
+
+Statistics are only collected if a `ProcessingStatistics` object is passed to
+the processing functions/classes. Otherwise the shared, disabled
+`NO_STATISTICS` object is used whose methods return right away.
+
+Updates are thread-safe, so one object can be shared by the workers of
+`accelerometerfeatures.utils.parallel.parallel_map( )`.
+"""
+import threading
+import time
+from collections import Counter
+from collections import defaultdict
+
+ROWS_READ = 'rows_read'
+SHREDS_FOUND = 'shreds_found'
+GAPS_CUT = 'gaps_cut'
+GAPS_FILLED = 'gaps_filled'
+WINDOWS_CREATED = 'windows_created'
+
+# reasons for dropping data
+MIXED_LABEL = 'mixed_label'
+UNLABELED = 'unlabeled'
+TOO_FEW_SAMPLES = 'too_few_samples'
+SHORT_SHRED = 'short_shred'
+GAP = 'gap'
+
+DROPPED_PREFIX = 'dropped.'
+
+
+class _NullTimer(object):
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class _StageTimer(object):
+    def __init__(self, statistics, stage):
+        self.statistics = statistics
+        self.stage = stage
+        self.start = None
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.statistics.add_time(self.stage, time.perf_counter() - self.start)
+        return False
+
+
+class StatisticsReport(object):
+    """
+    A snapshot of the collected statistics.
+
+    - `counters`: dict mapping counter names (e.g. `ROWS_READ`) to counts
+    - `dropped`: dict mapping drop reasons (e.g. `MIXED_LABEL`) to the number
+      of dropped windows/shreds
+    - `timings`: dict mapping processing stage names to the overall time in
+      seconds spent in that stage
+    """
+    def __init__(self, counters, timings):
+        self.counters = {
+            name: count for name, count in counters.items()
+            if not name.startswith(DROPPED_PREFIX)}
+        self.dropped = {
+            name[len(DROPPED_PREFIX):]: count
+            for name, count in counters.items()
+            if name.startswith(DROPPED_PREFIX)}
+        self.timings = dict(timings)
+
+    def to_dict(self):
+        return {
+            'counters': self.counters,
+            'dropped': self.dropped,
+            'timings': self.timings,
+        }
+
+    def __str__(self):
+        lines = ['%s: %i' % (n, c) for n, c in sorted(self.counters.items())]
+        lines += ['dropped (%s): %i' % (reason, c)
+                  for reason, c in sorted(self.dropped.items())]
+        lines += ['time (%s): %.3fs' % (stage, secs)
+                  for stage, secs in sorted(self.timings.items())]
+
+        return '\n'.join(lines)
+
+
+class ProcessingStatistics(object):
+    """
+    Collects counters and per-stage timings. Hooks can be registered with
+    `add_hook( )` to get notified about every update. A hook is called with
+    the arguments (kind, name, value) where kind is either 'count' or 'time'.
+    """
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.counters = Counter()
+        self.timings = defaultdict(float)
+        self.hooks = []
+        self._lock = threading.Lock()
+
+    def add_hook(self, hook):
+        self.hooks.append(hook)
+
+    def count(self, name, value=1):
+        if not self.enabled:
+            return
+
+        with self._lock:
+            self.counters[name] += value
+
+        for hook in self.hooks:
+            hook('count', name, value)
+
+    def count_dropped(self, reason, value=1):
+        if not self.enabled:
+            return
+
+        self.count(DROPPED_PREFIX + reason, value)
+
+    def add_time(self, stage, seconds):
+        if not self.enabled:
+            return
+
+        with self._lock:
+            self.timings[stage] += seconds
+
+        for hook in self.hooks:
+            hook('time', stage, seconds)
+
+    def timer(self, stage):
+        """
+        Returns a context manager measuring the time spent in the given stage
+        """
+        if not self.enabled:
+            return _NULL_TIMER
+
+        return _StageTimer(self, stage)
+
+    def get_report(self):
+        return StatisticsReport(self.counters, self.timings)
+
+    def reset(self):
+        self.counters.clear()
+        self.timings.clear()
+
+
+NO_STATISTICS = ProcessingStatistics(enabled=False)
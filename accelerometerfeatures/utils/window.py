@@ -1,4 +1,9 @@
 from datetime import datetime
+from datetime import timedelta
+from numbers import Integral
+
+import numpy as np
+from numpy.lib.stride_tricks import as_strided
 
 
 class Window(object):
@@ -16,3 +21,301 @@ class Window(object):
     def __str__(self):
         return 'Window from %s to %s with data:\n%s' % (
             self.start.isoformat(), self.end.isoformat(), str(self.data)[:200])
+
+
+def _to_no_samples(duration, sample_period):
+    """
+    Converts a window size or hop given as duration into a number of samples
+    """
+    if isinstance(duration, timedelta) and \
+            isinstance(sample_period, np.timedelta64):
+        duration = np.timedelta64(duration)
+
+    return int(round(duration / sample_period))
+
+
+def _get_window_end_timestamps(timestamps, start_idxs, size):
+    """
+    The end of a window is the timestamp of the first sample after it. For a
+    window reaching up to the last sample the end is extrapolated by the
+    distance of the last two samples.
+    """
+    end_idxs = start_idxs + size
+    ends = timestamps[np.minimum(end_idxs, len(timestamps) - 1)]
+
+    beyond_last = end_idxs >= len(timestamps)
+    if beyond_last.any():
+        ends = ends.copy()
+        last_period = timestamps[-1] - timestamps[-2] \
+            if len(timestamps) > 1 else 0
+        ends[beyond_last] = timestamps[-1] + last_period
+
+    return ends
+
+
+def sliding_windows(array, timestamps=None, size=None, hop=1):
+    """
+    Returns the windows of `size` samples starting every `hop` samples along
+    the first axis of `array` as a read-only view, i.e. without copying any
+    data. Hence, the windows of e.g. a (no. samples, no. channels) array are
+    returned as a (no. windows, size, no. channels) view. Windows which would
+    reach beyond the last sample are omitted.
+
+    Size and hop can be given as number of samples (int) or as durations in
+    the unit of the timestamps (e.g. seconds for float timestamps or
+    `timedelta`/`np.timedelta64` for datetime64 timestamps). Durations are
+    converted into numbers of samples based on the median sample period, so
+    they are only meaningful for (nearly) uniformly sampled, e.g.
+    interpolated, data. For irregularly sampled data use `window_bounds( )`.
+
+    :param array: The samples, e.g. an interpolated data shred
+    :param timestamps: Optional sorted timestamps of the samples
+    :param size: Window size as number of samples or duration
+    :param hop: Distance of the window starts as number of samples or
+        duration
+    :return: A tuple (windows, start timestamps, end timestamps) where the
+        end of a window is the timestamp of the first sample after it.
+        Without `timestamps` the start and end sample indexes are returned
+        instead.
+    """
+    array = np.asarray(array)
+
+    if not isinstance(size, Integral) or not isinstance(hop, Integral):
+        assert timestamps is not None
+        timestamps = np.asarray(timestamps)
+        sample_period = np.median(np.diff(timestamps))
+
+        if not isinstance(size, Integral):
+            size = _to_no_samples(size, sample_period)
+        if not isinstance(hop, Integral):
+            hop = _to_no_samples(hop, sample_period)
+
+    assert size > 0 and hop > 0
+
+    num_samples = array.shape[0]
+    num_windows = max((num_samples - size) // hop + 1, 0)
+
+    windows = as_strided(
+        array,
+        shape=(num_windows, size) + array.shape[1:],
+        strides=(array.strides[0] * hop,) + array.strides,
+        writeable=False)
+
+    start_idxs = np.arange(num_windows) * hop
+
+    if timestamps is None:
+        return windows, start_idxs, start_idxs + size
+
+    timestamps = np.asarray(timestamps)
+
+    return (
+        windows,
+        timestamps[start_idxs],
+        _get_window_end_timestamps(timestamps, start_idxs, size))
+
+
+def iter_chunk_windows(chunks, size, hop=1):
+    """
+    Computes the sliding windows (see `sliding_windows( )`) of a long series
+    of samples which is given as consecutive chunks, e.g. read from disk.
+    The samples of windows spanning a chunk boundary are carried over to the
+    next chunk (less than size samples), so the windows are the same as for
+    the whole series while only about one chunk of samples is held in
+    memory. If hop is bigger than size, the samples between two windows are
+    skipped even if they span several chunks.
+
+    :param chunks: An iterable of arrays with the consecutive samples along
+        their first axis
+    :return: A generator yielding a tuple (windows, index of the first
+        window) per chunk completing at least one window. The windows are a
+        view which is only valid until the next tuple is requested.
+    """
+    assert size > 0 and hop > 0
+
+    carry = None
+    # the number of samples until the start of the next window
+    num_samples_to_skip = 0
+    num_windows = 0
+
+    for chunk in chunks:
+        chunk = np.asarray(chunk)
+
+        if num_samples_to_skip > 0:
+            num_skipped = min(num_samples_to_skip, len(chunk))
+            chunk = chunk[num_skipped:]
+            num_samples_to_skip -= num_skipped
+
+        samples = chunk if carry is None else np.concatenate([carry, chunk])
+
+        if len(samples) < size:
+            carry = samples
+            continue
+
+        windows = sliding_windows(samples, size=size, hop=hop)[0]
+        yield windows, num_windows
+
+        num_windows += len(windows)
+        next_start = len(windows) * hop
+        carry = samples[next_start:]
+        num_samples_to_skip = max(next_start - len(samples), 0)
+
+
+def window_bounds(timestamps, size, hop):
+    """
+    Computes time based windows for (possibly irregularly sampled) data.
+    Windows start every `hop` after the first timestamp and cover the time
+    interval [start, start + size). Windows ending after the last timestamp
+    are omitted. Since the windows may hold different numbers of samples,
+    the sample index ranges are returned instead of views.
+
+    :param timestamps: Sorted timestamps, e.g. float seconds or datetime64
+    :param size: The window duration in the unit of the timestamps
+    :param hop: The distance of the window starts
+    :return: A tuple (start indexes, end indexes, start timestamps, end
+        timestamps) where the samples of window i are those at the indexes
+        start indexes[i] until (excluding) end indexes[i]
+    """
+    timestamps = np.asarray(timestamps)
+
+    if np.issubdtype(timestamps.dtype, np.datetime64):
+        size = np.timedelta64(size)
+        hop = np.timedelta64(hop)
+
+    if len(timestamps) == 0:
+        no_windows = np.zeros(0, dtype=np.int64)
+        return no_windows, no_windows, timestamps[:0], timestamps[:0]
+
+    num_windows = int((timestamps[-1] - timestamps[0] - size) // hop) + 1
+    num_windows = max(num_windows, 0)
+
+    starts = timestamps[0] + np.arange(num_windows) * hop
+    ends = starts + size
+
+    return (
+        np.searchsorted(timestamps, starts),
+        np.searchsorted(timestamps, ends),
+        starts,
+        ends)
+
+
+def get_num_invalid_samples(valid, start_idxs, size):
+    """
+    Counts the invalid samples (e.g. samples within a gap) of each window
+
+    :param valid: Boolean array which is False for invalid samples
+    :param start_idxs: The index of the first sample of each window
+    :param size: The number of samples per window
+    """
+    num_invalid_before = np.concatenate(
+        [[0], np.cumsum(~np.asarray(valid, dtype=bool))])
+
+    return num_invalid_before[start_idxs + size] - \
+        num_invalid_before[start_idxs]
+
+
+def _concatenate_windows(windows):
+    """
+    Concatenates a list of (no. channels, no. samples) window arrays along the
+    sample axis and returns the concatenated array together with the start
+    offsets and lengths of the windows.
+    """
+    lengths = np.array([np.shape(w)[-1] for w in windows], dtype=np.int64)
+    offsets = np.zeros(len(windows), dtype=np.int64)
+    np.cumsum(lengths[:-1], out=offsets[1:])
+
+    return np.concatenate(windows, axis=-1), offsets, lengths
+
+
+def pad_windows(windows, num_samples, fill_value=0.):
+    """
+    Turns a list of windows with varying numbers of samples into one array of
+    fixed length windows. Shorter windows are padded with `fill_value`,
+    longer windows are truncated.
+
+    :param windows: A list of (no. channels, no. samples) arrays
+    :param num_samples: The number of samples each output window should have
+    :return: A tuple of a (no. windows, no. channels, num_samples) float32
+        array and a (no. windows, num_samples) boolean mask which is True for
+        all entries holding actual (i.e. not padded) samples
+    """
+    flat, offsets, lengths = _concatenate_windows(windows)
+
+    positions = np.arange(num_samples)
+    mask = positions[np.newaxis, :] < lengths[:, np.newaxis]
+
+    # for padded entries just any valid source index is used and the value
+    # is overwritten afterwards
+    source_idxs = offsets[:, np.newaxis] + \
+        np.minimum(positions[np.newaxis, :], lengths[:, np.newaxis] - 1)
+
+    # (no. channels, no. windows, num_samples) --> (no. windows, ...)
+    padded = np.moveaxis(flat[:, source_idxs], 0, 1).astype(np.float32)
+    padded[~np.broadcast_to(mask[:, np.newaxis, :], padded.shape)] = \
+        fill_value
+
+    return padded, mask
+
+
+def resample_windows(
+        windows, num_samples, sample_times=None, window_duration=None):
+    """
+    Linearly resamples a list of windows with varying numbers of samples to
+    windows with exactly `num_samples` samples. The resampling is done for
+    all windows at once without looping over them.
+
+    If `sample_times` is None, samples are assumed to be equidistant and the
+    first and last sample of each window are kept. Otherwise the windows are
+    resampled on a regular grid of `num_samples` points covering
+    [0, window_duration), which accounts for irregular sample times.
+    Target points before the first or after the last sample of a window get
+    the value of that sample.
+
+    :param windows: A list of (no. channels, no. samples) arrays
+    :param num_samples: The number of samples each output window should have
+    :param sample_times: Optional list of arrays holding the sample times of
+        each window relative to the window start, e.g. in seconds
+    :param window_duration: The duration of a window in the same unit as the
+        sample times; required if `sample_times` is given
+    :return: A (no. windows, no. channels, num_samples) float32 array
+    """
+    flat, offsets, lengths = _concatenate_windows(windows)
+    num_windows = len(windows)
+
+    if sample_times is None:
+        times = np.concatenate([np.arange(l) for l in lengths]).astype(float)
+        target_times = \
+            np.linspace(0, 1, num_samples)[np.newaxis, :] * \
+            (lengths[:, np.newaxis] - 1)
+        span = max(lengths.max(), 1) + 1.
+    else:
+        assert window_duration is not None
+        times = np.concatenate(sample_times).astype(float)
+        target_times = np.broadcast_to(
+            np.arange(num_samples) * (window_duration / num_samples),
+            (num_windows, num_samples))
+        span = max(window_duration, times.max(), 0) + 1.
+
+    # Shifting each window's times by a multiple of a span which is bigger
+    # than any window makes the times of all windows one increasing sequence,
+    # so a single binary search finds the neighbours of all target points
+    window_shifts = np.arange(num_windows) * span
+    shifted_times = times + np.repeat(window_shifts, lengths)
+    shifted_target_times = target_times + window_shifts[:, np.newaxis]
+
+    upper = np.searchsorted(shifted_times, shifted_target_times)
+    first = offsets[:, np.newaxis]
+    last = (offsets + lengths - 1)[:, np.newaxis]
+    upper = np.clip(upper, np.minimum(first + 1, last), last)
+    lower = np.maximum(upper - 1, first)
+
+    delta = shifted_times[upper] - shifted_times[lower]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        weight = np.where(
+            delta > 0,
+            (shifted_target_times - shifted_times[lower]) / delta,
+            0.)
+    weight = np.clip(weight, 0., 1.)
+
+    resampled = flat[:, lower] * (1 - weight) + flat[:, upper] * weight
+
+    return np.moveaxis(resampled, 0, 1).astype(np.float32)
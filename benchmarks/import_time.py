@@ -0,0 +1,73 @@
+"""
+Measures how long importing the modules of this package takes and which
+heavy dependencies get loaded by each import. Every import is done in a fresh
+interpreter to avoid measuring cached modules.
+
+Usage:
+    python benchmarks/import_time.py [--repeat N] [--max-seconds S]
+
+If --max-seconds is given, the script exits with status 1 if any module
+takes longer to import.
+"""
+import json
+import subprocess
+import sys
+from argparse import ArgumentParser
+
+MODULES = [
+    'accelerometerfeatures',
+    'accelerometerfeatures.time.magnitude',
+    'accelerometerfeatures.time.mean',
+    'accelerometerfeatures.time.stdev',
+    'accelerometerfeatures.frequency.fouriertransformation',
+    'accelerometerfeatures.utils.interpolation',
+    'accelerometerfeatures.utils.pytorch',
+    'accelerometerfeatures.utils.pytorch.dataset',
+]
+
+HEAVY_DEPENDENCIES = ['matplotlib', 'scipy', 'torch', 'pandas', 'numba']
+
+_MEASURE_SNIPPET = '''
+import json, sys, time
+start = time.perf_counter()
+import %s
+duration = time.perf_counter() - start
+heavy = [m for m in %r if m in sys.modules]
+print(json.dumps({'seconds': duration, 'loaded': heavy}))
+'''
+
+
+def measure_import(module_name):
+    output = subprocess.check_output([
+        sys.executable,
+        '-c',
+        _MEASURE_SNIPPET % (module_name, HEAVY_DEPENDENCIES)])
+
+    return json.loads(output.decode('utf-8'))
+
+
+def main():
+    arg_parser = ArgumentParser()
+    arg_parser.add_argument('--repeat', type=int, default=3)
+    arg_parser.add_argument('--max-seconds', type=float)
+    args = arg_parser.parse_args()
+
+    too_slow = False
+
+    for module_name in MODULES:
+        measurements = [measure_import(module_name)
+                        for _ in range(args.repeat)]
+        best = min([m['seconds'] for m in measurements])
+
+        print('%-55s %8.3fs  loads: %s' % (
+            module_name, best, ', '.join(measurements[0]['loaded']) or '-'))
+
+        if args.max_seconds is not None and best > args.max_seconds:
+            too_slow = True
+
+    if too_slow:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
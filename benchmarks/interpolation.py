@@ -0,0 +1,72 @@
+"""
+Compares the throughput of linear interpolation with scipy's interp1d (as
+used before), the binary search based weights and the linear pass for nearly
+uniformly sampled data, as well as polyphase resampling.
+
+Usage:
+    PYTHONPATH=. python benchmarks/interpolation.py [--num-samples N]
+"""
+import timeit
+from argparse import ArgumentParser
+
+import numpy as np
+from scipy.interpolate import interp1d
+
+from accelerometerfeatures.utils import resampling
+
+
+def main():
+    arg_parser = ArgumentParser()
+    arg_parser.add_argument('--num-samples', type=int, default=1000000)
+    arg_parser.add_argument('--num-columns', type=int, default=3)
+    arg_parser.add_argument('--source-frequency', type=float, default=100)
+    arg_parser.add_argument('--target-frequency', type=float, default=16)
+    arg_parser.add_argument('--repeat', type=int, default=5)
+    args = arg_parser.parse_args()
+
+    rng = np.random.RandomState(42)
+    period = 1. / args.source_frequency
+    timestamps = np.arange(args.num_samples) * period + \
+        rng.uniform(-0.05 * period, 0.05 * period, args.num_samples)
+    columns = [rng.normal(size=args.num_samples)
+               for _ in range(args.num_columns)]
+    target_timestamps = np.arange(
+        timestamps[0], timestamps[-1], 1. / args.target_frequency)
+
+    def scipy_interp1d():
+        for values in columns:
+            interp1d(timestamps, values)(target_timestamps)
+
+    def weights(near_uniform):
+        idxs, w = resampling.get_linear_interpolation_weights(
+            timestamps, target_timestamps, near_uniform)
+
+        for values in columns:
+            resampling.linear_interpolate(values, idxs, w)
+
+    def polyphase():
+        for values in columns:
+            resampling.polyphase_resample(
+                timestamps, values, target_timestamps)
+
+    candidates = [
+        ('scipy interp1d', scipy_interp1d),
+        ('binary search weights', lambda: weights(False)),
+        ('near-uniform linear pass', lambda: weights(True)),
+        ('polyphase', polyphase),
+    ]
+
+    print('%i samples, %i columns, %.1f Hz --> %.1f Hz' % (
+        args.num_samples, args.num_columns, args.source_frequency,
+        args.target_frequency))
+
+    for name, function in candidates:
+        function()  # warm up
+        seconds = min(timeit.repeat(function, number=1, repeat=args.repeat))
+        print('%-26s %8.4fs  %12.0f target samples/s' % (
+            name, seconds,
+            len(target_timestamps) * args.num_columns / seconds))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""
+Compares the throughput of the numba compiled kernels with their numpy
+implementations (see `accelerometerfeatures.utils.kernels`) for gap
+detection, the interpolation of a data shred and windowed mean/standard
+deviation.
+
+Usage:
+    PYTHONPATH=. python benchmarks/kernels.py [--num-samples N]
+
+Without numba only the numpy implementations are measured.
+"""
+import timeit
+from argparse import ArgumentParser
+
+import numpy as np
+
+from accelerometerfeatures.utils import kernels
+
+
+def main():
+    arg_parser = ArgumentParser()
+    arg_parser.add_argument('--num-samples', type=int, default=1000000)
+    arg_parser.add_argument('--source-frequency', type=float, default=100)
+    arg_parser.add_argument('--target-frequency', type=float, default=16)
+    arg_parser.add_argument('--window-size', type=int, default=256)
+    arg_parser.add_argument('--hop-size', type=int, default=32)
+    arg_parser.add_argument('--repeat', type=int, default=5)
+    args = arg_parser.parse_args()
+
+    rng = np.random.RandomState(42)
+    period = 1. / args.source_frequency
+    # irregularly sampled, so the numpy path needs a binary search
+    timestamps = np.cumsum(rng.uniform(0.5 * period, 1.5 * period,
+                                       args.num_samples))
+    values = rng.normal(size=(args.num_samples, 3)) + [0., 0., 9.81]
+    target_timestamps = np.arange(
+        timestamps[0], timestamps[-1], 1. / args.target_frequency)
+
+    def gap_detection():
+        kernels.find_gap_starts(timestamps, 10 * period)
+
+    def interpolation():
+        kernels.interpolate_shred(
+            timestamps, values, target_timestamps, 10 * period, 'nan')
+
+    def window_stats():
+        kernels.window_mean_std(values, args.window_size, args.hop_size)
+
+    candidates = [
+        ('gap detection', gap_detection),
+        ('shred interpolation', interpolation),
+        ('window mean/stdev', window_stats),
+    ]
+
+    print('%i samples, 3 columns, numba %s' % (
+        args.num_samples,
+        'installed' if kernels.HAVE_NUMBA else 'not installed'))
+
+    implementations = [('numpy', False)]
+    if kernels.HAVE_NUMBA:
+        implementations.append(('numba', True))
+
+    for name, function in candidates:
+        seconds = {}
+
+        for implementation, use_numba in implementations:
+            kernels.USE_NUMBA = use_numba
+            function()  # warm up (and compile)
+            seconds[implementation] = min(
+                timeit.repeat(function, number=1, repeat=args.repeat))
+
+        line = '%-22s numpy %8.4fs' % (name, seconds['numpy'])
+        if 'numba' in seconds:
+            line += '  numba %8.4fs  speedup %5.1fx' % (
+                seconds['numba'], seconds['numpy'] / seconds['numba'])
+        print(line)
+
+    kernels.USE_NUMBA = kernels.HAVE_NUMBA
+
+
+if __name__ == '__main__':
+    main()
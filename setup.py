@@ -4,6 +4,9 @@ setup(
     name='accelerometer_features_evaluation',
     version='0.0.3',
     packages=[
+        'accelerometerfeatures',
+        'accelerometerfeatures.frequency',
+        'accelerometerfeatures.time',
         'accelerometerfeatures.utils',
         'accelerometerfeatures.utils.pytorch',
     ],
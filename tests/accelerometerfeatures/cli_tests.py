@@ -0,0 +1,105 @@
+import os
+from datetime import datetime
+from datetime import timedelta
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+import pandas as pd
+
+from accelerometerfeatures import cli
+
+
+class TestCli(TestCase):
+    @staticmethod
+    def _write_recording(file_path, num_entries, frequency):
+        timestamp = datetime(2018, 10, 10, 12, 54, 20)
+
+        with open(file_path, 'w') as csv_file:
+            csv_file.write('x,y,z,timestamp\n')
+
+            for i in range(num_entries):
+                timestamp += timedelta(seconds=1. / frequency)
+                csv_file.write(
+                    '%f,%f,%f,%s\n' % (i % 3, i % 5, -(i % 7), timestamp))
+
+    def test_features_are_computed_and_resumed(self):
+        tmp_dir = TemporaryDirectory()
+        input_dir = os.path.join(tmp_dir.name, 'recordings')
+        output_dir = os.path.join(tmp_dir.name, 'features')
+        os.makedirs(input_dir)
+
+        for name in ['rec01', 'rec02']:
+            self._write_recording(
+                os.path.join(input_dir, name + '.csv'), 200, 16)
+
+        args = [input_dir, '-o', output_dir, '-j', '1',
+                '-f', 'magnitude,mean,fft,interpolation',
+                '--window-size', '16']
+
+        self.assertEqual(0, cli.main(args))
+
+        for feature in ['magnitude', 'mean', 'fft', 'interpolation']:
+            self.assertEqual(
+                ['rec01.csv', 'rec02.csv'],
+                sorted(os.listdir(os.path.join(output_dir, feature))))
+
+        magnitudes = pd.read_csv(
+            os.path.join(output_dir, 'magnitude', 'rec01.csv'))
+        self.assertEqual(200, len(magnitudes))
+
+        means = pd.read_csv(os.path.join(output_dir, 'mean', 'rec01.csv'))
+        self.assertEqual(['x', 'y', 'z'], list(means.columns))
+
+        fft = pd.read_csv(os.path.join(output_dir, 'fft', 'rec01.csv'))
+        self.assertEqual({'x', 'y', 'z'}, set(fft.column))
+        self.assertEqual(3 + 16, len(fft.columns))
+
+        # everything was computed already
+        self.assertEqual(
+            [],
+            cli.get_pending_tasks(
+                cli.find_input_files([input_dir]),
+                ['magnitude', 'mean', 'fft', 'interpolation'],
+                output_dir, 'csv'))
+
+        os.remove(os.path.join(output_dir, 'mean', 'rec02.csv'))
+        pending_tasks = cli.get_pending_tasks(
+            cli.find_input_files([os.path.join(input_dir, '*.csv')]),
+            ['magnitude', 'mean'], output_dir, 'csv')
+        self.assertEqual(1, len(pending_tasks))
+        self.assertEqual(['mean'], list(pending_tasks[0][1]))
+
+    def test_subdirectories_are_mirrored(self):
+        tmp_dir = TemporaryDirectory()
+        input_dir = os.path.join(tmp_dir.name, 'recordings')
+        output_dir = os.path.join(tmp_dir.name, 'features')
+
+        for sub_dir, num_entries in [('a', 100), ('b', 200)]:
+            os.makedirs(os.path.join(input_dir, sub_dir))
+            self._write_recording(
+                os.path.join(input_dir, sub_dir, 'rec.csv'), num_entries, 16)
+
+        self.assertEqual(
+            0, cli.main([input_dir, '-o', output_dir, '-j', '1']))
+
+        for sub_dir, num_entries in [('a', 100), ('b', 200)]:
+            magnitudes = pd.read_csv(
+                os.path.join(output_dir, 'magnitude', sub_dir, 'rec.csv'))
+            self.assertEqual(num_entries, len(magnitudes))
+
+        self.assertEqual(
+            [],
+            cli.get_pending_tasks(
+                cli.find_input_files([input_dir]), ['magnitude'],
+                output_dir, 'csv'))
+
+        # the glob matches are written to the same output files
+        with self.assertRaises(ValueError):
+            cli.get_pending_tasks(
+                cli.find_input_files(
+                    [os.path.join(input_dir, '*', 'rec.csv')]),
+                ['magnitude'], output_dir, 'csv')
+
+    def test_unknown_features_are_rejected(self):
+        with self.assertRaises(SystemExit):
+            cli.main(['.', '-o', '.', '-f', 'magnitude,nonsense'])
@@ -1,9 +1,14 @@
+import os
 from datetime import datetime
+from datetime import timedelta
+from tempfile import TemporaryDirectory
 from unittest import TestCase
 
+import numpy as np
 import pandas as pd
 
 from accelerometerfeatures.frequency import fouriertransformation
+from accelerometerfeatures.utils import statistics as stats
 
 
 class TestFourierTransformation(TestCase):
@@ -269,3 +274,105 @@ class TestFourierTransformation(TestCase):
             fouriertransformation.from_df(data, window_size, frequency)
         self.assertEqual(len(freq_windows), 1+9)
         self.assertEqual(len(freq_windows[0].data), window_size)
+
+    def test_gap_policies(self):
+        """Idea: 4 Hz input data spanning the seconds 0 - 5 and 11 - 20, so
+        there is a gap of 6 seconds which is bigger than 10 entries at 2 Hz.
+
+        With the gap policy 'hold' the data is not cut, so windows start in
+        the interval of 0 - 15.0 --> 31 windows. With the gap policy 'nan' only
+        those windows not containing a sample within the gap (i.e. 5.5 - 10.5)
+        are kept: windows starting at 0, 0.5 and 1.0 and windows starting in
+        the interval of 11.0 - 15.0.
+        """
+        frequency = 2  # Hz
+        window_size = 9  # entries
+        start = datetime(2018, 12, 12, 10, 0, 0)
+        secs = np.concatenate([
+            np.arange(0, 5.25, 0.25), np.arange(11, 20, 0.25)])
+        data = pd.DataFrame.from_dict({
+            'magnitude': np.sin(secs),
+            'timestamp': [start + timedelta(seconds=s) for s in secs]})
+
+        freq_windows = fouriertransformation.from_df(
+            data, window_size, frequency, gap_policy='hold')
+        self.assertEqual(len(freq_windows), 31)
+
+        statistics = stats.ProcessingStatistics()
+        freq_windows = fouriertransformation.from_df(
+            data, window_size, frequency, statistics, gap_policy='nan')
+        self.assertEqual(len(freq_windows), 3 + 9)
+        self.assertEqual(31 - 12, statistics.get_report().dropped[stats.GAP])
+        self.assertFalse(any(np.isnan(w.data).any() for w in freq_windows))
+
+    def test_to_memmap_equals_from_df(self):
+        frequency = 2  # Hz
+        window_size = 9  # entries
+        start = datetime(2018, 12, 12, 10, 0, 0)
+        secs = np.concatenate([
+            np.arange(0, 5.25, 0.25), np.arange(11, 20, 0.25)])
+        data = pd.DataFrame.from_dict({
+            'x': np.sin(secs),
+            'y': np.cos(secs),
+            'timestamp': [start + timedelta(seconds=s) for s in secs]})
+
+        tmp_dir = TemporaryDirectory()
+        file_path = os.path.join(tmp_dir.name, 'coefficients.npy')
+
+        for gap_policy in ['cut', 'nan']:
+            freq_windows = fouriertransformation.from_df(
+                data, window_size, frequency, gap_policy=gap_policy)
+
+            coefficients, starts = fouriertransformation.to_memmap(
+                data, file_path, window_size, frequency, chunk_size=4,
+                gap_policy=gap_policy)
+
+            # from_df( ) returns the windows of a shred column by column
+            self.assertEqual(len(freq_windows), 2 * len(coefficients))
+            self.assertEqual(
+                sorted(w.start for w in freq_windows),
+                sorted(list(pd.to_datetime(starts)) * 2))
+            np.testing.assert_allclose(
+                np.sort_complex(np.concatenate(
+                    [w.data for w in freq_windows])),
+                np.sort_complex(coefficients.ravel()))
+
+            stored = np.load(file_path, mmap_mode='r')
+            np.testing.assert_array_equal(coefficients, stored)
+            del coefficients, stored
+
+        coefficients, starts = fouriertransformation.to_memmap(
+            data, file_path, window_size, frequency, hop_size=4)
+        # windows start every 2 seconds in 0 - 1 and 11 - 15
+        self.assertEqual(1 + 3, len(coefficients))
+        del coefficients
+
+        # hops bigger than the window size span several chunks
+        coefficients, starts = fouriertransformation.to_memmap(
+            data, file_path, 2, frequency, hop_size=5, chunk_size=2)
+        # windows start every 2.5 seconds in 0 - 4 and 11 - 19
+        self.assertEqual(2 + 4, len(coefficients))
+        self.assertEqual(
+            [0, 2.5, 11, 13.5, 16, 18.5],
+            list((starts - np.datetime64(start)) / np.timedelta64(1, 's')))
+        del coefficients
+
+    def test_multiple_workers(self):
+        frequency = 2  # Hz
+        window_size = 9  # entries
+        start = datetime(2018, 12, 12, 10, 0, 0)
+        secs = np.concatenate([
+            np.arange(0, 5.25, 0.25), np.arange(11, 20, 0.25)])
+        data = pd.DataFrame.from_dict({
+            'x': np.sin(secs),
+            'y': np.cos(secs),
+            'timestamp': [start + timedelta(seconds=s) for s in secs]})
+
+        expected = fouriertransformation.from_df(data, window_size, frequency)
+        freq_windows = fouriertransformation.from_df(
+            data, window_size, frequency, num_workers=4)
+
+        self.assertEqual(len(expected), len(freq_windows))
+        for expected_window, window in zip(expected, freq_windows):
+            self.assertEqual(expected_window.start, window.start)
+            np.testing.assert_array_equal(expected_window.data, window.data)
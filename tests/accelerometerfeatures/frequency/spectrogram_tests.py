@@ -0,0 +1,62 @@
+from datetime import datetime
+from datetime import timedelta
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+
+from accelerometerfeatures.frequency import spectrogram
+from accelerometerfeatures.utils.pytorch.dataset import AccelerometerDataset
+
+
+class TestSpectrogram(TestCase):
+    @staticmethod
+    def _gen_sine(frequency_in_hz, sample_frequency, num_samples):
+        secs = np.arange(num_samples) / float(sample_frequency)
+        return np.sin(2 * np.pi * frequency_in_hz * secs)
+
+    def test_stft_shape_and_peak(self):
+        data = np.array([
+            self._gen_sine(2, 16, 256),
+            self._gen_sine(5, 16, 256)])
+
+        result = spectrogram.stft(data, 16, 32, 16, scale='magnitude')
+
+        # 32 // 2 + 1 bins, (256 - 32) // 16 + 1 frames
+        self.assertEqual((2, 17, 15), result.shape)
+        self.assertEqual(np.float32, result.dtype)
+        # with 0.5 Hz resolution the peaks are at bins 4 and 10
+        self.assertTrue((result[0].argmax(axis=0) == 4).all())
+        self.assertTrue((result[1].argmax(axis=0) == 10).all())
+
+    def test_frequency_binning(self):
+        for binning in spectrogram.BINNINGS:
+            bins = spectrogram.get_frequency_bins(64, 16, 8, binning)
+
+            self.assertEqual((8, 33), bins.shape)
+            np.testing.assert_allclose(bins.sum(axis=1), 1.)
+
+        data = self._gen_sine(6, 16, 128)[np.newaxis, :]
+        result = spectrogram.stft(data, 16, 64, n_bins=8, binning='mel')
+
+        self.assertEqual((1, 8, 3), result.shape)
+        # 6 Hz is within the upper mel bins
+        self.assertTrue((result[0].argmax(axis=0) >= 5).all())
+
+    def test_from_df(self):
+        start = datetime(2018, 12, 12, 10, 0, 0)
+        secs = np.arange(0, 30, 0.05)
+        data = pd.DataFrame.from_dict({
+            'timestamp': [start + timedelta(seconds=s) for s in secs],
+            'x': np.sin(2 * np.pi * secs),
+            'y': np.cos(2 * np.pi * 3 * secs)})
+
+        windows = spectrogram.from_df(data, 64, 16, n_bins=12)
+
+        self.assertEqual(1, len(windows))
+        self.assertEqual((2, 12), windows[0].data.shape[:2])
+
+        dataset = AccelerometerDataset(
+            [(w.data, 'walking') for w in windows]).to_tensor_dataset()
+        self.assertEqual((1, 2, 12, windows[0].data.shape[2]),
+                         tuple(dataset.data.shape))
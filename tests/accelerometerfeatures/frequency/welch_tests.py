@@ -0,0 +1,66 @@
+from datetime import datetime
+from datetime import timedelta
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+from scipy import signal
+
+from accelerometerfeatures.frequency import welch
+from accelerometerfeatures.utils.window import sliding_windows
+
+
+class TestWelch(TestCase):
+    def test_psd_equals_scipy(self):
+        random_state = np.random.RandomState(42)
+        data = random_state.normal(size=(512, 3))
+        windows = sliding_windows(data, size=128, hop=64)[0]
+
+        frequencies, psd = welch.welch_psd(windows, 16, 32, 0.5)
+
+        for window_idx in [0, 3, len(windows) - 1]:
+            expected_frequencies, expected_psd = signal.welch(
+                windows[window_idx], 16, nperseg=32, noverlap=16, axis=0)
+            np.testing.assert_allclose(expected_frequencies, frequencies)
+            np.testing.assert_allclose(expected_psd, psd[window_idx])
+
+    def test_band_powers(self):
+        secs = np.arange(0, 40, 1 / 16.)
+        # 0.25 Hz with an amplitude of 2 and 5 Hz with an amplitude of 1
+        data = np.array([
+            2 * np.sin(2 * np.pi * 0.25 * secs),
+            np.sin(2 * np.pi * 5 * secs)]).T
+        windows = sliding_windows(data, size=512, hop=128)[0]
+
+        frequencies, psd = welch.welch_psd(windows, 16, 256)
+        powers = welch.band_powers(frequencies, psd)
+
+        self.assertEqual((len(windows), 3, 2), powers.shape)
+        # the power of a sine wave is half its squared amplitude
+        self.assertAlmostEqual(2., powers[0, 0, 0], delta=0.1)
+        self.assertAlmostEqual(.5, powers[0, 2, 1], delta=0.05)
+        self.assertLess(powers[0, 1:, 0].sum(), 0.1)
+        self.assertLess(powers[0, :2, 1].sum(), 0.05)
+
+    def test_from_df(self):
+        start = datetime(2018, 12, 12, 10, 0, 0)
+        secs = np.arange(0, 60, 0.05)
+        data = pd.DataFrame.from_dict({
+            'timestamp': [start + timedelta(seconds=s) for s in secs],
+            'x': np.sin(2 * np.pi * secs),
+            'y': np.cos(2 * np.pi * 4 * secs)})
+
+        windows = welch.from_df(data, 256, 16)
+
+        # (960 - 256) // 128 + 1 windows of 16 seconds every 8 seconds
+        self.assertEqual(6, len(windows))
+        self.assertEqual(
+            ['x_0-0.5Hz', 'x_0.5-3Hz', 'x_3-8Hz',
+             'y_0-0.5Hz', 'y_0.5-3Hz', 'y_3-8Hz'],
+            welch.get_feature_names(['x', 'y']))
+        self.assertEqual((6,), windows[0].data.shape)
+        self.assertEqual(np.float32, windows[0].data.dtype)
+        self.assertEqual(1, windows[0].data[:3].argmax())
+        self.assertEqual(2, windows[0].data[3:].argmax())
+        self.assertEqual(
+            timedelta(seconds=16), windows[0].end - windows[0].start)
@@ -0,0 +1,64 @@
+import json
+import os
+import subprocess
+import sys
+from unittest import TestCase
+
+import accelerometerfeatures
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(accelerometerfeatures.__file__))
+
+
+def _get_loaded_modules(module_name, candidates):
+    """
+    Imports the given module in a fresh interpreter and returns which of the
+    candidate modules got loaded
+    """
+    output = subprocess.check_output(
+        [sys.executable, '-c',
+         'import json, sys; import %s; '
+         'print(json.dumps([m for m in %r if m in sys.modules]))' % (
+             module_name, candidates)],
+        cwd=PROJECT_DIR)
+
+    return json.loads(output.decode('utf-8'))
+
+
+class TestImports(TestCase):
+    def test_package_import_is_lazy(self):
+        self.assertEqual(
+            [],
+            _get_loaded_modules(
+                'accelerometerfeatures, accelerometerfeatures.utils.pytorch',
+                ['pandas', 'scipy', 'torch', 'matplotlib']))
+
+    def test_feature_modules_do_not_load_heavy_dependencies(self):
+        for module_name in [
+                'accelerometerfeatures.frequency.fouriertransformation',
+                'accelerometerfeatures.utils.interpolation',
+                'accelerometerfeatures.time.magnitude']:
+
+            self.assertEqual(
+                [],
+                _get_loaded_modules(
+                    module_name,
+                    ['scipy', 'torch', 'matplotlib', 'numba']))
+
+    def test_dataset_module_does_not_load_optional_modules(self):
+        # multiprocessing.shared_memory requires Python 3.8+
+        self.assertEqual(
+            [],
+            _get_loaded_modules(
+                'accelerometerfeatures.utils.pytorch.dataset',
+                ['matplotlib', 'multiprocessing.shared_memory']))
+
+    def test_lazy_attributes(self):
+        from accelerometerfeatures.frequency import fouriertransformation
+
+        self.assertIs(
+            fouriertransformation,
+            accelerometerfeatures.frequency.fouriertransformation)
+        self.assertIn('magnitude', dir(accelerometerfeatures.time))
+
+        with self.assertRaises(AttributeError):
+            accelerometerfeatures.does_not_exist
@@ -1,6 +1,9 @@
+import os
 from datetime import datetime
+from tempfile import TemporaryDirectory
 from unittest.case import TestCase
 
+import numpy as np
 import pandas as pd
 
 from accelerometerfeatures.time import magnitude
@@ -29,3 +32,40 @@ class TestMagnitude(TestCase):
         )
 
         self.assertTrue(magnitude.from_df(acc_data).equals(magnitude_data))
+
+    def test_from_arrays(self):
+        x = np.array([-1.234, 3.456, -5.678], dtype=np.float32)
+        y = np.array([5.678, -7.890, 9.012], dtype=np.float32)
+        z = np.array([-9.012, 1.234, 3.456], dtype=np.float32)
+
+        result = magnitude.from_arrays(x, y, z)
+        self.assertEqual(np.float32, result.dtype)
+        np.testing.assert_allclose(
+            [10.722806722122712, 8.701654555313029, 11.198203605936088],
+            result, rtol=1e-6)
+
+        out = np.zeros((2, 3))
+        magnitude.from_arrays(x, y, z, out=out[1])
+        np.testing.assert_allclose(result, out[1], rtol=1e-6)
+        self.assertTrue((out[0] == 0).all())
+
+    def test_iter_file(self):
+        tmp_dir = TemporaryDirectory()
+        file_path = os.path.join(tmp_dir.name, 'acc.csv')
+        acc_data = pd.DataFrame.from_dict({
+            'x': np.arange(10.),
+            'y': np.ones(10),
+            'z': np.zeros(10),
+            'timestamp': pd.date_range('2000-01-02 12:34', periods=10,
+                                       freq='s')})
+        acc_data.to_csv(file_path, index=False)
+
+        chunks = list(magnitude.iter_file(file_path, chunk_size=4))
+
+        self.assertEqual([4, 4, 2], [len(c) for c in chunks])
+        result = pd.concat(chunks)
+        np.testing.assert_allclose(
+            np.sqrt(np.arange(10.) ** 2 + 1), result.magnitude.values,
+            rtol=1e-6)
+        self.assertTrue(
+            (result.timestamp.values == acc_data.timestamp.values).all())
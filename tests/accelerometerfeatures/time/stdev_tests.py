@@ -1,6 +1,7 @@
 from datetime import datetime
 from unittest.case import TestCase
 
+import numpy as np
 import pandas as pd
 
 from accelerometerfeatures.time import stdev
@@ -49,3 +50,45 @@ class TestStDev(TestCase):
 
         self.assertAlmostEqual(
             stdev.from_df(magnitude_data)[0], stdev_data[0], places=8)
+
+    @staticmethod
+    def _gen_user_data():
+        random_state = np.random.RandomState(7)
+        timestamps = pd.date_range('2000-01-02 23:00', periods=240, freq='min')
+
+        return pd.DataFrame.from_dict({
+            'user': np.tile(['u1', 'u2'], 120),
+            'timestamp': timestamps,
+            'x': random_state.normal(size=240),
+            'y': random_state.normal(size=240),
+            'class': 'walking'})
+
+    def test_from_dfs(self):
+        data = self._gen_user_data()
+        dataframes = [data[:100], data[100:110], data[110:]]
+
+        result = stdev.from_dfs(dataframes, ['a', 'b', 'c'])
+
+        self.assertEqual(['x', 'y'], list(result.columns))
+        self.assertEqual(['a', 'b', 'c'], list(result.index))
+        for key, dataframe in zip(['a', 'b', 'c'], dataframes):
+            np.testing.assert_allclose(
+                stdev.from_df(dataframe[['x', 'y', 'timestamp']]),
+                result.loc[key].values)
+
+    def test_from_grouped_df(self):
+        data = self._gen_user_data()
+
+        result = stdev.from_grouped_df(data)
+
+        # each user's data spans two days
+        self.assertEqual(
+            ['user', 'date', 'x', 'y'], list(result.columns))
+        self.assertEqual(4, len(result))
+        for _, row in result.iterrows():
+            group_data = data[
+                (data.user == row.user) &
+                (data.timestamp.dt.floor('D') == row.date)]
+            np.testing.assert_allclose(
+                stdev.from_df(group_data[['x', 'y', 'timestamp']]),
+                row[['x', 'y']].values.astype(float))
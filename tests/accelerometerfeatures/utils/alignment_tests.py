@@ -0,0 +1,68 @@
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+
+from accelerometerfeatures.utils import statistics as stats
+from accelerometerfeatures.utils.alignment import StreamAligner
+
+START = np.datetime64('2018-12-12T10:00:00', 'ns')
+
+
+def _gen_stream(secs):
+    """
+    Returns a stream whose x values are the seconds since `START` and whose
+    y values are the negated x values
+    """
+    return pd.DataFrame.from_dict({
+        'timestamp': START + np.round(secs * 1e9).astype('timedelta64[ns]'),
+        'x': secs,
+        'y': -secs,
+    })
+
+
+class TestStreamAligner(TestCase):
+    def test_streams_are_aligned(self):
+        acc = _gen_stream(np.arange(0, 20, 0.02))  # 50 Hz
+        # 40 Hz, starting later
+        gyro = _gen_stream(np.arange(1.01, 20, 0.025))
+
+        aligned = StreamAligner({'': acc, 'gyro': gyro}, 16) \
+            .get_aligned_data()
+
+        self.assertEqual(1, len(aligned))
+        data = aligned[0]
+        self.assertEqual(
+            ['timestamp', 'x', 'y', 'gyro_x', 'gyro_y'], list(data.columns))
+
+        secs = (data.timestamp.values - START) / np.timedelta64(1, 's')
+        # the shared grid starts with the later stream
+        self.assertAlmostEqual(1.01, secs[0])
+        np.testing.assert_allclose(np.diff(secs), 1 / 16.)
+        np.testing.assert_allclose(data.x.values, secs, atol=1e-6)
+        np.testing.assert_allclose(data.gyro_x.values, secs, atol=1e-6)
+        np.testing.assert_allclose(data.gyro_y.values, -secs, atol=1e-6)
+
+    def test_gaps_of_any_stream_are_cut(self):
+        acc = _gen_stream(np.concatenate([
+            np.arange(0, 5, 0.02), np.arange(8, 20, 0.02)]))
+        gyro = _gen_stream(np.concatenate([
+            np.arange(0, 12, 0.025), np.arange(15, 20, 0.025)]))
+        statistics = stats.ProcessingStatistics()
+
+        aligned = StreamAligner(
+            {'acc': acc, 'gyro': gyro}, 16, statistics=statistics) \
+            .get_aligned_data()
+
+        # shared segments: [0, 5), [8, 12) and [15, 20)
+        self.assertEqual(3, len(aligned))
+        for data, (start, end) in zip(aligned, [(0, 5), (8, 12), (15, 20)]):
+            secs = (data.timestamp.values - START) / np.timedelta64(1, 's')
+            self.assertTrue(start <= secs[0] < start + 1 / 16.)
+            self.assertTrue(end - 1 / 8. < secs[-1] < end)
+            np.testing.assert_allclose(data.acc_x.values, secs, atol=1e-6)
+            np.testing.assert_allclose(data.gyro_x.values, secs, atol=1e-6)
+
+        report = statistics.get_report()
+        self.assertEqual(2, report.counters[stats.GAPS_CUT])
+        self.assertEqual(3, report.counters[stats.SHREDS_FOUND])
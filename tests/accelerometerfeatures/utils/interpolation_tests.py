@@ -3,6 +3,7 @@ from datetime import timedelta
 from random import random, Random
 from unittest import TestCase
 
+import numpy as np
 import pandas as pd
 
 from accelerometerfeatures.utils.interpolation import Interpolator
@@ -178,3 +179,154 @@ class TestInterpolation(TestCase):
         self.assertTrue(expected_num_entries.is_integer())
 
         self.assertEqual(expected_num_entries, len(interpolated[0]))
+
+    def test_polyphase_resampling(self):
+        """
+        Nearly uniformly sampled shreds are resampled with polyphase filtering
+        onto the same target timestamps the linear interpolation uses
+        """
+        frequency_in_hz = 100
+        target_frequency_in_hz = 16
+        num_data_samples = 2000
+        start = datetime(2018, 12, 12, 10, 0, 0)
+        timestamps = [
+            start + timedelta(seconds=i / frequency_in_hz)
+            for i in range(num_data_samples)]
+        secs = np.arange(num_data_samples) / frequency_in_hz
+
+        df = pd.DataFrame.from_dict({
+            'timestamp': timestamps,
+            'x': np.sin(2 * np.pi * secs) +
+            0.5 * np.sin(2 * np.pi * 30 * secs),
+        })
+
+        linear = Interpolator(
+            df, target_frequency_in_hz).get_interpolated_data()
+        polyphase = Interpolator(
+            df, target_frequency_in_hz,
+            resampling_method='polyphase').get_interpolated_data()
+
+        self.assertEqual(1, len(polyphase))
+        self.assertTrue(linear[0].timestamp.equals(polyphase[0].timestamp))
+
+        target_secs = \
+            np.arange(len(polyphase[0])) / float(target_frequency_in_hz)
+        expected = np.sin(2 * np.pi * target_secs)
+        inner = slice(16, -16)
+
+        self.assertLess(
+            np.abs(polyphase[0].x.values - expected)[inner].max(), 0.05)
+        self.assertGreater(
+            np.abs(linear[0].x.values - expected)[inner].max(), 0.25)
+
+    def test_polyphase_resampling_with_dropped_sample(self):
+        """
+        A dropped sample only causes linear interpolation around it, the
+        segments before and after it are still resampled with polyphase
+        filtering
+        """
+        frequency_in_hz = 100
+        target_frequency_in_hz = 16
+        start = datetime(2018, 12, 12, 10, 0, 0)
+        secs = np.delete(np.arange(2000) / float(frequency_in_hz), 1000)
+
+        df = pd.DataFrame.from_dict({
+            'timestamp': [start + timedelta(seconds=s) for s in secs],
+            'x': np.sin(2 * np.pi * secs) +
+            0.5 * np.sin(2 * np.pi * 30 * secs),
+        })
+
+        polyphase = Interpolator(
+            df, target_frequency_in_hz,
+            resampling_method='polyphase').get_interpolated_data()
+
+        self.assertEqual(1, len(polyphase))
+
+        target_secs = \
+            np.arange(len(polyphase[0])) / float(target_frequency_in_hz)
+        expected = np.sin(2 * np.pi * target_secs)
+        error = np.abs(polyphase[0].x.values - expected)
+
+        # ignore the boundaries of the segments
+        self.assertLess(error[16:144].max(), 0.05)
+        self.assertLess(error[176:-16].max(), 0.05)
+
+    @staticmethod
+    def _gen_data_with_gap(gap_size_in_secs):
+        """
+        Returns 4 Hz data with values equal to the seconds since the start and
+        a gap of the given size after second 10
+        """
+        start = datetime(2018, 12, 12, 10, 0, 0)
+        secs = np.concatenate([
+            np.arange(0, 10.25, 0.25),
+            np.arange(10 + gap_size_in_secs, 20 + gap_size_in_secs, 0.25)])
+
+        return pd.DataFrame.from_dict({
+            'timestamp': [start + timedelta(seconds=s) for s in secs],
+            'x': secs,
+        })
+
+    def test_gap_policy_nan(self):
+        df = self._gen_data_with_gap(5)
+
+        interpolated = Interpolator(df, 4, gap_policy='nan') \
+            .get_interpolated_data()
+
+        self.assertEqual(1, len(interpolated))
+        data = interpolated[0]
+        # 4 Hz, 10 seconds before the gap, 5 seconds gap, 10 seconds after
+        self.assertEqual(99, len(data))
+        in_gap = ~data.valid.values
+        self.assertEqual(19, in_gap.sum())
+        self.assertTrue(np.isnan(data.x.values[in_gap]).all())
+        self.assertFalse(np.isnan(data.x.values[~in_gap]).any())
+
+    def test_gap_policy_hold(self):
+        df = self._gen_data_with_gap(5)
+
+        data = Interpolator(df, 4, gap_policy='hold') \
+            .get_interpolated_data()[0]
+
+        in_gap = ~data.valid.values
+        self.assertEqual(19, in_gap.sum())
+        np.testing.assert_allclose(data.x.values[in_gap], 10.)
+        np.testing.assert_allclose(
+            data.x.values[~in_gap],
+            np.arange(0, 24.75, 0.25)[~in_gap], atol=1e-6)
+
+    def test_gap_policy_bridge(self):
+        df = self._gen_data_with_gap(5)
+
+        # the gap of 20 samples is bridged...
+        data_shreds = Interpolator(
+            df, 4, gap_policy='bridge',
+            max_bridge_gap_size_in_no_samples=30).get_interpolated_data()
+
+        self.assertEqual(1, len(data_shreds))
+        self.assertEqual(19, (~data_shreds[0].valid.values).sum())
+        np.testing.assert_allclose(
+            data_shreds[0].x.values, np.arange(0, 24.75, 0.25), atol=1e-6)
+
+        # ...but cut if it exceeds the maximum bridge size
+        data_shreds = Interpolator(
+            df, 4, gap_policy='bridge',
+            max_bridge_gap_size_in_no_samples=15).get_interpolated_data()
+
+        self.assertEqual(2, len(data_shreds))
+        self.assertTrue(data_shreds[0].valid.all())
+        self.assertTrue(data_shreds[1].valid.all())
+
+    def test_multiple_workers(self):
+        df = self._gen_data(1000, 16, num_gaps=3, gap_size=50)
+
+        for gap_policy in ['cut', 'nan']:
+            expected = Interpolator(df, 16, gap_policy=gap_policy) \
+                .get_interpolated_data()
+            interpolated = Interpolator(
+                df, 16, gap_policy=gap_policy, num_workers=3) \
+                .get_interpolated_data()
+
+            self.assertEqual(len(expected), len(interpolated))
+            for expected_shred, shred in zip(expected, interpolated):
+                pd.testing.assert_frame_equal(expected_shred, shred)
@@ -0,0 +1,139 @@
+from unittest import TestCase
+from unittest import skipUnless
+
+import numpy as np
+
+from accelerometerfeatures.utils import kernels
+from accelerometerfeatures.utils import resampling
+
+
+class TestKernels(TestCase):
+    """
+    The loops are tested uncompiled against the numpy implementations, so
+    the tests don't depend on numba being installed
+    """
+    def setUp(self):
+        rng = np.random.RandomState(3)
+        self.timestamps = np.cumsum(rng.uniform(0.05, 0.15, 200))
+        self.timestamps[100:] += 2.  # a gap
+        self.values = rng.normal(size=(200, 3)) + [0., 0., 9.81]
+        self.target_timestamps = np.arange(
+            self.timestamps[0], self.timestamps[-1], 1 / 16.)
+
+    def test_gap_starts_loop(self):
+        self.assertEqual(
+            [99], kernels._gap_starts_loop(self.timestamps, 1.).tolist())
+        self.assertEqual(
+            [], kernels._gap_starts_loop(self.timestamps, np.inf).tolist())
+        self.assertEqual(
+            [], kernels._gap_starts_loop(self.timestamps[:1], 1.).tolist())
+
+    def _interpolate_shred_with_numpy(self, gap_fill):
+        use_numba = kernels.USE_NUMBA
+        kernels.USE_NUMBA = False
+
+        try:
+            return kernels.interpolate_shred(
+                self.timestamps, self.values, self.target_timestamps, 1.,
+                gap_fill)
+        finally:
+            kernels.USE_NUMBA = use_numba
+
+    def test_interpolate_shred_loop(self):
+        expected = np.column_stack([
+            np.interp(self.target_timestamps, self.timestamps, column)
+            for column in self.values.T])
+
+        for gap_fill, gap_fill_code in kernels._GAP_FILLS.items():
+            interpolated, in_gap, num_gaps = \
+                kernels._interpolate_shred_loop(
+                    self.timestamps, self.values, self.target_timestamps, 1.,
+                    gap_fill_code)
+            expected_interpolated, expected_in_gap, expected_num_gaps = \
+                self._interpolate_shred_with_numpy(gap_fill)
+
+            np.testing.assert_allclose(expected_interpolated, interpolated)
+            np.testing.assert_array_equal(expected_in_gap, in_gap)
+            self.assertEqual(1, num_gaps)
+            self.assertEqual(expected_num_gaps, num_gaps)
+            np.testing.assert_array_equal(
+                (self.target_timestamps > self.timestamps[99]) &
+                (self.target_timestamps < self.timestamps[100]), in_gap)
+
+            if gap_fill == 'linear':
+                np.testing.assert_allclose(expected, interpolated)
+            elif gap_fill == 'nan':
+                self.assertTrue(np.isnan(interpolated[in_gap]).all())
+            else:
+                np.testing.assert_array_equal(
+                    self.values[99], interpolated[in_gap][0])
+
+            np.testing.assert_allclose(
+                expected[~in_gap], interpolated[~in_gap])
+
+    def test_interpolate_shred_counts_gaps_after_the_targets(self):
+        interpolated, in_gap, num_gaps = kernels._interpolate_shred_loop(
+            self.timestamps, self.values, self.target_timestamps[:10], 1.,
+            0)
+
+        self.assertEqual((10, 3), interpolated.shape)
+        self.assertFalse(in_gap.any())
+        self.assertEqual(1, num_gaps)
+
+    def test_window_mean_std_loop(self):
+        windows = self.values[np.arange(0, 185, 4)[:, None] + np.arange(16)]
+
+        means, stds = kernels._window_mean_std_loop(self.values, 16, 4, 1)
+
+        np.testing.assert_allclose(windows.mean(axis=1), means)
+        np.testing.assert_allclose(windows.std(axis=1, ddof=1), stds)
+
+    def test_numpy_fallback(self):
+        use_numba = kernels.USE_NUMBA
+        kernels.USE_NUMBA = False
+
+        try:
+            self.assertEqual(
+                [99], kernels.find_gap_starts(self.timestamps, 1.).tolist())
+
+            means, stds = kernels.window_mean_std(self.values, 16, 4)
+            self.assertEqual((47, 3), means.shape)
+            np.testing.assert_allclose(
+                self.values[:16].std(axis=0), stds[0])
+        finally:
+            kernels.USE_NUMBA = use_numba
+
+    @skipUnless(kernels.HAVE_NUMBA, 'numba is not installed')
+    def test_compiled_kernels_equal_numpy(self):
+        use_numba = kernels.USE_NUMBA
+        kernels.USE_NUMBA = True
+
+        try:
+            gap_starts = kernels.find_gap_starts(self.timestamps, 1.)
+            means, stds = kernels.window_mean_std(self.values, 16, 4)
+            interpolated_shreds = [
+                kernels.interpolate_shred(
+                    self.timestamps, self.values, self.target_timestamps,
+                    1., gap_fill)
+                for gap_fill in kernels._GAP_FILLS]
+
+            kernels.USE_NUMBA = False
+
+            np.testing.assert_array_equal(
+                kernels.find_gap_starts(self.timestamps, 1.), gap_starts)
+
+            expected_means, expected_stds = \
+                kernels.window_mean_std(self.values, 16, 4)
+            np.testing.assert_allclose(expected_means, means)
+            np.testing.assert_allclose(expected_stds, stds)
+        finally:
+            kernels.USE_NUMBA = use_numba
+
+        for gap_fill, (interpolated, in_gap, num_gaps) in zip(
+                kernels._GAP_FILLS, interpolated_shreds):
+            expected_interpolated, expected_in_gap, expected_num_gaps = \
+                self._interpolate_shred_with_numpy(gap_fill)
+
+            np.testing.assert_allclose(expected_interpolated, interpolated)
+            np.testing.assert_array_equal(expected_in_gap, in_gap)
+            self.assertEqual(expected_num_gaps, num_gaps)
@@ -0,0 +1,60 @@
+from unittest import TestCase
+
+import numpy as np
+
+from accelerometerfeatures.utils.labels import LabelIndex
+
+
+class TestLabelIndex(TestCase):
+    def setUp(self):
+        # one sample per second: 10 x walking, 5 x sitting, 5 x walking
+        self.label_index = LabelIndex(
+            np.arange(20.),
+            ['walking'] * 10 + ['sitting'] * 5 + ['walking'] * 5)
+        self.starts = np.array([0., 5., 8., 10., 12., 25.])
+        self.ends = self.starts + 5
+
+    def test_runs(self):
+        self.assertEqual(3, self.label_index.get_num_runs())
+        self.assertEqual(['sitting', 'walking'],
+                         list(self.label_index.classes))
+
+    def test_label_counts(self):
+        counts = self.label_index.get_label_counts(self.starts, self.ends)
+
+        self.assertEqual(
+            [[0, 5], [0, 5], [3, 2], [5, 0], [3, 2], [0, 0]],
+            counts.tolist())
+
+    def test_strict_policy(self):
+        labels, is_labeled = self.label_index.get_window_labels(
+            self.starts, self.ends)
+
+        self.assertEqual(
+            [True, True, False, True, False, False], is_labeled.tolist())
+        self.assertEqual(
+            ['walking', 'walking', 'sitting'],
+            list(labels[is_labeled]))
+
+    def test_majority_policy(self):
+        labels, is_labeled = self.label_index.get_window_labels(
+            self.starts, self.ends, 'majority', 0.6)
+
+        self.assertEqual(
+            [True, True, True, True, True, False], is_labeled.tolist())
+        self.assertEqual(
+            ['walking', 'walking', 'sitting', 'sitting', 'sitting'],
+            list(labels[is_labeled]))
+
+        _, is_labeled = self.label_index.get_window_labels(
+            self.starts, self.ends, 'majority', 0.7)
+        self.assertEqual(
+            [True, True, False, True, False, False], is_labeled.tolist())
+
+    def test_soft_policy(self):
+        fractions, is_labeled = self.label_index.get_window_labels(
+            self.starts, self.ends, 'soft')
+
+        np.testing.assert_allclose(
+            [[0, 1], [0, 1], [.6, .4], [1, 0], [.6, .4], [0, 0]], fractions)
+        self.assertFalse(is_labeled[-1])
@@ -0,0 +1,50 @@
+import threading
+import time
+from unittest import TestCase
+
+from accelerometerfeatures.utils import statistics as stats
+from accelerometerfeatures.utils.parallel import get_num_workers
+from accelerometerfeatures.utils.parallel import parallel_map
+
+
+class TestParallelMap(TestCase):
+    def test_results_are_in_item_order(self):
+        def square(item):
+            # later items finish first
+            time.sleep((10 - item) * 0.001)
+            return item * item
+
+        self.assertEqual(
+            [i * i for i in range(10)], parallel_map(square, range(10), 4))
+
+    def test_single_worker_uses_calling_thread(self):
+        thread_ids = parallel_map(
+            lambda _: threading.get_ident(), range(3), 1)
+
+        self.assertEqual([threading.get_ident()] * 3, thread_ids)
+
+    def test_exceptions_are_reraised(self):
+        def fail(item):
+            if item == 2:
+                raise ValueError(item)
+            return item
+
+        with self.assertRaises(ValueError):
+            parallel_map(fail, range(5), 2)
+
+    def test_num_workers(self):
+        self.assertEqual(3, get_num_workers(3))
+        self.assertGreaterEqual(get_num_workers(None), 1)
+        self.assertEqual([], parallel_map(abs, [], None))
+
+    def test_statistics_are_thread_safe(self):
+        statistics = stats.ProcessingStatistics()
+
+        def count(_):
+            for _ in range(1000):
+                statistics.count(stats.WINDOWS_CREATED)
+
+        parallel_map(count, range(8), 8)
+
+        self.assertEqual(
+            8000, statistics.get_report().counters[stats.WINDOWS_CREATED])
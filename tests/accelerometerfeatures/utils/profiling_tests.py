@@ -0,0 +1,82 @@
+import json
+import os
+from datetime import datetime
+from datetime import timedelta
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+import pandas as pd
+
+from accelerometerfeatures.time import magnitude
+from accelerometerfeatures.utils import profiling
+from accelerometerfeatures.utils.interpolation import Interpolator
+
+
+class TestProfiling(TestCase):
+    @staticmethod
+    def _gen_data(num_entries):
+        timestamp = datetime(2018, 12, 12, 10, 0, 0)
+        rows = []
+
+        for i in range(num_entries):
+            timestamp += timedelta(seconds=0.1)
+            rows.append([i % 3, i % 5, i % 7, timestamp])
+
+        return pd.DataFrame(rows, columns=['x', 'y', 'z', 'timestamp'])
+
+    def test_no_stages_are_recorded_without_active_profiler(self):
+        self.assertIsNone(profiling.get_active_profiler())
+
+        with profiling.stage('dummy') as stage:
+            stage.items = 3
+
+        profiler = profiling.Profiler()
+        magnitude.from_df(self._gen_data(10))
+        self.assertEqual([], profiler.records)
+
+    def test_stages_are_recorded(self):
+        data = self._gen_data(100)
+
+        with profiling.Profiler(trace_allocations=True) as profiler:
+            self.assertIs(profiler, profiling.get_active_profiler())
+            Interpolator(data, 5).get_interpolated_data()
+            magnitude.from_df(data)
+
+        self.assertIsNone(profiling.get_active_profiler())
+
+        summary = profiler.summary()
+        self.assertEqual(
+            ['interpolation.timestamps',
+             'interpolation.target_timestamps',
+             'interpolation.interpolate',
+             'magnitude.from_df'],
+            list(summary))
+        # all columns of the shred are interpolated at once
+        self.assertEqual(1, summary['interpolation.interpolate']['calls'])
+        self.assertEqual(100, summary['magnitude.from_df']['items'])
+
+        for totals in summary.values():
+            self.assertGreaterEqual(totals['wall_time'], 0)
+            self.assertIsNotNone(totals['allocated_bytes'])
+
+    def test_export(self):
+        with profiling.Profiler() as profiler:
+            magnitude.from_df(self._gen_data(10))
+
+        tmp_dir = TemporaryDirectory()
+        json_file_path = os.path.join(tmp_dir.name, 'profile.json')
+        trace_file_path = os.path.join(tmp_dir.name, 'trace.json')
+
+        profiler.to_json(json_file_path)
+        profiler.to_chrome_trace(trace_file_path)
+
+        with open(json_file_path) as json_file:
+            profile = json.load(json_file)
+        self.assertEqual(['magnitude.from_df'], list(profile['summary']))
+        self.assertEqual(1, len(profile['stages']))
+
+        with open(trace_file_path) as trace_file:
+            trace = json.load(trace_file)
+        self.assertEqual(1, len(trace['traceEvents']))
+        self.assertEqual('X', trace['traceEvents'][0]['ph'])
+        self.assertEqual(10, trace['traceEvents'][0]['args']['items'])
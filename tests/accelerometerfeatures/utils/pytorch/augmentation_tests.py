@@ -0,0 +1,88 @@
+from unittest import TestCase
+
+import numpy as np
+import torch
+
+from accelerometerfeatures.utils.pytorch.augmentation import \
+    BatchAugmentation
+from accelerometerfeatures.utils.pytorch.augmentation import \
+    random_rotations
+
+
+class TestRandomRotations(TestCase):
+    def test_matrices_are_rotations(self):
+        rotations = random_rotations(
+            50, generator=torch.Generator().manual_seed(0)).double()
+
+        identities = torch.bmm(rotations, rotations.transpose(1, 2))
+        np.testing.assert_allclose(
+            np.broadcast_to(np.eye(3), (50, 3, 3)), identities.numpy(),
+            atol=1e-6)
+        np.testing.assert_allclose(
+            np.ones(50), np.linalg.det(rotations.numpy()), atol=1e-6)
+
+    def test_max_angle(self):
+        rotations = random_rotations(
+            50, 0.1, torch.Generator().manual_seed(0)).double()
+
+        # the trace of a rotation matrix is 1 + 2 cos(angle)
+        traces = rotations.diagonal(dim1=1, dim2=2).sum(dim=1).numpy()
+        self.assertTrue((traces >= 1 + 2 * np.cos(0.1) - 1e-6).all())
+
+
+class TestBatchAugmentation(TestCase):
+    @staticmethod
+    def _gen_batch():
+        return torch.randn(
+            8, 4, 32, generator=torch.Generator().manual_seed(1))
+
+    def test_epochs_are_reproducible(self):
+        batch = self._gen_batch()
+        batches = [(batch, torch.zeros(8, dtype=torch.int64))] * 3
+
+        augmentation = BatchAugmentation(seed=7)
+        epoch_0 = [d for d, _ in augmentation.iter_epoch(batches, 0)]
+        epoch_1 = [d for d, _ in augmentation.iter_epoch(batches, 1)]
+        epoch_0_again = [
+            d for d, _ in BatchAugmentation(seed=7).iter_epoch(batches, 0)]
+
+        for data, data_again in zip(epoch_0, epoch_0_again):
+            self.assertTrue(torch.equal(data, data_again))
+
+        self.assertFalse(torch.equal(epoch_0[0], epoch_1[0]))
+        # the batches of an epoch get different transformations
+        self.assertFalse(torch.equal(epoch_0[0], epoch_0[1]))
+
+    def test_rotation_keeps_magnitudes(self):
+        batch = self._gen_batch()
+        augmentation = BatchAugmentation(scale_range=None, noise_std=None)
+
+        augmented = augmentation(batch, torch.Generator().manual_seed(0))
+
+        np.testing.assert_allclose(
+            batch[:, :3].norm(dim=1).numpy(),
+            augmented[:, :3].norm(dim=1).numpy(), rtol=1e-5)
+        # only the x, y and z channels are rotated
+        self.assertTrue(torch.equal(batch[:, 3], augmented[:, 3]))
+        self.assertFalse(torch.equal(batch[:, :3], augmented[:, :3]))
+
+    def test_scaling(self):
+        batch = self._gen_batch()
+        augmentation = BatchAugmentation(
+            max_rotation_angle=None, scale_range=(2, 3), noise_std=None)
+
+        scales = (augmentation(batch) / batch).numpy()
+
+        # one factor per window
+        np.testing.assert_allclose(
+            scales, np.broadcast_to(scales[:, :1, :1], scales.shape),
+            rtol=1e-5)
+        self.assertTrue(((scales >= 2) & (scales <= 3)).all())
+
+    def test_input_is_not_modified(self):
+        batch = self._gen_batch()
+        batch_copy = batch.clone()
+
+        BatchAugmentation()(batch)
+
+        self.assertTrue(torch.equal(batch_copy, batch))
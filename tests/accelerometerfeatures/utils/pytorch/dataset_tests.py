@@ -1,5 +1,7 @@
 import csv
 import os
+import pickle
+import sys
 import uuid
 from datetime import datetime
 from datetime import timedelta
@@ -7,9 +9,16 @@ from random import Random
 from random import random
 from tempfile import TemporaryDirectory
 from unittest import TestCase
+from unittest import skipIf
 
+import numpy as np
+import torch
+
+from accelerometerfeatures.utils.pytorch.dataset import \
+    AccelerometerDataset
 from accelerometerfeatures.utils.pytorch.dataset import \
     AccelerometerDatasetLoader
+from accelerometerfeatures.utils.statistics import ProcessingStatistics
 
 G = 9.81
 SEED = 123
@@ -223,3 +232,299 @@ class TestAccelerometerDatasetLoader(TestCase):
 
             for window, labels in windows:
                 self.assertEqual(expected_entries_per_window, len(window))
+
+    def test_non_interpolated_fixed_length_windows(self):
+        tmp_dir = TemporaryDirectory()
+        tmp_file_path = os.path.join(
+            tmp_dir.name, 'test_fixed_length_windows.csv')
+
+        approx_frequency = 12
+        target_frequency = 16
+        window_size_in_seconds = 10
+        expected_entries_per_window = \
+            window_size_in_seconds * target_frequency
+
+        self._fill_file_with_generated_data(
+            tmp_file_path, 2, 600, approx_frequency)
+
+        for fixed_length_mode in ['pad', 'resample']:
+            data_loader = AccelerometerDatasetLoader(
+                tmp_file_path,
+                window_size_in_seconds,
+                5,
+                False,
+                target_frequency,
+                fixed_length_mode)
+
+            dataset = data_loader.get_tensor_dataset_for_users()
+            num_windows = sum(
+                [len([w for w in data_loader.get_user_data_windows(u)])
+                 for u in data_loader.users])
+
+            self.assertEqual(num_windows, len(dataset))
+            self.assertEqual(
+                (num_windows, 3, expected_entries_per_window),
+                tuple(dataset.data.shape))
+
+            if fixed_length_mode == 'pad':
+                _, _, mask = dataset[0]
+                self.assertLess(mask.sum(), expected_entries_per_window)
+            else:
+                self.assertIsNone(dataset.mask)
+
+    def test_statistics_are_collected(self):
+        tmp_dir = TemporaryDirectory()
+        tmp_file_path = os.path.join(
+            tmp_dir.name, 'test_statistics_are_collected.csv')
+
+        num_users = 2
+        num_samples_per_user = 400
+        self._fill_file_with_generated_data(
+            tmp_file_path, num_users, num_samples_per_user, 16)
+
+        statistics = ProcessingStatistics()
+        data_loader = AccelerometerDatasetLoader(
+            tmp_file_path, 10, 5, True, 16, statistics=statistics)
+
+        num_windows = sum(
+            [len([w for w in data_loader.get_user_data_windows(u)])
+             for u in data_loader.users])
+
+        report = statistics.get_report()
+        self.assertEqual(
+            num_users * num_samples_per_user, report.counters['rows_read'])
+        self.assertEqual(num_windows, report.counters['windows_created'])
+        self.assertEqual(num_users, report.counters['shreds_found'])
+        self.assertEqual(
+            {'read', 'interpolate', 'window'}, set(report.timings))
+
+    def test_magnitude_channel(self):
+        tmp_dir = TemporaryDirectory()
+        tmp_file_path = os.path.join(
+            tmp_dir.name, 'test_magnitude_channel.csv')
+
+        self._fill_file_with_generated_data(tmp_file_path, 1, 400, 16)
+
+        data_loader = AccelerometerDatasetLoader(
+            tmp_file_path, 10, 5, True, 16, include_magnitude=True)
+
+        dataset = data_loader.get_tensor_dataset_for_users()
+        data = dataset.data.numpy()
+
+        self.assertEqual(4, data.shape[1])
+        np.testing.assert_allclose(
+            np.sqrt((data[:, :3] ** 2).sum(axis=1)), data[:, 3], rtol=1e-5)
+
+    def test_labels_ignore_other_users(self):
+        """
+        Two users recorded at the same time doing different activities. The
+        second user switches the activity after 12 seconds, so the windows
+        starting at 5 and 10 seconds have mixed labels.
+        """
+        tmp_dir = TemporaryDirectory()
+        tmp_file_path = os.path.join(tmp_dir.name, 'test_labels.csv')
+
+        with open(tmp_file_path, 'w') as csv_file:
+            csv_writer = csv.writer(csv_file)
+            csv_writer.writerow(['user', 'timestamp', 'x', 'y', 'z', 'class'])
+
+            for i in range(300):
+                timestamp = \
+                    datetime(2042, 5, 23, 6) + timedelta(seconds=i / 10)
+                csv_writer.writerow(['u1', timestamp, 1, 2, 3, 'walking'])
+                csv_writer.writerow(
+                    ['u2', timestamp, 1, 2, 3, 'sitting' if i < 120 else
+                     'running'])
+
+        for label_policy, expected_labels in [
+                ('strict', ['sitting', 'running']),
+                ('majority', ['sitting', 'sitting', 'running', 'running'])]:
+            data_loader = AccelerometerDatasetLoader(
+                tmp_file_path, 10, 5, label_policy=label_policy,
+                min_label_fraction=0.6)
+
+            self.assertEqual(
+                ['walking'] * 4,
+                [l for _, l in data_loader.get_user_data_windows('u1')])
+            self.assertEqual(
+                expected_labels,
+                [l for _, l in data_loader.get_user_data_windows('u2')])
+
+    def test_users_and_classes_are_categorical(self):
+        tmp_dir = TemporaryDirectory()
+        tmp_file_path = os.path.join(tmp_dir.name, 'test_categorical.csv')
+
+        with open(tmp_file_path, 'w') as csv_file:
+            csv_writer = csv.writer(csv_file)
+            csv_writer.writerow(['user', 'timestamp', 'x', 'y', 'z', 'class'])
+
+            for i in range(200):
+                timestamp = \
+                    datetime(2042, 5, 23, 6) + timedelta(seconds=i / 10)
+                csv_writer.writerow(['u2', timestamp, 1, 2, 3, 'walking'])
+                csv_writer.writerow(['u1', timestamp, 1, 2, 3, 'sitting'])
+                # rows without user
+                csv_writer.writerow(['', timestamp, 1, 2, 3, 'sitting'])
+
+        data_loader = AccelerometerDatasetLoader(
+            tmp_file_path, 10, 5, False, 10, 'resample')
+
+        self.assertEqual('category', data_loader.acc_data.user.dtype.name)
+        self.assertEqual('category', data_loader.acc_data['class'].dtype.name)
+        self.assertEqual(['u2', 'u1'], data_loader.users)
+        self.assertEqual(['sitting', 'walking'], data_loader.classes)
+        self.assertEqual(
+            [], list(data_loader.get_user_data_windows('unknown user')))
+
+        dataset = data_loader.get_dataset_for_users(['u2', 'u1'])
+        self.assertEqual(['sitting', 'walking'], dataset.classes)
+        self.assertEqual([1] * 2 + [0] * 2, [l for _, l in dataset])
+
+        tensor_dataset = dataset.to_tensor_dataset()
+        self.assertEqual(['sitting', 'walking'], tensor_dataset.classes)
+        self.assertEqual(
+            [1] * 2 + [0] * 2, tensor_dataset.labels.tolist())
+
+        tensor_dataset = data_loader.get_tensor_dataset_for_users(['u1'])
+        self.assertEqual(['sitting', 'walking'], tensor_dataset.classes)
+        self.assertEqual([0] * 2, tensor_dataset.labels.tolist())
+
+    def test_unlabeled_windows_are_dropped(self):
+        tmp_dir = TemporaryDirectory()
+        tmp_file_path = os.path.join(tmp_dir.name, 'test_unlabeled.csv')
+
+        with open(tmp_file_path, 'w') as csv_file:
+            csv_writer = csv.writer(csv_file)
+            csv_writer.writerow(['user', 'timestamp', 'x', 'y', 'z', 'class'])
+
+            for i in range(2000):
+                timestamp = \
+                    datetime(2042, 5, 23, 6) + timedelta(seconds=i / 10)
+                csv_writer.writerow(
+                    ['u1', timestamp, 1, 2, 3, 'walk' if i < 1000 else ''])
+
+        statistics = ProcessingStatistics()
+        data_loader = AccelerometerDatasetLoader(
+            tmp_file_path, 10, 10, statistics=statistics)
+
+        self.assertEqual(['walk'], data_loader.classes)
+        self.assertEqual(
+            ['walk'] * 10,
+            [label for _, label in data_loader.get_user_data_windows('u1')])
+        self.assertEqual(
+            9, statistics.get_report().dropped['unlabeled'])
+
+    def test_interpolated_windows_have_exact_length(self):
+        """
+        Samples at exactly the target frequency: The interpolation grid must
+        not get an extra sample due to accumulated floating point errors,
+        which would make the windows too long.
+        """
+        tmp_dir = TemporaryDirectory()
+        tmp_file_path = os.path.join(tmp_dir.name, 'test_exact_length.csv')
+
+        with open(tmp_file_path, 'w') as csv_file:
+            csv_writer = csv.writer(csv_file)
+            csv_writer.writerow(['user', 'timestamp', 'x', 'y', 'z', 'class'])
+
+            for i in range(1000):
+                timestamp = \
+                    datetime(2042, 5, 23, 6) + timedelta(seconds=i / 10)
+                csv_writer.writerow(['u1', timestamp, i, 2, 3, 'walking'])
+
+        for frequency in [3, 10, 16]:
+            data_loader = AccelerometerDatasetLoader(
+                tmp_file_path, 10, 5, True, frequency)
+
+            windows = list(data_loader.get_user_data_windows('u1'))
+
+            # the interpolated data spans 0 - 99.9 seconds
+            self.assertEqual(18, len(windows))
+            for window_data, _ in windows:
+                self.assertEqual(10 * frequency, len(window_data))
+
+
+class TestAccelerometerTensorDataset(TestCase):
+    @staticmethod
+    def _gen_windows(num_windows, num_samples_per_window):
+        labels = ['walking', 'sitting', 'running']
+
+        return [
+            (np.full((3, num_samples_per_window), i, dtype=np.float64),
+             labels[i % len(labels)])
+            for i in range(num_windows)]
+
+    def test_windows_are_stacked_and_labels_encoded(self):
+        windows = self._gen_windows(10, 8)
+        dataset = AccelerometerDataset(windows).to_tensor_dataset()
+
+        self.assertEqual(10, len(dataset))
+        self.assertEqual((10, 3, 8), tuple(dataset.data.shape))
+        self.assertEqual(torch.float32, dataset.data.dtype)
+        self.assertEqual(torch.int64, dataset.labels.dtype)
+        self.assertEqual(['running', 'sitting', 'walking'], dataset.classes)
+
+        for idx, (window_data, label) in enumerate(windows):
+            data, label_idx = dataset[idx]
+            self.assertTrue(np.array_equal(window_data, data.numpy()))
+            self.assertEqual(label, dataset.classes[label_idx])
+
+    def test_batches_are_fetched_in_one_go(self):
+        dataset = AccelerometerDataset(
+            self._gen_windows(10, 8)).to_tensor_dataset()
+
+        data, labels = dataset[[2, 3, 4]]
+        self.assertEqual((3, 3, 8), tuple(data.shape))
+        # consecutive indexes are turned into a slice, i.e. a view
+        self.assertEqual(
+            dataset.data[2].data_ptr(), data.data_ptr())
+
+        data, labels = dataset[[7, 1]]
+        self.assertEqual([7, 1], data[:, 0, 0].long().tolist())
+        self.assertEqual(
+            [dataset.labels[7].item(), dataset.labels[1].item()],
+            labels.tolist())
+
+    @skipIf(sys.version_info < (3, 8), 'shared memory requires Python 3.8+')
+    def test_shared_memory_is_pickled_by_name(self):
+        windows = self._gen_windows(10, 8)
+        dataset = AccelerometerDataset(windows).to_tensor_dataset(
+            shared_memory=True)
+
+        pickled = pickle.dumps(dataset.subset([1, 2, 3]))
+        self.assertLess(len(pickled), dataset.data.numpy().nbytes)
+
+        subset = pickle.loads(pickled)
+        self.assertEqual(dataset.classes, subset.classes)
+        self.assertTrue(torch.equal(dataset[[1, 2, 3]][0], subset[:][0]))
+        self.assertTrue(torch.equal(dataset[[1, 2, 3]][1], subset[:][1]))
+
+        # the unpickled data set attaches to the same memory
+        dataset.data[2] = -1
+        self.assertEqual(-1, subset[1][0][0, 0].item())
+
+        batches = [
+            labels for _, labels in
+            dataset.batch_loader(4, num_workers=1)]
+        self.assertEqual(dataset.labels.tolist(), torch.cat(batches).tolist())
+
+    def test_batch_loader(self):
+        dataset = AccelerometerDataset(
+            self._gen_windows(10, 8)).to_tensor_dataset()
+
+        batches = [b for b in dataset.batch_loader(4)]
+        self.assertEqual([4, 4, 2], [len(labels) for _, labels in batches])
+        self.assertEqual(
+            list(range(10)),
+            torch.cat([data for data, _ in batches])[:, 0, 0].long().tolist())
+
+        batches = [b for b in dataset.batch_loader(4, drop_last=True)]
+        self.assertEqual([4, 4], [len(labels) for _, labels in batches])
+
+        generator = torch.Generator().manual_seed(SEED)
+        batches = [b for b in dataset.batch_loader(
+            4, shuffle=True, generator=generator)]
+        self.assertEqual(
+            list(range(10)),
+            sorted(torch.cat(
+                [data for data, _ in batches])[:, 0, 0].long().tolist()))
@@ -0,0 +1,50 @@
+import gc
+import pickle
+import sys
+from unittest import TestCase
+from unittest import skipIf
+
+import numpy as np
+
+
+# multiprocessing.shared_memory requires Python 3.8+, so it is imported
+# within the tests
+@skipIf(sys.version_info < (3, 8), 'shared memory requires Python 3.8+')
+class TestSharedArray(TestCase):
+    def test_unpickling_attaches_to_the_block(self):
+        from accelerometerfeatures.utils.pytorch.shared import SharedArray
+
+        array = np.arange(1200, dtype=np.float32).reshape(300, 4)
+        shared_array = SharedArray.from_array(array)
+
+        pickled = pickle.dumps(shared_array)
+        self.assertLess(len(pickled), array.nbytes)
+
+        attached = pickle.loads(pickled)
+        self.assertFalse(attached.is_owner)
+        self.assertEqual(shared_array.name, attached.name)
+        np.testing.assert_array_equal(array, attached.array)
+
+        # both arrays map the same memory
+        shared_array.array[100, 2] = -1
+        self.assertEqual(-1, attached.array[100, 2])
+
+    def test_block_is_unlinked_with_the_owner_array(self):
+        from multiprocessing.shared_memory import SharedMemory
+        from accelerometerfeatures.utils.pytorch.shared import SharedArray
+
+        shared_array = SharedArray((5,), np.int64)
+        name = shared_array.name
+        del shared_array
+        gc.collect()
+
+        with self.assertRaises(FileNotFoundError):
+            SharedMemory(name=name)
+
+    def test_empty_array(self):
+        from accelerometerfeatures.utils.pytorch.shared import SharedArray
+
+        shared_array = SharedArray.from_array(np.empty((0, 3)))
+
+        self.assertEqual((0, 3), pickle.loads(
+            pickle.dumps(shared_array)).array.shape)
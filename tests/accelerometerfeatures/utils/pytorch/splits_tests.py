@@ -0,0 +1,82 @@
+from unittest import TestCase
+
+import numpy as np
+
+from accelerometerfeatures.utils.pytorch import splits
+from accelerometerfeatures.utils.pytorch.dataset import \
+    AccelerometerTensorDataset
+
+SEED = 123
+
+
+class TestSplits(TestCase):
+    @staticmethod
+    def _gen_dataset(num_users, num_windows_per_user):
+        num_windows = num_users * num_windows_per_user
+        data = np.arange(num_windows, dtype=np.float32).reshape(-1, 1, 1) * \
+            np.ones((1, 3, 4), dtype=np.float32)
+        labels = np.arange(num_windows) % 2
+        users = np.repeat(
+            ['user%i' % u for u in range(num_users)], num_windows_per_user)
+        dates = np.tile(
+            np.array(['2018-12-12', '2018-12-13'], dtype='datetime64[D]'),
+            num_windows // 2)
+
+        return AccelerometerTensorDataset(
+            data, labels, ['a', 'b'], metadata={'user': users, 'date': dates})
+
+    def test_train_val_test_split_by_user(self):
+        dataset = self._gen_dataset(10, 5)
+
+        train, val, test = splits.train_val_test_split(
+            dataset, 0.2, 0.2, 'user', SEED)
+
+        self.assertEqual([30, 10, 10], [len(train), len(val), len(test)])
+
+        train_users = set(train.get_metadata('user'))
+        val_users = set(val.get_metadata('user'))
+        test_users = set(test.get_metadata('user'))
+        self.assertEqual(6, len(train_users))
+        self.assertFalse(train_users & val_users)
+        self.assertFalse(train_users & test_users)
+        self.assertFalse(val_users & test_users)
+
+        # views share the storage of the original data set
+        self.assertIs(dataset.data, train.data)
+
+        # window data are looked up through the view's indexes
+        data, labels = val[:]
+        self.assertEqual(
+            val.indices.tolist(), data[:, 0, 0].long().tolist())
+        self.assertEqual(val.get_labels().tolist(), labels.tolist())
+
+    def test_group_k_fold_by_date(self):
+        dataset = self._gen_dataset(4, 6)
+
+        folds = [f for f in splits.group_k_fold(dataset, 2, 'date')]
+        self.assertEqual(2, len(folds))
+
+        for train, test in folds:
+            self.assertEqual(1, len(set(test.get_metadata('date'))))
+            self.assertFalse(
+                set(train.get_metadata('date')) &
+                set(test.get_metadata('date')))
+            self.assertEqual(len(dataset), len(train) + len(test))
+
+    def test_leave_one_user_out(self):
+        dataset = self._gen_dataset(4, 3)
+
+        folds = [f for f in splits.leave_one_group_out(dataset, 'user')]
+        self.assertEqual(['user0', 'user1', 'user2', 'user3'],
+                         [user for user, _, _ in folds])
+
+        for user, train, test in folds:
+            self.assertEqual(3, len(test))
+            self.assertEqual(9, len(train))
+            self.assertEqual({user}, set(test.get_metadata('user')))
+
+            # subsets of subsets still refer to the original storage
+            data, _ = test.subset([2, 0])[[0, 1]]
+            self.assertEqual(
+                [test.indices[2], test.indices[0]],
+                data[:, 0, 0].long().tolist())
@@ -0,0 +1,144 @@
+from unittest import TestCase
+
+import numpy as np
+
+from accelerometerfeatures.utils import resampling
+
+SEED = 23
+
+
+class TestResampling(TestCase):
+    def test_is_near_uniform(self):
+        rng = np.random.RandomState(SEED)
+        timestamps = np.arange(1000) / 100.
+
+        self.assertTrue(resampling.is_near_uniform(timestamps))
+        self.assertTrue(resampling.is_near_uniform(
+            timestamps + rng.uniform(-0.0004, 0.0004, len(timestamps))))
+        self.assertFalse(resampling.is_near_uniform(
+            timestamps + rng.uniform(-0.004, 0.004, len(timestamps))))
+
+        # gap
+        timestamps[500:] += 1
+        self.assertFalse(resampling.is_near_uniform(timestamps))
+
+    def test_get_resampling_factors(self):
+        self.assertEqual(
+            (4, 25), resampling.get_resampling_factors(100, 16))
+        self.assertEqual(
+            (2, 1), resampling.get_resampling_factors(8, 16))
+
+    def test_polyphase_resample_suppresses_aliasing(self):
+        timestamps = np.arange(100 * 60) / 100.
+        signal = np.sin(2 * np.pi * timestamps)
+        # 30 Hz can't be represented at 16 Hz and would alias to 2 Hz
+        values = signal + 0.5 * np.sin(2 * np.pi * 30 * timestamps)
+        target_timestamps = np.arange(0, timestamps[-1], 1 / 16.)
+
+        resampled = resampling.polyphase_resample(
+            timestamps, values, target_timestamps)
+        linear = np.interp(target_timestamps, timestamps, values)
+        expected = np.sin(2 * np.pi * target_timestamps)
+
+        # ignore boundary effects
+        inner = slice(16, -16)
+        polyphase_error = np.abs(resampled - expected)[inner].max()
+        linear_error = np.abs(linear - expected)[inner].max()
+
+        self.assertEqual(len(target_timestamps), len(resampled))
+        self.assertLess(polyphase_error, 0.05)
+        self.assertGreater(linear_error, 0.25)
+
+    def test_polyphase_resample_with_quantized_timestamps(self):
+        """
+        60 Hz timestamps rounded to whole milliseconds have a median period
+        of 17 ms, which must not stretch the resampled signal
+        """
+        timestamps = np.round(np.arange(60 * 3600) / 60., 3)
+        values = np.sin(2 * np.pi * 0.2 * timestamps)
+        target_timestamps = np.arange(0, timestamps[-1], 1 / 16.)
+
+        self.assertAlmostEqual(0.017, np.median(np.diff(timestamps)))
+
+        resampled = resampling.polyphase_resample(
+            timestamps, values, target_timestamps)
+        expected = np.sin(2 * np.pi * 0.2 * target_timestamps)
+
+        inner = slice(16, -16)
+        self.assertLess(np.abs(resampled - expected)[inner].max(), 0.01)
+
+    def test_get_near_uniform_segments(self):
+        timestamps = np.arange(100) / 100.
+
+        self.assertEqual(
+            [(0, 100)], resampling.get_near_uniform_segments(timestamps))
+
+        # a dropped sample and a gap
+        timestamps = np.concatenate([
+            timestamps[:40], timestamps[41:], timestamps[-1] + 1 +
+            np.arange(2) / 100., timestamps[-1] + 2 + np.arange(10) / 100.])
+
+        self.assertEqual(
+            [(0, 40), (40, 99), (101, 111)],
+            resampling.get_near_uniform_segments(timestamps))
+        self.assertEqual([], resampling.get_near_uniform_segments(
+            timestamps[:2]))
+
+    def test_linear_interpolation_matches_numpy(self):
+        rng = np.random.RandomState(SEED)
+        num_samples = 5000
+        timestamps = np.arange(num_samples) / 50. + \
+            rng.uniform(-0.004, 0.004, num_samples)
+        values = rng.normal(size=num_samples)
+        target_timestamps = np.arange(timestamps[0], timestamps[-1], 1 / 16.)
+        expected = np.interp(target_timestamps, timestamps, values)
+
+        for near_uniform in [True, False]:
+            idxs, weights = resampling.get_linear_interpolation_weights(
+                timestamps, target_timestamps, near_uniform)
+
+            self.assertTrue(np.allclose(
+                expected,
+                resampling.linear_interpolate(values, idxs, weights)))
+
+    def test_linear_interpolation_with_irregular_timestamps(self):
+        """
+        The uniform fast path falls back to a binary search if the timestamps
+        are not nearly uniform after all
+        """
+        timestamps = np.array([0., 0.1, 0.2, 5., 5.1, 5.2, 9.])
+        values = np.arange(len(timestamps), dtype=float)
+        target_timestamps = np.arange(0, 9, 0.25)
+
+        idxs, weights = resampling.get_linear_interpolation_weights(
+            timestamps, target_timestamps, near_uniform=True,
+            max_iterations=2)
+
+        self.assertTrue(np.allclose(
+            np.interp(target_timestamps, timestamps, values),
+            resampling.linear_interpolate(values, idxs, weights)))
+
+    def test_target_grid_is_exact(self):
+        period = resampling.get_sample_period_in_ns(16)
+        self.assertEqual(62500000, period)
+        # a day at 16 Hz
+        grid = resampling.get_target_grid(0, 86400 * 10 ** 9, period)
+
+        self.assertEqual(86400 * 16, len(grid))
+        self.assertEqual(np.int64, grid.dtype)
+        self.assertEqual({period}, set(np.diff(grid)))
+
+        # the end is excluded
+        self.assertEqual(
+            [10, 13], resampling.get_target_grid(10, 16, 3).tolist())
+        self.assertEqual(
+            [10, 13, 16], resampling.get_target_grid(10, 17, 3).tolist())
+        self.assertEqual(0, len(resampling.get_target_grid(10, 10, 3)))
+
+    def test_sample_period_is_rounded_up(self):
+        period = resampling.get_sample_period_in_ns(3)
+        self.assertEqual(333333334, period)
+
+        # 10 seconds hold 30 samples
+        self.assertEqual(
+            30, len(resampling.get_target_grid(0, 10 * 10 ** 9, period)))
@@ -0,0 +1,49 @@
+from unittest import TestCase
+
+import numpy as np
+
+from accelerometerfeatures.utils.segments import get_run_bounds
+from accelerometerfeatures.utils.segments import segment_reduce
+
+
+class TestSegmentReduce(TestCase):
+    def test_reductions_equal_numpy(self):
+        # big offset as with gravity
+        values = np.random.RandomState(3).normal(size=(50, 3)) + 9.81
+        starts = np.array([0, 10, 10, 5, 45])
+        ends = np.array([10, 30, 11, 50, 50])
+
+        result = segment_reduce(values, starts, ends, ddof=1)
+
+        self.assertEqual([10, 20, 1, 45, 5], result['count'].tolist())
+        for idx, (start, end) in enumerate(zip(starts, ends)):
+            segment = values[start:end]
+            np.testing.assert_allclose(segment.sum(axis=0), result['sum'][idx])
+            np.testing.assert_allclose(
+                segment.mean(axis=0), result['mean'][idx])
+            np.testing.assert_allclose(segment.min(axis=0), result['min'][idx])
+            np.testing.assert_allclose(segment.max(axis=0), result['max'][idx])
+
+            if len(segment) > 1:
+                np.testing.assert_allclose(
+                    segment.var(axis=0, ddof=1), result['var'][idx])
+            else:
+                self.assertTrue(np.isnan(result['var'][idx]).all())
+
+    def test_empty_segments(self):
+        values = np.arange(6.)
+
+        result = segment_reduce(
+            values, [0, 2, 6], [2, 2, 6], ('sum', 'mean', 'max', 'count'))
+
+        self.assertEqual([0, 1, 1], np.isnan(result['mean']).tolist())
+        self.assertEqual([1., 0., 0.], result['sum'].tolist())
+        self.assertEqual(1., result['max'][0])
+        self.assertTrue(np.isnan(result['max'][1:]).all())
+        self.assertEqual([2, 0, 0], result['count'].tolist())
+
+    def test_run_bounds(self):
+        starts, ends = get_run_bounds(['a', 'a', 'b', 'b', 'b', 'a'])
+
+        self.assertEqual([0, 2, 5], starts.tolist())
+        self.assertEqual([2, 5, 6], ends.tolist())
@@ -0,0 +1,91 @@
+from datetime import datetime
+from datetime import timedelta
+from unittest import TestCase
+
+import pandas as pd
+
+from accelerometerfeatures.frequency import fouriertransformation
+from accelerometerfeatures.utils import statistics as stats
+from accelerometerfeatures.utils.interpolation import Interpolator
+
+
+class TestProcessingStatistics(TestCase):
+    @staticmethod
+    def _gen_data(num_entries, frequency, gap_positions, gap_size_in_secs):
+        timestamp = datetime(2018, 12, 12, 10, 0, 0)
+        rows = []
+
+        for i in range(num_entries):
+            if i in gap_positions:
+                timestamp += timedelta(seconds=gap_size_in_secs)
+            else:
+                timestamp += timedelta(seconds=1. / frequency)
+
+            rows.append([float(i % 7), timestamp])
+
+        return pd.DataFrame(rows, columns=['magnitude', 'timestamp'])
+
+    def test_counters_timers_and_hooks(self):
+        statistics = stats.ProcessingStatistics()
+        events = []
+        statistics.add_hook(lambda *event: events.append(event))
+
+        statistics.count(stats.ROWS_READ, 42)
+        statistics.count_dropped(stats.MIXED_LABEL)
+        statistics.count_dropped(stats.MIXED_LABEL)
+        with statistics.timer('read'):
+            pass
+
+        report = statistics.get_report()
+        self.assertEqual({stats.ROWS_READ: 42}, report.counters)
+        self.assertEqual({stats.MIXED_LABEL: 2}, report.dropped)
+        self.assertIn('read', report.timings)
+        self.assertEqual(
+            [('count', stats.ROWS_READ, 42),
+             ('count', 'dropped.' + stats.MIXED_LABEL, 1),
+             ('count', 'dropped.' + stats.MIXED_LABEL, 1)],
+            events[:3])
+        self.assertEqual(('time', 'read'), events[3][:2])
+
+        statistics.reset()
+        self.assertEqual({}, statistics.get_report().to_dict()['counters'])
+
+    def test_disabled_statistics_do_not_collect(self):
+        statistics = stats.ProcessingStatistics(enabled=False)
+
+        statistics.count(stats.ROWS_READ)
+        with statistics.timer('read'):
+            pass
+
+        report = statistics.get_report()
+        self.assertEqual({}, report.counters)
+        self.assertEqual({}, report.timings)
+
+    def test_fourier_transformation_statistics(self):
+        # three shreds: 0-19 (10 secs), 20-24 (2.5 secs), 25-59 (17.5 secs)
+        data = self._gen_data(60, 2, [20, 25], 10)
+        statistics = stats.ProcessingStatistics()
+
+        windows = fouriertransformation.from_df(data, 9, 2, statistics)
+
+        report = statistics.get_report()
+        self.assertEqual(2, report.counters[stats.GAPS_CUT])
+        self.assertEqual(3, report.counters[stats.SHREDS_FOUND])
+        self.assertEqual(1, report.dropped[stats.SHORT_SHRED])
+        self.assertEqual(
+            len(windows), report.counters[stats.WINDOWS_CREATED])
+
+    def test_interpolator_statistics(self):
+        data = self._gen_data(60, 2, [20, 21], 10)
+        statistics = stats.ProcessingStatistics()
+
+        interpolator = Interpolator(data, 2, 10, statistics)
+        interpolated = interpolator.get_interpolated_data()
+
+        report = statistics.get_report()
+        self.assertEqual(2, report.counters[stats.GAPS_CUT])
+        self.assertEqual(2, report.counters[stats.SHREDS_FOUND])
+        self.assertEqual(len(interpolated), 2)
+        # shred consisting of only one sample (index 20)
+        self.assertEqual(1, report.dropped[stats.SHORT_SHRED])
+        self.assertIn('interpolate', report.timings)
@@ -0,0 +1,133 @@
+from datetime import timedelta
+from unittest import TestCase
+
+import numpy as np
+
+from accelerometerfeatures.utils.window import iter_chunk_windows
+from accelerometerfeatures.utils.window import pad_windows
+from accelerometerfeatures.utils.window import resample_windows
+from accelerometerfeatures.utils.window import sliding_windows
+from accelerometerfeatures.utils.window import window_bounds
+
+
+class TestFixedLengthWindows(TestCase):
+    @staticmethod
+    def _gen_windows(lengths):
+        return [
+            np.array([np.arange(l), 10 * np.arange(l), np.full(l, i)],
+                     dtype=float)
+            for i, l in enumerate(lengths)]
+
+    def test_pad_windows(self):
+        windows = self._gen_windows([3, 5, 7])
+
+        padded, mask = pad_windows(windows, 5, fill_value=-1)
+
+        self.assertEqual((3, 3, 5), padded.shape)
+        self.assertEqual(np.float32, padded.dtype)
+        self.assertEqual([3, 5, 5], mask.sum(axis=1).tolist())
+        self.assertEqual([0, 1, 2, -1, -1], padded[0, 0].tolist())
+        self.assertEqual([0, 10, 20, 30, 40], padded[1, 1].tolist())
+        # longer windows are truncated
+        self.assertEqual([2, 2, 2, 2, 2], padded[2, 2].tolist())
+
+    def test_resample_windows_by_index(self):
+        windows = self._gen_windows([3, 5, 9])
+
+        resampled = resample_windows(windows, 5)
+
+        self.assertEqual((3, 3, 5), resampled.shape)
+        self.assertTrue(np.allclose([0, .5, 1, 1.5, 2], resampled[0, 0]))
+        self.assertTrue(np.allclose([0, 10, 20, 30, 40], resampled[1, 1]))
+        self.assertTrue(np.allclose([0, 2, 4, 6, 8], resampled[2, 0]))
+        self.assertTrue(np.allclose(2, resampled[2, 2]))
+
+    def test_resample_windows_by_time(self):
+        windows = [
+            np.array([[0., 2., 4.]]),
+            np.array([[5., 3., 1., 0.]])]
+        sample_times = [
+            np.array([0., 1., 2.]),
+            np.array([0.5, 1.5, 2.5, 3.5])]
+
+        resampled = resample_windows(windows, 4, sample_times, 4.)
+
+        # target grid: 0, 1, 2, 3
+        self.assertTrue(np.allclose([0, 2, 4, 4], resampled[0, 0]))
+        self.assertTrue(np.allclose([5, 4, 2, .5], resampled[1, 0]))
+
+
+class TestSlidingWindows(TestCase):
+    def test_sample_based_windows_are_views(self):
+        data = np.arange(20.).reshape(10, 2)
+
+        windows, start_idxs, end_idxs = sliding_windows(data, size=4, hop=3)
+
+        self.assertEqual((3, 4, 2), windows.shape)
+        self.assertEqual([0, 3, 6], start_idxs.tolist())
+        self.assertEqual([4, 7, 10], end_idxs.tolist())
+        self.assertEqual(data[3:7].tolist(), windows[1].tolist())
+        self.assertTrue(np.shares_memory(data, windows))
+        self.assertFalse(windows.flags.writeable)
+
+    def test_too_short_data(self):
+        windows, start_idxs, _ = sliding_windows(np.arange(3.), size=4)
+
+        self.assertEqual((0, 4), windows.shape)
+        self.assertEqual(0, len(start_idxs))
+
+    def test_time_based_windows(self):
+        # 4 Hz, 60 seconds
+        timestamps = np.datetime64('2018-12-12T10:00:00') + \
+            np.arange(240) * np.timedelta64(250, 'ms')
+        data = np.arange(240.)
+
+        windows, starts, ends = sliding_windows(
+            data, timestamps, timedelta(seconds=2), timedelta(seconds=1))
+
+        self.assertEqual((59, 8), windows.shape)
+        self.assertEqual(timestamps[4], starts[1])
+        self.assertEqual(timestamps[12], ends[1])
+        # the end of the last window is extrapolated
+        self.assertEqual(
+            np.datetime64('2018-12-12T10:01:00'), ends[-1])
+
+        windows, starts, ends = sliding_windows(
+            data, data / 4., size=2., hop=1.)
+        self.assertEqual((59, 8), windows.shape)
+        self.assertEqual([1., 3.], [starts[1], ends[1]])
+
+    def test_chunk_windows_equal_windows_of_whole_series(self):
+        data = np.arange(100).reshape(50, 2)
+
+        # including hops bigger than the window size
+        for size, hop in [(8, 3), (4, 10), (3, 17)]:
+            windows = sliding_windows(data, size=size, hop=hop)[0]
+
+            for chunk_size in [1, 5, 8, 13, 50]:
+                chunks = [
+                    data[start:start + chunk_size]
+                    for start in range(0, len(data), chunk_size)]
+
+                chunk_windows = []
+                for windows_of_chunk, first_window_idx in \
+                        iter_chunk_windows(chunks, size, hop):
+                    self.assertEqual(len(chunk_windows), first_window_idx)
+                    chunk_windows.extend(windows_of_chunk.copy())
+
+                np.testing.assert_array_equal(
+                    windows, np.array(chunk_windows))
+
+    def test_window_bounds(self):
+        timestamps = np.array([0., .1, .5, 1.2, 1.3, 2., 2.9, 3.1, 4.])
+
+        start_idxs, end_idxs, starts, ends = window_bounds(timestamps, 2., 1.)
+
+        # windows [0, 2), [1, 3) and [2, 4)
+        self.assertEqual([0., 1., 2.], starts.tolist())
+        self.assertEqual([2., 3., 4.], ends.tolist())
+        self.assertEqual([0, 3, 5], start_idxs.tolist())
+        self.assertEqual([5, 7, 8], end_idxs.tolist())
+
+        start_idxs, _, _, _ = window_bounds(timestamps, 5., 1.)
+        self.assertEqual(0, len(start_idxs))